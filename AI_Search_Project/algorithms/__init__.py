@@ -1,7 +1,20 @@
 from .bfs import BFS
 from .dfs import DFS
 from .ids import IDS
+from .idastar import IDAStar
 from .ucs import UCS
 from .astar import AStar
+from .jps import JPS
+from .bidirectional import BidirectionalBFS, BidirectionalAStar
+from .dstar_lite import DStarLite
+from .hpastar import HPAStar
+from .arastar import ARAStar, guaranteed_bound
+from .landmarks import Landmarks
+from .exploration import Exploration, stream
+from .instrument import Probe, SearchStats, capture
 
-__all__ = ['BFS', 'DFS','IDS','UCS','AStar',]
\ No newline at end of file
+# Every solver class by name, for callers that take the name as input
+SOLVERS = {cls.__name__: cls for cls in (BFS, DFS, IDS, IDAStar, UCS, AStar, JPS, BidirectionalBFS,
+                                         BidirectionalAStar, DStarLite, HPAStar, ARAStar)}
+
+__all__ = ['BFS', 'DFS','IDS','IDAStar','UCS','AStar','JPS','BidirectionalBFS','BidirectionalAStar','DStarLite','HPAStar','ARAStar','guaranteed_bound','Landmarks','Exploration','stream','Probe','SearchStats','capture','SOLVERS',]
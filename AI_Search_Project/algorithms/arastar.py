@@ -0,0 +1,172 @@
+import time
+from array import array
+from heapq import heapify
+
+from .astar import AStar
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+INF = float('inf')
+
+# Cell states: never reached, on the open list, expanded in this pass,
+# improved after being expanded (waits for the next pass), reached earlier
+UNSEEN, OPEN, CLOSED, INCONS, SEEN = range(5)
+# A new pass forgets which cells were expanded and reopens the inconsistent ones
+_NEXT_PASS = bytes([UNSEEN, OPEN, SEEN, OPEN, SEEN]) + bytes(251)
+
+
+class ARAStar:
+    """Anytime Repairing A* (ARA*, Likhachev, Gordon & Thrun)
+
+    The first pass is weighted A* with f = g + weight * h, which finds a
+    path quickly whose cost is at most ``weight`` times the optimum. Each
+    later pass lowers the weight by ``step`` and reuses the g values and
+    open list of the one before: only cells whose cost improved after
+    they were expanded are reopened, so a pass costs far less than a new
+    search. The search stops once the path is proven optimal or a budget
+    runs out: ``time_ms`` of wall time or ``max_expansions`` expansions
+    over all passes. It then returns the best path found so far.
+
+    After a solve ``bound`` is the suboptimality the search proved. The
+    path costs at most ``bound`` times the optimum, 1.0 means optimal, and
+    inf means no path was found. ``solutions`` lists each pass as a dict
+    (weight, bound, cost, expanded, ms).
+    """
+    heuristic = AStar.heuristic
+
+    def __init__(self, weight=3.0, step=0.5, time_ms=None, max_expansions=None):
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.weight = weight
+        self.step = step
+        self.time_ms = time_ms
+        self.max_expansions = max_expansions
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+        self.bound = INF
+        self.solutions = []
+
+    @instrumented
+    def solve(self, maze):
+        t0 = time.perf_counter_ns()
+        deadline = None if self.time_ms is None else t0 + int(self.time_ms * 1_000_000)
+        budget = INF if self.max_expansions is None else self.max_expansions
+
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        goal_pos = maze.goal
+        # Scale by the cheapest step so the unweighted heuristic stays admissible
+        h_scale = maze.min_cost
+        g = array('d', [INF]) * maze.size
+        h = array('d', [0.0]) * maze.size
+        parent = maze.new_parents()
+        state = maze.new_visited()
+        record = begin(self, maze).record
+        neighbors = self.probe.successors(maze.weighted_neighbors)
+
+        g[start] = 0
+        h[start] = h_scale * self.heuristic(maze.start, goal_pos, maze)
+        state[start] = OPEN
+        record(start)
+        weight = self.weight
+        open_list = [(weight * h[start], start)]
+        incons = []
+        self.bound = INF
+        self.solutions = []
+        path = []
+        path_cost = INF
+        expanded = 0
+        self.probe.phase("search")
+
+        while True:
+            push, pop = self.probe.heap(open_list)
+            finished = True
+            while open_list:
+                f, current = open_list[0]
+                if state[current] != OPEN or f != g[current] + weight * h[current]:
+                    pop()
+                    continue
+                if g[goal] <= f:
+                    break
+                if expanded >= budget or (deadline is not None and not expanded & 255
+                                          and time.perf_counter_ns() >= deadline):
+                    finished = False
+                    break
+                pop()
+                state[current] = CLOSED
+                expanded += 1
+
+                current_g = g[current]
+                for neighbor, step in neighbors(current):
+                    tentative_g = current_g + step
+                    if tentative_g < g[neighbor]:
+                        if state[neighbor] == UNSEEN:
+                            h[neighbor] = h_scale * self.heuristic(maze.pos(neighbor), goal_pos, maze)
+                            record(neighbor)
+                        g[neighbor] = tentative_g
+                        parent[neighbor] = current
+                        if state[neighbor] == CLOSED:
+                            state[neighbor] = INCONS
+                            incons.append(neighbor)
+                        elif state[neighbor] != INCONS:
+                            state[neighbor] = OPEN
+                            push((tentative_g + weight * h[neighbor], neighbor))
+
+            improved = g[goal] < path_cost
+            if improved:
+                path = maze.path_from(parent, goal)
+                path_cost = maze.path_cost(path)
+            if not finished:
+                # Out of budget mid-pass: a cheaper path keeps the last proven bound
+                if improved:
+                    self._publish(weight, self.bound, path_cost, expanded, t0)
+                break
+            if path_cost == INF:
+                break
+
+            # Unexpanded cells bound the optimal cost from below
+            live = [c for f, c in open_list if state[c] == OPEN and f == g[c] + weight * h[c]]
+            lower = min((g[c] + h[c] for c in live + incons), default=INF)
+            bound = 1.0 if lower == INF or path_cost <= lower else min(weight, path_cost / lower)
+            self._publish(weight, bound, path_cost, expanded, t0)
+            if bound <= 1.0:
+                break
+
+            weight = max(1.0, min(weight - self.step, bound))
+            state = state.translate(_NEXT_PASS)
+            open_list = [(g[c] + weight * h[c], c) for c in live + incons]
+            heapify(open_list)
+            incons = []
+
+        if not path:
+            print("[ARA*] No path found" if finished else "[ARA*] No path found within the budget")
+            return []
+        self.probe.phase("path")
+        return path
+
+    def _publish(self, weight, bound, cost, expanded, t0):
+        self.bound = bound
+        self.solutions.append({
+            "weight": weight,
+            "bound": bound,
+            "cost": cost,
+            "expanded": expanded,
+            "ms": (time.perf_counter_ns() - t0) / 1_000_000,
+        })
+
+
+def guaranteed_bound(solver, maze):
+    """How far solver's latest path on maze may be from the optimal cost
+
+    A factor: 1.0 means optimal, None means no guarantee. Solvers declare
+    it in ``bound`` (ARA* per solve). ``unit_steps`` solvers count moves,
+    so they only find the cheapest path when every move costs the same.
+    """
+    bound = getattr(solver, "bound", None)
+    if bound is None or bound == INF:
+        return None
+    if getattr(solver, "unit_steps", False) and not (maze.costs is None and maze.neighborhood.uniform):
+        return None
+    return bound
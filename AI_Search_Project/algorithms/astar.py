@@ -1,70 +1,94 @@
-import heapq
+import inspect
+from array import array
+
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
 
 class AStar:
-    def __init__(self):
-        self.explored_nodes = []
+    """A* with the neighbourhood's distance, or ALT bounds from ``landmarks``
 
-    def heuristic(self, node, goal):
-        """Manhattan Distance heuristic"""
-        x1, y1 = node
-        x2, y2 = goal
-        return abs(x1 - x2) + abs(y1 - y2)
+    ``landmarks`` is an ``algorithms.Landmarks`` built for the maze being
+    solved; its estimate replaces ``heuristic``.
+    """
+    bound = 1.0
 
-    def solve(self, maze):
-        start = maze.start
-        goal = maze.goal
-        grid = maze.grid
+    def __init__(self, landmarks=None):
+        self.landmarks = landmarks
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+
+    def heuristic(self, node, goal, maze=None):
+        """The maze neighbourhood's distance; Manhattan without a maze"""
+        dx, dy = node[0] - goal[0], node[1] - goal[1]
+        if maze is None:
+            return abs(dx) + abs(dy)
+        return maze.neighborhood.metric(dx, dy)
 
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    def estimator(self, maze, start, goal):
+        """Function i -> estimated cost from cell i to the goal"""
+        if self.landmarks is not None:
+            return self.landmarks.estimator(maze, goal, source=start)
+        # Scale by the cheapest step so the heuristic stays admissible
+        # on weighted terrain.
+        h_scale = maze.min_cost
+        width = maze.width
+        gy, gx = divmod(goal, width)
+        if self.heuristic.__func__ is AStar.heuristic:
+            metric = maze.neighborhood.metric
+            return lambda i: h_scale * metric(i % width - gx, i // width - gy)
+        heuristic = self.heuristic
+        goal_pos = (gx, gy)
+        if "maze" in inspect.signature(heuristic).parameters:
+            return lambda i: h_scale * heuristic((i % width, i // width), goal_pos, maze)
+        # Overrides written as heuristic(self, node, goal)
+        return lambda i: h_scale * heuristic((i % width, i // width), goal_pos)
+
+    @instrumented
+    def solve(self, maze):
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        estimate = self.estimator(maze, start, goal)
 
         open_list = []
-        heapq.heappush(
-            open_list,
-            (self.heuristic(start, goal), 0, start)
-        )
+        push, pop = self.probe.heap(open_list)
+        neighbors = self.probe.successors(maze.weighted_neighbors)
+        push((estimate(start), 0, start))
 
-        parent = {start: None}
-        g_cost = {start: 0}
-        visited = set([start]) 
-        self.explored_nodes = [start]
+        parent = maze.new_parents()
+        g_cost = array('d', [float('inf')]) * maze.size
+        g_cost[start] = 0
+        closed = maze.new_visited()
+        visited = maze.new_visited()
+        visited[start] = 1
+        record = begin(self, maze).record
+        record(start)
+        self.probe.phase("search")
 
         while open_list:
-            _, current_g, current = heapq.heappop(open_list)
+            _, current_g, current = pop()
 
             if current == goal:
-                path = []
-                while current is not None:
-                    path.append(current)
-                    current = parent[current]
-                return path[::-1]
-
-            x, y = current
-
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                neighbor = (nx, ny)
-                
-                if (
-                    0 <= nx < maze.width and
-                    0 <= ny < maze.height and
-                    grid[ny][nx] == 0
-                ):
-                    tentative_g = current_g + 1
-
-                    if neighbor not in g_cost or tentative_g < g_cost[neighbor]:
-                        g_cost[neighbor] = tentative_g
-                        f_cost = tentative_g + self.heuristic(neighbor, goal)
-
-                        heapq.heappush(
-                            open_list,
-                            (f_cost, tentative_g, neighbor)
-                        )
-
-                        parent[neighbor] = current
-                        
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            self.explored_nodes.append(neighbor)
+                self.probe.phase("path")
+                return maze.path_from(parent, current)
+
+            if closed[current]:
+                continue
+            closed[current] = 1
+
+            for neighbor, step in neighbors(current):
+                tentative_g = current_g + step
+
+                if tentative_g < g_cost[neighbor]:
+                    g_cost[neighbor] = tentative_g
+                    f_cost = tentative_g + estimate(neighbor)
+
+                    push((f_cost, tentative_g, neighbor))
+
+                    parent[neighbor] = current
+                    
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        record(neighbor)
 
         print("[A*] No path found")
-        return []
\ No newline at end of file
+        return []
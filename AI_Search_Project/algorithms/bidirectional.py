@@ -0,0 +1,187 @@
+from array import array
+
+from .astar import AStar
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+
+def _join(maze, parent_f, parent_b, meet):
+    """Forward chain up to meet, then the backward chain down to the goal"""
+    path = maze.path_from(parent_f, meet)
+    i = parent_b[meet]
+    while i != -1:
+        path.append(maze.pos(i))
+        i = parent_b[i]
+    return path
+
+
+class BidirectionalBFS:
+    """Breadth-first search from both start and goal
+
+    The smaller frontier (ties go to the side that has reached fewer
+    cells) is grown one whole layer at a time. Once a layer
+    touches the other side, the rest of that layer is still scanned and
+    the cheapest meeting edge wins, so the path stays shortest.
+    """
+    bound = 1.0
+    unit_steps = True
+
+    def __init__(self):
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+
+    @instrumented
+    def solve(self, maze):
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        record = begin(self, maze).record
+        record(start)
+        if start == goal:
+            return [maze.start]
+
+        dist_f = array('i', [-1]) * maze.size
+        dist_b = array('i', [-1]) * maze.size
+        parent_f = maze.new_parents()
+        parent_b = maze.new_parents()
+        dist_f[start] = 0
+        dist_b[goal] = 0
+        frontier_f = [start]
+        frontier_b = [goal]
+        reached = [1, 1]
+        record(goal)
+        probe = self.probe
+        probe.phase("search")
+
+        while frontier_f and frontier_b:
+            forward = (len(frontier_f), reached[0]) <= (len(frontier_b), reached[1])
+            if forward:
+                frontier, dist, other, parent = frontier_f, dist_f, dist_b, parent_f
+            else:
+                frontier, dist, other, parent = frontier_b, dist_b, dist_f, parent_b
+
+            best = None
+            next_frontier = []
+            for current in frontier:
+                for neighbor in maze.neighbors(current):
+                    if other[neighbor] != -1:
+                        total = dist[current] + 1 + other[neighbor]
+                        if best is None or total < best[0]:
+                            best = (total, current, neighbor)
+                    if dist[neighbor] == -1:
+                        dist[neighbor] = dist[current] + 1
+                        parent[neighbor] = current
+                        next_frontier.append(neighbor)
+                        record(neighbor)
+            probe.layer(frontier, next_frontier)
+
+            if best is not None:
+                _, current, neighbor = best
+                # Hang the meeting edge on the side being expanded
+                parent[neighbor] = current
+                probe.phase("path")
+                return _join(maze, parent_f, parent_b, neighbor)
+
+            if forward:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
+            reached[not forward] += len(next_frontier)
+
+        print("[BiBFS] No path found")
+        return []
+
+
+class BidirectionalAStar:
+    """A* from both ends with the standard meet-in-the-middle stop rule
+
+    Each side uses ``AStar.heuristic`` towards the opposite end (scaled by
+    the cheapest cell cost), and the side with the smaller open list (then
+    fewer expansions) is expanded next. The search stops once either open list's best f value
+    reaches the cheapest start-goal connection found so far, which keeps
+    the result optimal for consistent heuristics. Backward edges come from
+    ``Maze.predecessors``: the cost of stepping into the cell being left.
+    With ``landmarks`` (an ``algorithms.Landmarks`` for the maze) both
+    sides use ALT bounds instead.
+    """
+    heuristic = AStar.heuristic
+    estimator = AStar.estimator
+    bound = 1.0
+
+    def __init__(self, landmarks=None):
+        self.landmarks = landmarks
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+
+    @instrumented
+    def solve(self, maze):
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        record = begin(self, maze).record
+        record(start)
+        if start == goal:
+            return [maze.start]
+
+        inf = float('inf')
+        h_f = self.estimator(maze, start, goal)
+        if self.landmarks is not None:
+            h_b = self.landmarks.estimator(maze, start, toward=False, source=goal)
+        else:
+            h_b = self.estimator(maze, goal, start)
+        g_f = array('d', [inf]) * maze.size
+        g_b = array('d', [inf]) * maze.size
+        parent_f = maze.new_parents()
+        parent_b = maze.new_parents()
+        closed_f = maze.new_visited()
+        closed_b = maze.new_visited()
+        g_f[start] = 0
+        g_b[goal] = 0
+        open_f = [(h_f(start), start)]
+        open_b = [(h_b(goal), goal)]
+        record(goal)
+        probe = self.probe
+        push_f, pop_f = probe.heap(open_f)
+        push_b, pop_b = probe.heap(open_b)
+        forward_edges = probe.successors(maze.weighted_neighbors)
+        backward_edges = probe.successors(maze.predecessors)
+        probe.phase("search")
+
+        best = inf
+        meet = -1
+        expanded = [0, 0]
+
+        while open_f and open_b:
+            if open_f[0][0] >= best or open_b[0][0] >= best:
+                break
+
+            forward = (len(open_f), expanded[0]) <= (len(open_b), expanded[1])
+            if forward:
+                push, pop, g, other, parent, closed, estimate = push_f, pop_f, g_f, g_b, parent_f, closed_f, h_f
+            else:
+                push, pop, g, other, parent, closed, estimate = push_b, pop_b, g_b, g_f, parent_b, closed_b, h_b
+
+            _, current = pop()
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded[not forward] += 1
+            current_g = g[current]
+            edges = forward_edges(current) if forward else backward_edges(current)
+
+            for neighbor, step in edges:
+                tentative_g = current_g + step
+                if tentative_g < g[neighbor]:
+                    if g[neighbor] == inf and other[neighbor] == inf:
+                        record(neighbor)
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    f_cost = tentative_g + estimate(neighbor)
+                    push((f_cost, neighbor))
+                    if other[neighbor] + tentative_g < best:
+                        best = other[neighbor] + tentative_g
+                        meet = neighbor
+
+        if meet == -1:
+            print("[BiA*] No path found")
+            return []
+        probe.phase("path")
+        return _join(maze, parent_f, parent_b, meet)
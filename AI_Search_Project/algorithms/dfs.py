@@ -1,44 +1,43 @@
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+
 class DFS:
+    bound = None
+
     def __init__(self):
-        self.explored_nodes = []
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
     
+    @instrumented
     def solve(self, maze):
         """Solve maze using DFS algorithm"""
-        start = maze.start
-        goal = maze.goal
-        grid = maze.grid
-        
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
         
         stack = [start]
-        visited = set([start])
-        parent = {start: None}
-        self.explored_nodes = [start]
+        visited = maze.new_visited()
+        visited[start] = 1
+        parent = maze.new_parents()
+        record = begin(self, maze).record
+        record(start)
+        push, pop = self.probe.frontier(stack, stack.append, stack.pop)
+        neighbors = self.probe.successors(maze.neighbors)
+        self.probe.phase("search")
         
         while stack:
-            current = stack.pop()
+            current = pop()
 
             if current == goal:
-                path = []
-                while current is not None:
-                    path.append(current)
-                    current = parent[current]
-                return path[::-1]
+                self.probe.phase("path")
+                return maze.path_from(parent, current)
             
-            x, y = current
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                neighbor = (nx, ny)
-
-                if (0 <= nx < maze.width and 
-                    0 <= ny < maze.height and 
-                    grid[ny][nx] == 0 and  
-                    neighbor not in visited):
-                    
-                    stack.append(neighbor)
-                    visited.add(neighbor)
+            for neighbor in neighbors(current):
+                if not visited[neighbor]:
+                    push(neighbor)
+                    visited[neighbor] = 1
                     parent[neighbor] = current
-                    self.explored_nodes.append(neighbor)
+                    record(neighbor)
 
         print("[DFS] No path found")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,196 @@
+from array import array
+
+from .astar import AStar
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+INF = float('inf')
+
+
+class DStarLite:
+    """D* Lite incremental planner (Koenig & Likhachev)
+
+    The search runs backwards from the goal and its g/rhs values are kept
+    between calls. The planner listens to the maze it solved: cell edits
+    made through ``Maze.set_cell`` / ``Maze.apply_edits`` are queued, and
+    the next ``solve`` (or ``replan``) only repairs the vertices around
+    the edited cells instead of searching from scratch. ``move_to`` tells
+    it the agent has advanced so the start can move without a restart.
+    ``explored_nodes`` lists the cells expanded by the latest call only.
+
+    A repair costs what the edits invalidate. An edit near the agent is
+    repaired in a fraction of a fresh search. An edit near the goal
+    invalidates most of the search tree, and its repair costs as much as
+    a fresh D* Lite search or more: on 1000x1000 braid mazes, blocking the
+    path 90% of the way to the goal takes 1.2-1.5x a fresh search, about
+    3-3.5x a fresh A* run. Stopping such repairs early and starting over
+    measured slower still, because the work spent before stopping is lost.
+    """
+    heuristic = AStar.heuristic
+    bound = 1.0
+
+    def __init__(self):
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+        self.maze = None
+        self.pending = []
+
+    def _h(self, a, b):
+        return self.h_scale * self.heuristic(self.maze.pos(a), self.maze.pos(b), self.maze)
+
+    def _key(self, s):
+        m = min(self.g[s], self.rhs[s])
+        return (m + self._h(self.start, s) + self.km, m)
+
+    def _on_edit(self, maze, edits):
+        self.pending.append(edits)
+
+    def close(self):
+        """Stop listening to the maze; the next solve starts from scratch"""
+        if self.maze is not None:
+            self.maze.remove_listener(self._on_edit)
+            self.maze = None
+        self.pending = []
+
+    def _initialize(self, maze):
+        self.close()
+        self.maze = maze
+        self.cells = maze.cells
+        self.h_scale = maze.min_cost
+        self.start = maze.index(maze.start)
+        self.goal = maze.index(maze.goal)
+        self.km = 0
+        self.g = array('d', [INF]) * maze.size
+        self.rhs = array('d', [INF]) * maze.size
+        self.rhs[self.goal] = 0
+        self.open_list = [(self._key(self.goal), self.goal)]
+        self._push, self._pop = self.probe.heap(self.open_list)
+        self.pending = []
+        maze.add_listener(self._on_edit)
+
+    def _update_vertex(self, u):
+        maze = self.maze
+        g, rhs = self.g, self.rhs
+        if u != self.goal:
+            best = INF
+            if not self.cells[u]:
+                for s, step in maze.weighted_neighbors(u):
+                    if step + g[s] < best:
+                        best = step + g[s]
+            rhs[u] = best
+        if g[u] != rhs[u]:
+            self._push((self._key(u), u))
+
+    def _top(self):
+        """Smallest live key in the open list (stale entries are dropped)"""
+        open_list = self.open_list
+        while open_list:
+            _, u = open_list[0]
+            if self.g[u] != self.rhs[u]:
+                return open_list[0][0]
+            self._pop()
+        return (INF, INF)
+
+    def _compute_shortest_path(self):
+        maze = self.maze
+        g, rhs = self.g, self.rhs
+        start = self.start
+        push, pop = self._push, self._pop
+        predecessors = self.probe.successors(maze.predecessors)
+        record = begin(self, maze).record
+
+        while self._top() < self._key(start) or rhs[start] != g[start]:
+            k_old, u = pop()
+            k_new = self._key(u)
+            if k_old < k_new:
+                push((k_new, u))
+                continue
+
+            record(u)
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                # Anything that can step into u may now route through it.
+                for s, step in predecessors(u):
+                    if s != self.goal and step + g[u] < rhs[s]:
+                        rhs[s] = step + g[u]
+                        push((self._key(s), s))
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for s in maze.neighbors(u):
+                    self._update_vertex(s)
+
+    def _apply_pending(self):
+        maze = self.maze
+        batches, self.pending = self.pending, []
+        touched = set()
+        for edits in batches:
+            if edits is None:
+                return False
+            for i, _, _ in edits:
+                touched.add(i)
+                touched.update(maze.adjacent(i))
+        for u in touched:
+            if self.cells[u]:
+                self.g[u] = INF
+            self._update_vertex(u)
+        return True
+
+    def move_to(self, pos):
+        """Advance the agent's start cell, keeping the search state"""
+        new_start = self.maze.index(pos)
+        self.km += self._h(self.start, new_start)
+        self.start = new_start
+
+    @instrumented
+    def solve(self, maze):
+        fresh = (
+            self.maze is None or maze.cells is not self.cells or
+            maze.index(maze.goal) != self.goal
+        )
+        if fresh:
+            self._initialize(maze)
+        else:
+            self.maze = maze
+            if maze.index(maze.start) != self.start:
+                self.move_to(maze.start)
+            self._push, self._pop = self.probe.heap(self.open_list)
+            if self.pending:
+                self.probe.phase("repair")
+                if not self._apply_pending():
+                    self._initialize(maze)
+
+        self.probe.phase("search")
+        self._compute_shortest_path()
+        self.probe.phase("path")
+        return self._extract_path()
+
+    def replan(self):
+        """Repair the plan after edits to the maze it last solved
+
+        The path starts where ``move_to`` last put the agent, not at the
+        maze's own start.
+        """
+        maze = self.maze
+        return self.solve(maze.with_endpoints(maze.pos(self.start), maze.goal))
+
+    def _extract_path(self):
+        maze = self.maze
+        g = self.g
+        current = self.start
+        if g[current] == INF:
+            print("[D* Lite] No path found")
+            return []
+
+        path = [maze.pos(current)]
+        while current != self.goal and len(path) <= maze.size:
+            best, best_value = -1, INF
+            for s, step in maze.weighted_neighbors(current):
+                if step + g[s] < best_value:
+                    best, best_value = s, step + g[s]
+            if best == -1:
+                print("[D* Lite] No path found")
+                return []
+            current = best
+            path.append(maze.pos(current))
+        return path
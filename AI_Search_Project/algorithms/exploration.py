@@ -0,0 +1,163 @@
+import queue
+import threading
+from array import array
+
+MODES = ("count", "sample", "full")
+
+
+# =========================
+# Exploration Recorder
+# =========================
+class Exploration:
+    """The cells a solver explores, kept within a memory budget
+
+    Solvers call ``record(i)`` with a cell index for every cell they
+    explore. What is kept depends on ``mode``:
+
+    - ``"count"``: only the number of events.
+    - ``"sample"``: an evenly spaced subsequence of at most ``limit``
+      cells; when the buffer fills, every other cell is dropped and the
+      spacing doubles.
+    - ``"full"``: every cell, as a 4-byte index.
+
+    ``len()`` is always the total number of events. Iterating yields the
+    kept cells as (x, y) positions. Each listener is called with the
+    (x, y) position of every event as it happens, whatever the mode.
+    """
+    def __init__(self, mode="full", limit=4096, listeners=()):
+        if mode not in MODES:
+            raise ValueError(f"unknown exploration mode {mode!r}, choose from {MODES}")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        self.mode = mode
+        self.limit = limit
+        self.listeners = list(listeners)
+        self.reset(None)
+
+    def reset(self, maze):
+        """Forget earlier events and start recording a search on maze"""
+        self.maze = maze
+        self.count = 0
+        self.stride = 1
+        self.cells = array('i')
+        if self.mode == "full":
+            self._store = self.cells.append
+        elif self.mode == "sample":
+            self._store = self._sample
+        else:
+            self._store = self._count
+        self.record = self._notify if self.listeners else self._store
+        return self
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+        self.record = self._notify
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+        if not self.listeners:
+            self.record = self._store
+
+    def _count(self, i):
+        self.count += 1
+
+    def _sample(self, i):
+        if self.count % self.stride == 0:
+            if len(self.cells) >= self.limit:
+                del self.cells[1::2]
+                self.stride *= 2
+            if self.count % self.stride == 0:
+                self.cells.append(i)
+        self.count += 1
+
+    def _notify(self, i):
+        self._store(i)
+        pos = self.maze.pos(i)
+        for callback in self.listeners:
+            callback(pos)
+
+    def append(self, pos):
+        """List-style recording by (x, y) position"""
+        if self.maze is None:
+            raise RuntimeError("no maze to index positions in; call reset(maze) first")
+        self.record(self.maze.index(pos))
+
+    def __len__(self):
+        return len(self.cells) if self.mode == "full" else self.count
+
+    def __iter__(self):
+        if self.maze is None:
+            return iter(())
+        pos = self.maze.pos
+        return (pos(i) for i in self.cells)
+
+
+def begin(solver, maze):
+    """Reset solver.explored_nodes for a new search on maze and return it
+
+    Solvers keep whatever Exploration the caller put in
+    ``explored_nodes``; anything else is replaced by a full recorder.
+    """
+    explored = solver.explored_nodes
+    if not isinstance(explored, Exploration):
+        explored = solver.explored_nodes = Exploration()
+    return explored.reset(maze)
+
+
+# =========================
+# Live Event Stream
+# =========================
+class _Cancelled(Exception):
+    pass
+
+
+def stream(solver, maze, mode="count", maxsize=1024):
+    """Run solver.solve(maze) in a thread and yield its events live
+
+    Yields ``("expand", (x, y))`` for each explored cell, then one
+    ``("path", path)`` when the search ends. The queue between the two
+    threads holds at most ``maxsize`` events, so a slow consumer such as
+    an animation holds the solver back instead of buffering the whole
+    search. Closing the generator early stops the search. ``mode`` is the
+    Exploration mode the solver records with meanwhile.
+    """
+    events = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def forward(pos):
+        if stopped.is_set():
+            raise _Cancelled
+        events.put(("expand", pos))
+
+    def run():
+        path = []
+        try:
+            path = solver.solve(maze)
+        except _Cancelled:
+            return
+        except BaseException as error:
+            events.put(("error", error))
+            return
+        finally:
+            explored.remove_listener(forward)
+        events.put(("path", path))
+
+    explored = solver.explored_nodes = Exploration(mode, listeners=[forward])
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, value = events.get()
+            if kind == "error":
+                raise value
+            yield kind, value
+            if kind == "path":
+                return
+    finally:
+        stopped.set()
+        # Unblock a solver waiting on a full queue so it sees the stop flag
+        while worker.is_alive():
+            try:
+                events.get(timeout=0.05)
+            except queue.Empty:
+                pass
@@ -0,0 +1,420 @@
+import time
+from array import array
+
+from .astar import AStar
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+INF = float('inf')
+
+
+class HPAStar:
+    """Hierarchical A* (HPA*, Botea, Mueller & Schaeffer) over square clusters
+
+    The maze is cut into ``cluster_size`` x ``cluster_size`` clusters.
+    Each run of cells that are open on both sides of a cluster border
+    becomes an entrance. A run shorter than ``wide_entrance`` cells gets
+    one crossing in its middle, and a longer run gets one crossing at each
+    end. The cells on either side of a crossing are the nodes of an
+    abstract graph. Its edges are the crossings themselves, plus the
+    cheapest route between every two nodes of the same cluster.
+
+    The graph is built on the first solve of a maze (or by ``prepare``)
+    and kept. A query connects start and goal to the nodes of their own
+    clusters, runs A* on the abstract graph, and then refines each
+    abstract edge with an A* confined to one cluster. Paths are usually a
+    few percent longer than optimal, because they must pass through the
+    chosen crossings.
+
+    The planner listens to the maze. Cell edits made through
+    ``Maze.set_cell``/``apply_edits`` are queued, and the next solve
+    rebuilds only the borders the edited cells lie on and the routes
+    inside the clusters involved. A new cost layer rebuilds everything.
+
+    Clusters are joined by straight crossings only, so mazes with any
+    neighbourhood other than the plain 4-connected one fall back to A*.
+    """
+    heuristic = AStar.heuristic
+    # Paths must pass through the chosen crossings: no guarantee
+    bound = None
+    # Scans the grid itself rather than calling maze.neighbors
+    needs_grid = True
+
+    def __init__(self, cluster_size=16, wide_entrance=6):
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        self.cluster_size = cluster_size
+        self.wide_entrance = wide_entrance
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+        self.maze = None
+        self.pending = []
+        self.stats = {}
+
+    # =========================
+    # Abstract Graph
+    # =========================
+    def prepare(self, maze):
+        """Build the abstract graph for maze and start following its edits"""
+        t0 = time.perf_counter()
+        self.close()
+        self.maze = maze
+        self.cells = maze.cells
+        self.pending = []
+        size = self.cluster_size
+        self.clusters_x = -(-maze.width // size)
+        self.clusters_y = -(-maze.height // size)
+        count = self.clusters_x * self.clusters_y
+        self.transitions = {}
+        self.inter = {}
+        self.entrances = [set() for _ in range(count)]
+        self.intra = [None] * count
+        self.stamp = array('I', [0]) * maze.size
+        self.dist = array('d', [0.0]) * maze.size
+        self.parent = array('i', [-1]) * maze.size
+        self.generation = 0
+
+        for c in range(count):
+            cx = c % self.clusters_x
+            if cx + 1 < self.clusters_x:
+                self._build_border(c, c + 1, True)
+            if c + self.clusters_x < count:
+                self._build_border(c, c + self.clusters_x, False)
+        for c in range(count):
+            self._intra(c)
+        maze.add_listener(self._on_edit)
+        self.stats = {
+            "clusters": count,
+            "abstract_nodes": len(self.inter),
+            "build_ms": (time.perf_counter() - t0) * 1000,
+        }
+
+    def close(self):
+        """Stop listening to the maze; the next solve builds the graph again"""
+        if self.maze is not None:
+            self.maze.remove_listener(self._on_edit)
+            self.maze = None
+        self.pending = []
+
+    def cluster_of(self, i):
+        x, y = i % self.maze.width, i // self.maze.width
+        return (y // self.cluster_size) * self.clusters_x + x // self.cluster_size
+
+    def _bounds(self, c):
+        size = self.cluster_size
+        x0 = (c % self.clusters_x) * size
+        y0 = (c // self.clusters_x) * size
+        return x0, y0, min(x0 + size, self.maze.width), min(y0 + size, self.maze.height)
+
+    def _build_border(self, c, d, right):
+        """(Re)place the crossings between cluster c and the one right of it
+        (``right``) or below it
+
+        The direction is passed in: in a maze one cluster wide the cluster
+        below is also c + 1.
+        """
+        maze = self.maze
+        cells = self.cells
+        w = maze.width
+        for a, b in self.transitions.pop((c, d), ()):
+            for u, v in ((a, b), (b, a)):
+                del self.inter[u][v]
+                if not self.inter[u]:
+                    del self.inter[u]
+                    self.entrances[self.cluster_of(u)].discard(u)
+
+        x0, y0, x1, y1 = self._bounds(c)
+        if right:
+            pairs = [(y * w + x1 - 1, y * w + x1) for y in range(y0, y1)]
+        else:
+            pairs = [((y1 - 1) * w + x, y1 * w + x) for x in range(x0, x1)]
+
+        crossings = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not cells[a] and not cells[b]:
+                run.append((a, b))
+                continue
+            if len(run) >= self.wide_entrance:
+                crossings += [run[0], run[-1]]
+            elif run:
+                crossings.append(run[len(run) // 2])
+            run = []
+
+        for a, b in crossings:
+            self.inter.setdefault(a, {})[b] = maze.cost(b)
+            self.inter.setdefault(b, {})[a] = maze.cost(a)
+            self.entrances[c].add(a)
+            self.entrances[d].add(b)
+        self.transitions[(c, d)] = crossings
+
+    def _intra(self, c):
+        """Cheapest in-cluster routes between cluster c's nodes (cached)"""
+        edges = self.intra[c]
+        if edges is None:
+            cost = self.maze.cost
+            nodes = sorted(self.entrances[c])
+            edges = {node: [] for node in nodes}
+            for k, node in enumerate(nodes[:-1]):
+                for other, d in self._flood(node, c, set(nodes[k + 1:])).items():
+                    edges[node].append((other, d))
+                    # The reversed route enters node instead of other
+                    edges[other].append((node, d - cost(other) + cost(node)))
+            self.intra[c] = edges
+        return edges
+
+    def _on_edit(self, maze, edits):
+        self.pending.append(edits)
+
+    def _apply_pending(self):
+        """Rebuild only the borders and cluster routes the queued edits touch"""
+        pending, self.pending = self.pending, []
+        if any(edits is None for edits in pending):
+            self.prepare(self.maze)
+            return
+        cx_count = self.clusters_x
+        count = len(self.intra)
+        size = self.cluster_size
+        w = self.maze.width
+        borders = set()
+        dirty = set()
+        for edits in pending:
+            for i, _, _ in edits:
+                c = self.cluster_of(i)
+                dirty.add(c)
+                x, y = i % w, i // w
+                if x % size == 0 and c % cx_count:
+                    borders.add((c - 1, c, True))
+                if (x + 1) % size == 0 and c % cx_count + 1 < cx_count:
+                    borders.add((c, c + 1, True))
+                if y % size == 0 and c >= cx_count:
+                    borders.add((c - cx_count, c, False))
+                if (y + 1) % size == 0 and c + cx_count < count:
+                    borders.add((c, c + cx_count, False))
+        for c, d, right in borders:
+            self._build_border(c, d, right)
+            dirty.update((c, d))
+        for c in dirty:
+            self.intra[c] = None
+        self.stats["abstract_nodes"] = len(self.inter)
+        self.stats["rebuilt_clusters"] = len(dirty)
+
+    # =========================
+    # Cluster-Local Searches
+    # =========================
+    def _steps(self, i, x0, y0, x1, y1):
+        """Free neighbours of i that stay inside the box [x0, x1) x [y0, y1)"""
+        cells = self.cells
+        w = self.maze.width
+        x, y = i % w, i // w
+        result = []
+        if y > y0 and not cells[i - w]:
+            result.append(i - w)
+        if y < y1 - 1 and not cells[i + w]:
+            result.append(i + w)
+        if x > x0 and not cells[i - 1]:
+            result.append(i - 1)
+        if x < x1 - 1 and not cells[i + 1]:
+            result.append(i + 1)
+        return result
+
+    def _flood(self, source, c, targets, backward=False, record=None):
+        """Cheapest costs from source to the targets it reaches inside cluster c
+
+        With ``backward`` the costs are from each target to source. Unit
+        cost mazes flood breadth-first, weighted ones run Dijkstra; either
+        stops once every target is reached.
+        """
+        maze = self.maze
+        x0, y0, x1, y1 = self._bounds(c)
+        self.generation += 1
+        generation = self.generation
+        stamp, dist = self.stamp, self.dist
+        stamp[source] = generation
+        found = {}
+        remaining = len(targets)
+
+        if maze.costs is None:
+            cells = self.cells
+            w = maze.width
+            layer = [source]
+            d = 0
+            while layer and remaining:
+                next_layer = []
+                for current in layer:
+                    if record is not None:
+                        record(current)
+                    if current in targets:
+                        found[current] = d
+                        remaining -= 1
+                    y, x = divmod(current, w)
+                    if y > y0 and not cells[current - w] and stamp[current - w] != generation:
+                        stamp[current - w] = generation
+                        next_layer.append(current - w)
+                    if y < y1 - 1 and not cells[current + w] and stamp[current + w] != generation:
+                        stamp[current + w] = generation
+                        next_layer.append(current + w)
+                    if x > x0 and not cells[current - 1] and stamp[current - 1] != generation:
+                        stamp[current - 1] = generation
+                        next_layer.append(current - 1)
+                    if x < x1 - 1 and not cells[current + 1] and stamp[current + 1] != generation:
+                        stamp[current + 1] = generation
+                        next_layer.append(current + 1)
+                self.probe.layer(layer, next_layer)
+                layer = next_layer
+                d += 1
+            return found
+
+        costs = maze.costs
+        dist[source] = 0
+        frontier = [(0, source)]
+        push, pop = self.probe.heap(frontier)
+        steps = self.probe.successors(self._steps)
+        while frontier and remaining:
+            d, current = pop()
+            if d > dist[current]:
+                continue
+            if record is not None:
+                record(current)
+            if current in targets:
+                found[current] = d
+                remaining -= 1
+            back_step = costs[current]
+            for neighbor in steps(current, x0, y0, x1, y1):
+                new_d = d + (back_step if backward else costs[neighbor])
+                if stamp[neighbor] != generation or new_d < dist[neighbor]:
+                    stamp[neighbor] = generation
+                    dist[neighbor] = new_d
+                    push((new_d, neighbor))
+        return found
+
+    def _refine(self, source, target, c, record):
+        """Cell route from source to target found by A* confined to cluster c"""
+        maze = self.maze
+        x0, y0, x1, y1 = self._bounds(c)
+        h_scale = maze.min_cost
+        goal_pos = maze.pos(target)
+        self.generation += 1
+        generation = self.generation
+        stamp, dist, parent = self.stamp, self.dist, self.parent
+        stamp[source] = generation
+        dist[source] = 0
+        parent[source] = -1
+        frontier = [(0, 0, source)]
+        push, pop = self.probe.heap(frontier)
+        steps = self.probe.successors(self._steps)
+        while frontier:
+            _, g, current = pop()
+            if g > dist[current]:
+                continue
+            record(current)
+            if current == target:
+                break
+            for neighbor in steps(current, x0, y0, x1, y1):
+                new_g = g + maze.cost(neighbor)
+                if stamp[neighbor] != generation or new_g < dist[neighbor]:
+                    stamp[neighbor] = generation
+                    dist[neighbor] = new_g
+                    parent[neighbor] = current
+                    f = new_g + h_scale * self.heuristic(maze.pos(neighbor), goal_pos, maze)
+                    push((f, new_g, neighbor))
+        route = []
+        i = target
+        while i != -1:
+            route.append(i)
+            i = parent[i]
+        return route[::-1]
+
+    # =========================
+    # Queries
+    # =========================
+    @instrumented
+    def solve(self, maze):
+        nb = maze.neighborhood
+        if nb.kind != "4" or not nb.uniform:
+            astar = AStar()
+            astar.explored_nodes = self.explored_nodes
+            astar.probe = self.probe
+            return astar.solve(maze)
+        probe = self.probe
+        if self.maze is None or self.cells is not maze.cells:
+            probe.phase("build")
+            self.prepare(maze)
+        elif self.pending:
+            probe.phase("repair")
+            self._apply_pending()
+        probe.phase("connect")
+
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        record = begin(self, maze).record
+        if start == goal:
+            record(start)
+            return [maze.start]
+
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        start_targets = set(self.entrances[start_cluster])
+        if start_cluster == goal_cluster:
+            start_targets.add(goal)
+        start_edges = self._flood(start, start_cluster, start_targets, record=record)
+        goal_edges = self._flood(goal, goal_cluster, self.entrances[goal_cluster], backward=True, record=record)
+
+        probe.phase("abstract")
+        abstract = self._abstract_search(maze, start, goal, start_edges, goal_edges)
+        self.stats["abstract_expanded"] = self.abstract_expanded
+        if not abstract:
+            print("[HPA*] No path found")
+            return []
+
+        probe.phase("refine")
+        route = [start]
+        for u, v in zip(abstract, abstract[1:]):
+            c = self.cluster_of(u)
+            if c != self.cluster_of(v):
+                route.append(v)
+            else:
+                route += self._refine(u, v, c, record)[1:]
+        return [maze.pos(i) for i in route]
+
+    def _abstract_search(self, maze, start, goal, start_edges, goal_edges):
+        """A* over the abstract graph from start to goal; node list or []"""
+        h_scale = maze.min_cost
+        goal_pos = maze.goal
+        inter = self.inter
+        g = {start: 0}
+        parent = {start: None}
+        closed = set()
+        frontier = [(h_scale * self.heuristic(maze.start, goal_pos, maze), 0, start)]
+        push, pop = self.probe.heap(frontier)
+        self.abstract_expanded = 0
+
+        while frontier:
+            _, current_g, current = pop()
+            if current == goal:
+                nodes = []
+                while current is not None:
+                    nodes.append(current)
+                    current = parent[current]
+                return nodes[::-1]
+            if current in closed:
+                continue
+            closed.add(current)
+            self.abstract_expanded += 1
+
+            if current == start:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self._intra(self.cluster_of(current)).get(current, ()))
+                if current in goal_edges:
+                    edges.append((goal, goal_edges[current]))
+            edges += inter.get(current, {}).items()
+
+            for neighbor, step in edges:
+                new_g = current_g + step
+                if new_g < g.get(neighbor, INF):
+                    g[neighbor] = new_g
+                    parent[neighbor] = current
+                    f = new_g + h_scale * self.heuristic(maze.pos(neighbor), goal_pos, maze)
+                    push((f, new_g, neighbor))
+        return []
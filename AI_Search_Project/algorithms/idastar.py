@@ -0,0 +1,25 @@
+from .astar import AStar
+from .ids import IDS
+
+class IDAStar(IDS):
+    """IDA*: the iterative deepening engine bounded by f = g + h
+
+    Uses ``AStar.heuristic`` (scaled by the cheapest cell cost) and the
+    maze cost layer, so it returns the same cost as A* while keeping only
+    the current path on its stack.
+    """
+    name = "IDA*"
+    unit_steps = False
+
+    heuristic = AStar.heuristic
+
+    def step_edges(self, maze, current):
+        return maze.weighted_neighbors(current)
+
+    def estimate(self, maze, node, goal_pos):
+        return maze.min_cost * self.heuristic(maze.pos(node), goal_pos, maze)
+
+    def initial_bound(self, maze):
+        if self.start_depth is not None:
+            return self.start_depth
+        return maze.min_cost * self.heuristic(maze.start, maze.goal, maze)
@@ -1,70 +1,111 @@
+from array import array
+
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
 class IDS:
-    def __init__(self):
-        self.explored_nodes = []
+    """Iterative Deepening Search with an explicit stack
+
+    Each iteration runs a depth-limited DFS that keeps only the current
+    path on its stack, so long paths never touch Python's recursion limit.
+    Two per-cell arrays (the iteration stamp and the cheapest depth a cell
+    was reached at) are allocated once per solve and reused by every
+    iteration: a cell is only re-entered when it is reached more cheaply
+    than before, which prunes repeated work without losing shallower
+    routes. The first limit is the fewest moves the maze's neighbourhood
+    needs to reach the goal (the Manhattan distance when 4-connected)
+    unless ``start_depth`` is given.
+    """
+    name = "IDS"
+    bound = 1.0
+    unit_steps = True
+
+    def __init__(self, start_depth=None):
+        self.start_depth = start_depth
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
 
+    def step_edges(self, maze, current):
+        return [(neighbor, 1) for neighbor in maze.neighbors(current)]
+
+    def estimate(self, maze, node, goal_pos):
+        return 0
+
+    def initial_bound(self, maze):
+        if self.start_depth is not None:
+            return self.start_depth
+        (x1, y1), (x2, y2) = maze.start, maze.goal
+        return maze.neighborhood.min_moves(x2 - x1, y2 - y1)
+
+    @instrumented
     def solve(self, maze):
-        start = maze.start
-        goal = maze.goal
-        max_depth = maze.width * maze.height
-
-        for depth in range(max_depth):
-            visited = set()
-            parent = {start: None}
-            self.explored_nodes = [start]
-
-            found = self.dls(
-                maze,
-                start,
-                goal,
-                depth,
-                visited,
-                parent
-            )
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+
+        stamp = array('I', [0]) * maze.size
+        best_g = array('d', [0.0]) * maze.size
+        path = array('i')
+        bound = self.initial_bound(maze)
+        iteration = 0
+        self.probe.phase("search")
 
+        while bound != float('inf'):
+            iteration += 1
+            begin(self, maze).record(start)
+            found, bound = self.dls(maze, start, goal, bound, iteration, stamp, best_g, path)
             if found:
-                path = []
-                current = goal
-                while current is not None:
-                    path.append(current)
-                    current = parent[current]
-                return path[::-1]
-
-        print("[IDS] No path found")
+                self.probe.phase("path")
+                return [maze.pos(i) for i in path]
+
+        print(f"[{self.name}] No path found")
         return []
 
-    def dls(self, maze, current, goal, depth, visited, parent):
-        if current == goal:
-            return True
-
-        if depth == 0:
-            return False
-
-        visited.add(current)
-
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-        x, y = current
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            neighbor = (nx, ny)
-
-            if (
-                0 <= nx < maze.width and
-                0 <= ny < maze.height and
-                maze.grid[ny][nx] == 0 and
-                neighbor not in visited
-            ):
-                parent[neighbor] = current
-                self.explored_nodes.append(neighbor)
-
-                if self.dls(
-                    maze,
-                    neighbor,
-                    goal,
-                    depth - 1,
-                    visited,
-                    parent
-                ):
-                    return True
-
-        return False
+    def dls(self, maze, start, goal, bound, iteration, stamp, best_g, path):
+        """Bounded DFS from start; returns (found, next bound)
+
+        On success ``path`` holds the cell indices from start to goal.
+        Otherwise the next bound is the smallest f value that was cut off,
+        or infinity when nothing was cut off (the goal is unreachable).
+        """
+        goal_pos = maze.goal
+        record = self.explored_nodes.record
+        next_bound = float('inf')
+
+        del path[:]
+        push, pop = self.probe.frontier(path, path.append, path.pop)
+        step_edges = self.probe.successors(self.step_edges)
+        push(start)
+        g_stack = [0]
+        edges_stack = [iter(step_edges(maze, start))]
+        stamp[start] = iteration
+        best_g[start] = 0
+
+        while path:
+            current = path[-1]
+            if current == goal:
+                return True, bound
+
+            g = g_stack[-1]
+            for neighbor, step in edges_stack[-1]:
+                new_g = g + step
+                if stamp[neighbor] == iteration and new_g >= best_g[neighbor]:
+                    continue
+                f = new_g + self.estimate(maze, neighbor, goal_pos)
+                if f > bound:
+                    if f < next_bound:
+                        next_bound = f
+                    continue
+
+                stamp[neighbor] = iteration
+                best_g[neighbor] = new_g
+                record(neighbor)
+                push(neighbor)
+                g_stack.append(new_g)
+                edges_stack.append(iter(step_edges(maze, neighbor)))
+                break
+            else:
+                pop()
+                g_stack.pop()
+                edges_stack.pop()
+
+        return False, next_bound
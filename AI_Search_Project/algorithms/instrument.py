@@ -0,0 +1,221 @@
+import cProfile
+import functools
+import heapq
+import pstats
+import time
+import tracemalloc
+from functools import partial
+
+
+# =========================
+# Search Counters
+# =========================
+class SearchStats:
+    """Counters and phase timings of one solve
+
+    - ``expanded``: cells whose successors were generated
+    - ``generated``: successors produced by those expansions
+    - ``pushes`` / ``pops``: frontier operations (heap operations for
+      the heap-based solvers)
+    - ``duplicates``: pushes of a cell that was already pushed in this
+      solve (stale heap entries, re-opened cells)
+    - ``peak_frontier``: most entries one frontier held at once (a
+      breadth-first level counts together with the level it produces)
+    - ``phases_ms``: wall time per named phase, ``total_ms`` the whole solve
+    """
+    FIELDS = ("expanded", "generated", "duplicates", "pushes", "pops", "peak_frontier")
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.pushes = 0
+        self.pops = 0
+        self.peak_frontier = 0
+        self.phases_ms = {}
+        self.total_ms = 0.0
+
+    def as_dict(self):
+        result = {field: getattr(self, field) for field in self.FIELDS}
+        result["phases_ms"] = dict(self.phases_ms)
+        result["total_ms"] = self.total_ms
+        return result
+
+    def __repr__(self):
+        counts = ", ".join(f"{field}={getattr(self, field)}" for field in self.FIELDS)
+        return f"SearchStats({counts}, total_ms={self.total_ms:.3f})"
+
+
+# =========================
+# Probe
+# =========================
+class Probe:
+    """Instrumentation hooks a solver threads through its hot loop
+
+    A solver asks the probe for its successor function and its frontier
+    operations once per solve and calls what it gets back. A disabled
+    probe (the default on every solver) hands back the plain functions,
+    so the only cost left is a few calls per solve. An enabled probe
+    hands back counting wrappers and fills ``stats`` (a SearchStats) for
+    the latest solve.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stats = SearchStats()
+        self._depth = 0
+        self._seen = None
+        self._phase = None
+        self._phase_start = 0
+
+    def begin(self, maze):
+        """Start counting a solve on maze (nested solves share the counts)"""
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self.stats = SearchStats()
+        self._seen = bytearray(maze.size)
+        self._start = time.perf_counter_ns()
+        self._phase = None
+        self.phase("setup")
+
+    def end(self):
+        if self._depth == 1:
+            self.phase(None)
+        self._depth -= 1
+        if self._depth:
+            return
+        self.stats.total_ms = (time.perf_counter_ns() - self._start) / 1_000_000
+
+    def phase(self, name):
+        """Close the running phase and start timing name (None just closes)"""
+        if not self.enabled or self._depth == 0:
+            return
+        now = time.perf_counter_ns()
+        if self._phase is not None:
+            phases = self.stats.phases_ms
+            phases[self._phase] = phases.get(self._phase, 0.0) + (now - self._phase_start) / 1_000_000
+        self._phase = name
+        self._phase_start = now
+
+    def successors(self, fn):
+        """fn itself, or a wrapper counting each call as one expansion"""
+        if not self.enabled:
+            return fn
+        stats = self.stats
+
+        def counted(*args):
+            result = fn(*args)
+            stats.expanded += 1
+            stats.generated += len(result)
+            return result
+        return counted
+
+    def frontier(self, container, push, pop):
+        """(push, pop) as given, or wrappers counting frontier traffic
+
+        ``push`` adds one entry to ``container`` and ``pop`` takes one out.
+        Entries are cell indices or tuples ending with one.
+        """
+        if not self.enabled:
+            return push, pop
+        stats = self.stats
+        seen = self._seen
+
+        def counted_push(entry):
+            push(entry)
+            cell = entry[-1] if type(entry) is tuple else entry
+            if seen[cell]:
+                stats.duplicates += 1
+            else:
+                seen[cell] = 1
+            stats.pushes += 1
+            if len(container) > stats.peak_frontier:
+                stats.peak_frontier = len(container)
+
+        def counted_pop():
+            stats.pops += 1
+            return pop()
+        return counted_push, counted_pop
+
+    def heap(self, heap):
+        """push(entry)/pop() on a heapq list, counted when enabled"""
+        return self.frontier(heap, partial(heapq.heappush, heap), partial(heapq.heappop, heap))
+
+    def layer(self, consumed, produced):
+        """Count one level of a breadth-first search
+
+        Every cell of ``consumed`` was expanded and left the frontier, and
+        ``produced`` holds the new cells that joined it.
+        """
+        if not self.enabled:
+            return
+        stats = self.stats
+        stats.expanded += len(consumed)
+        stats.generated += len(produced)
+        stats.pops += len(consumed)
+        stats.pushes += len(produced)
+        stats.peak_frontier = max(stats.peak_frontier, len(consumed) + len(produced))
+
+
+def instrumented(solve):
+    """Decorator for solve(self, maze): brackets the call with self.probe"""
+    @functools.wraps(solve)
+    def wrapper(self, maze):
+        probe = self.probe
+        if not probe.enabled:
+            return solve(self, maze)
+        probe.begin(maze)
+        try:
+            return solve(self, maze)
+        finally:
+            probe.end()
+    return wrapper
+
+
+# =========================
+# Profiling Capture
+# =========================
+def capture(solver, maze, profile=True, memory=True, top=5):
+    """Solve maze under an enabled probe and report what it saw
+
+    ``memory`` traces the solve's allocations with tracemalloc and
+    reports the peak above the starting point. ``profile`` runs it (again,
+    so the profiler's own allocations stay out of the peak) under
+    cProfile and keeps the ``top`` functions by own time, as (function,
+    calls, own ms, cumulative ms). Both slow the solve down, so the phase
+    timings are only comparable with each other.
+    """
+    previous = solver.probe
+    solver.probe = Probe()
+    result = {}
+    try:
+        if memory:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            try:
+                result["path"] = solver.solve(maze)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                if not tracing:
+                    tracemalloc.stop()
+            result["peak_kb"] = max(peak - base, 0) / 1024
+        if profile or not memory:
+            profiler = cProfile.Profile() if profile else None
+            if profiler is not None:
+                result["path"] = profiler.runcall(solver.solve, maze)
+            else:
+                result["path"] = solver.solve(maze)
+        result["stats"] = solver.probe.stats
+    finally:
+        solver.probe = previous
+
+    if profile:
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+            rows.append((f"{name} ({filename.rsplit('/', 1)[-1]}:{line})", calls, own * 1000, cumulative * 1000))
+        rows.sort(key=lambda row: -row[2])
+        result["profile"] = rows[:top]
+    return result
@@ -0,0 +1,227 @@
+import math
+from array import array
+
+from .astar import AStar
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
+
+SQRT2 = math.sqrt(2)
+
+
+def _manhattan(dx, dy):
+    return abs(dx) + abs(dy)
+
+
+def _octile(dx, dy):
+    dx, dy = abs(dx), abs(dy)
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+class JPS:
+    """Jump Point Search for uniform-cost grids
+
+    Runs A* over jump points only: straight (and, when ``diagonal`` is
+    set, diagonal) runs are scanned without touching the heap until a
+    forced neighbour or the goal shows up, so the symmetric routes through
+    open rooms are never pushed. ``diagonal=False`` is the 4-connected
+    variant (vertical scans look sideways at every step);
+    ``diagonal=True`` moves in 8 directions without cutting corners and
+    uses octile costs. By default the variant follows the maze's
+    neighbourhood. Mazes with a non-uniform cost layer, or with a
+    neighbourhood neither variant matches, fall back to A*.
+    """
+    bound = 1.0
+    # Scans the grid itself rather than calling maze.neighbors
+    needs_grid = True
+
+    def __init__(self, diagonal=None):
+        self.diagonal = diagonal
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
+
+    def _variant(self, maze):
+        """True/False for the 8/4-direction variant, None if A* must run"""
+        costs = maze.costs
+        if costs is not None and min(costs) != max(costs):
+            return None
+        if self.diagonal is not None:
+            return self.diagonal
+        nb = maze.neighborhood
+        if nb.kind == "4" and nb.uniform:
+            return False
+        if nb.kind == "8" and nb.corners == "no_cut" and all(
+                nb.length(dx, dy) == (SQRT2 if dx and dy else 1) for dx, dy in nb.moves):
+            return True
+        return None
+
+    @instrumented
+    def solve(self, maze):
+        diagonal = self._variant(maze)
+        if diagonal is None:
+            astar = AStar()
+            astar.explored_nodes = self.explored_nodes
+            astar.probe = self.probe
+            return astar.solve(maze)
+        distance = _octile if diagonal else _manhattan
+        unit = maze.min_cost
+
+        width, height = maze.width, maze.height
+        cells = maze.cells
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        gx, gy = maze.goal
+
+        def free(x, y):
+            return 0 <= x < width and 0 <= y < height and not cells[y * width + x]
+
+        def jump_straight(x, y, dx, dy):
+            while True:
+                if not free(x, y):
+                    return None
+                if x == gx and y == gy:
+                    return x, y
+                if dx:
+                    if ((free(x, y - 1) and not free(x - dx, y - 1)) or
+                            (free(x, y + 1) and not free(x - dx, y + 1))):
+                        return x, y
+                else:
+                    if ((free(x - 1, y) and not free(x - 1, y - dy)) or
+                            (free(x + 1, y) and not free(x + 1, y - dy))):
+                        return x, y
+                    if not diagonal and (
+                            jump_straight(x + 1, y, 1, 0) or
+                            jump_straight(x - 1, y, -1, 0)):
+                        return x, y
+                x += dx
+                y += dy
+
+        def jump_diagonal(x, y, dx, dy):
+            while True:
+                if not free(x, y):
+                    return None
+                if x == gx and y == gy:
+                    return x, y
+                if jump_straight(x + dx, y, dx, 0) or jump_straight(x, y + dy, 0, dy):
+                    return x, y
+                if not (free(x + dx, y) and free(x, y + dy)):
+                    return None
+                x += dx
+                y += dy
+
+        def successors(x, y, px, py):
+            if px < 0:
+                dirs = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+                if diagonal:
+                    dirs += [(dx, dy) for dx in (-1, 1) for dy in (-1, 1)
+                             if free(x + dx, y) and free(x, y + dy)]
+                return [d for d in dirs if free(x + d[0], y + d[1])]
+
+            dx = (x > px) - (x < px)
+            dy = (y > py) - (y < py)
+            dirs = []
+            if dx and dy:
+                side_x = free(x + dx, y)
+                side_y = free(x, y + dy)
+                if side_y:
+                    dirs.append((0, dy))
+                if side_x:
+                    dirs.append((dx, 0))
+                if side_x and side_y:
+                    dirs.append((dx, dy))
+            elif not diagonal:
+                if dx:
+                    dirs = [(0, -1), (0, 1), (dx, 0)]
+                else:
+                    dirs = [(-1, 0), (1, 0), (0, dy)]
+                dirs = [d for d in dirs if free(x + d[0], y + d[1])]
+            elif dx:
+                ahead = free(x + dx, y)
+                up = free(x, y - 1)
+                down = free(x, y + 1)
+                if ahead:
+                    dirs.append((dx, 0))
+                    if up:
+                        dirs.append((dx, -1))
+                    if down:
+                        dirs.append((dx, 1))
+                if up:
+                    dirs.append((0, -1))
+                if down:
+                    dirs.append((0, 1))
+            else:
+                ahead = free(x, y + dy)
+                left = free(x - 1, y)
+                right = free(x + 1, y)
+                if ahead:
+                    dirs.append((0, dy))
+                    if left:
+                        dirs.append((-1, dy))
+                    if right:
+                        dirs.append((1, dy))
+                if left:
+                    dirs.append((-1, 0))
+                if right:
+                    dirs.append((1, 0))
+            return dirs
+
+        open_list = [(unit * distance(gx - maze.start[0], gy - maze.start[1]), 0, start)]
+        push, pop = self.probe.heap(open_list)
+        jump_directions = self.probe.successors(successors)
+        parent = maze.new_parents()
+        g_cost = array('d', [float('inf')]) * maze.size
+        g_cost[start] = 0
+        closed = maze.new_visited()
+        record = begin(self, maze).record
+        record(start)
+        self.probe.phase("search")
+
+        while open_list:
+            _, current_g, current = pop()
+
+            if current == goal:
+                self.probe.phase("path")
+                return self._expand(maze, parent, current)
+
+            if closed[current]:
+                continue
+            closed[current] = 1
+
+            x, y = maze.pos(current)
+            p = parent[current]
+            px, py = maze.pos(p) if p != -1 else (-1, -1)
+
+            for dx, dy in jump_directions(x, y, px, py):
+                if dx and dy:
+                    point = jump_diagonal(x + dx, y + dy, dx, dy)
+                else:
+                    point = jump_straight(x + dx, y + dy, dx, dy)
+                if point is None:
+                    continue
+
+                neighbor = maze.index(point)
+                if closed[neighbor]:
+                    continue
+                tentative_g = current_g + unit * distance(point[0] - x, point[1] - y)
+                if tentative_g < g_cost[neighbor]:
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    f_cost = tentative_g + unit * distance(gx - point[0], gy - point[1])
+                    push((f_cost, tentative_g, neighbor))
+                    record(neighbor)
+
+        print("[JPS] No path found")
+        return []
+
+    def _expand(self, maze, parent, goal):
+        """Fill in the straight/diagonal runs between jump points"""
+        jump_points = maze.path_from(parent, goal)
+        path = jump_points[:1]
+        for x2, y2 in jump_points[1:]:
+            x, y = path[-1]
+            dx = (x2 > x) - (x2 < x)
+            dy = (y2 > y) - (y2 < y)
+            while (x, y) != (x2, y2):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
@@ -0,0 +1,189 @@
+import time
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+INF = float('inf')
+
+
+# =========================
+# Landmark Distances
+# =========================
+class Landmarks:
+    """ALT (A*, landmarks, triangle inequality) lower bounds for one Maze
+
+    ``count`` landmarks are picked by farthest-point selection: the first
+    one is the free cell farthest from the maze's start, and each next one
+    is the cell farthest from every landmark so far. Landmarks end up in
+    remote corners and dead ends, which is where they help most. Each
+    landmark L keeps the exact cost from L to every cell. When steps
+    cost the same both ways (no cost layer) that one array also gives
+    the cost back to L. Otherwise a second array holds the cost to L.
+    Arrays are float32, or float64 when step costs are not whole numbers
+    (octile diagonals), so their sums stay exact.
+
+    For cells a and b, the triangle inequality gives two lower bounds:
+    d(a, b) >= d(L, b) - d(L, a) and d(a, b) >= d(a, L) - d(b, L). The
+    estimate is the largest of these over the ``active`` landmarks that
+    bound the query best. In open rooms the plain distance can be larger,
+    so it is also taken into account (``AStar.heuristic`` scaled by the
+    cheapest step). Both are consistent, so their maximum is too, and A*
+    stays optimal. Edits to the maze rebuild the arrays on the next
+    estimate.
+    """
+    def __init__(self, maze, count=8, active=4):
+        if count < 1:
+            raise ValueError("count must be positive")
+        self.maze = maze
+        self.count = count
+        self.active = active
+        self.build()
+
+    def build(self):
+        t0 = time.perf_counter_ns()
+        maze = self.maze
+        lengths = maze.neighborhood.lengths
+        self.symmetric = maze.costs is None and all(
+            maze.neighborhood.length(-dx, -dy) == maze.neighborhood.length(dx, dy)
+            for dx, dy in maze.neighborhood.moves)
+        whole = all(type(l) is int for l in lengths) and (
+            maze.costs is None or all(c == int(c) for c in maze.costs))
+        self.typecode = 'f' if whole else 'd'
+
+        self.cells = []
+        self.forward = []
+        self.backward = []
+        free = [i for i in range(maze.size) if not maze.cells[i]]
+        if free:
+            origin = maze.index(maze.start)
+            if maze.cells[origin]:
+                origin = free[0]
+            nearest = self._field(origin)
+            while len(self.cells) < min(self.count, len(free)):
+                landmark = max(free, key=lambda i: nearest[i] if nearest[i] != INF else -1)
+                if landmark in self.cells or nearest[landmark] <= 0:
+                    break
+                field = self._field(landmark)
+                self.cells.append(landmark)
+                self.forward.append(field)
+                self.backward.append(field if self.symmetric else self._field(landmark, toward=True))
+                if len(self.cells) == 1:
+                    nearest = field
+                else:
+                    nearest = array(self.typecode, map(min, nearest, field))
+        self.version = maze.version
+        self.build_ms = (time.perf_counter_ns() - t0) / 1_000_000
+
+    def _field(self, source, toward=False):
+        """Cost from source to every cell (to source with ``toward``)"""
+        maze = self.maze
+        if maze.costs is None and maze.neighborhood.uniform:
+            dist = array(self.typecode, [INF]) * maze.size
+            dist[source] = 0
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                d = dist[current] + 1
+                for neighbor in maze.neighbors(current):
+                    if dist[neighbor] == INF:
+                        dist[neighbor] = d
+                        queue.append(neighbor)
+            return dist
+
+        exact = array('d', [INF]) * maze.size
+        exact[source] = 0
+        edges = maze.predecessors if toward else maze.weighted_neighbors
+        frontier = [(0, source)]
+        while frontier:
+            d, current = heappop(frontier)
+            if d > exact[current]:
+                continue
+            for neighbor, step in edges(current):
+                new_d = d + step
+                if new_d < exact[neighbor]:
+                    exact[neighbor] = new_d
+                    heappush(frontier, (new_d, neighbor))
+        return exact if self.typecode == 'd' else array('f', exact)
+
+    @property
+    def nbytes(self):
+        arrays = self.forward if self.symmetric else self.forward + self.backward
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def stats(self):
+        return {
+            "landmarks": len(self.cells),
+            "positions": [self.maze.pos(i) for i in self.cells],
+            "symmetric": self.symmetric,
+            "build_ms": self.build_ms,
+            "kb": self.nbytes / 1024,
+        }
+
+    # =========================
+    # Estimates
+    # =========================
+    def bound(self, a, b):
+        """Best lower bound on the cost from cell a to cell b over all landmarks"""
+        best = 0.0
+        for f, r in zip(self.forward, self.backward):
+            best = max(best, f[b] - f[a], r[a] - r[b])
+        return best
+
+    def estimator(self, maze, target, toward=True, source=None):
+        """Function i -> lower bound on the cost from cell i to target
+
+        With ``toward=False`` it bounds the cost from target to i instead
+        (what a backward search needs). The ``active`` landmarks that
+        bound source -> target (target's own distances without a source)
+        the most are the only ones consulted.
+        """
+        if maze.cells is not self.maze.cells:
+            raise ValueError("these landmarks belong to another maze")
+        if self.version != self.maze.version:
+            self.build()
+
+        pairs = list(zip(self.forward, self.backward))
+        if self.active and len(pairs) > self.active:
+            if source is None:
+                key = lambda fr: fr[0][target] + fr[1][target]
+            elif toward:
+                key = lambda fr: max(fr[0][target] - fr[0][source], fr[1][source] - fr[1][target])
+            else:
+                key = lambda fr: max(fr[0][source] - fr[0][target], fr[1][target] - fr[1][source])
+            pairs = sorted(pairs, key=key, reverse=True)[:self.active]
+
+        metric = maze.neighborhood.metric
+        h_scale = maze.min_cost
+        width = maze.width
+        ty, tx = divmod(target, width)
+
+        if self.symmetric:
+            pinned = [(f, f[target]) for f, _ in pairs]
+
+            def estimate(i):
+                best = h_scale * metric(i % width - tx, i // width - ty)
+                for f, ft in pinned:
+                    d = ft - f[i]
+                    if d < 0:
+                        d = -d
+                    if d > best:
+                        best = d
+                return best
+            return estimate
+
+        # toward: d(i, t) >= F[t] - F[i] and R[i] - R[t];
+        # from target: d(t, i) >= F[i] - F[t] and R[t] - R[i]
+        sign = 1 if toward else -1
+        pinned = [(f, f[target], r, r[target]) for f, r in pairs]
+
+        def estimate(i):
+            best = h_scale * metric(i % width - tx, i // width - ty)
+            for f, ft, r, rt in pinned:
+                d = sign * (ft - f[i])
+                if d > best:
+                    best = d
+                d = sign * (r[i] - rt)
+                if d > best:
+                    best = d
+            return best
+        return estimate
@@ -1,38 +1,62 @@
-import heapq
+from array import array
+
+from .exploration import Exploration, begin
+from .instrument import Probe, instrumented
 
 class UCS:
-    def __init__(self):
-        self.explored_nodes = []
+    """Uniform Cost Search (Dijkstra) on a binary heap
+
+    Stale heap entries are skipped on pop (lazy deletion) and every cell is
+    expanded at most once. Step costs come from the maze cost layer; an
+    explicit flat ``costs`` sequence passed here overrides it.
+    """
+    bound = 1.0
+
+    def __init__(self, costs=None):
+        self.costs = costs
+        self.explored_nodes = Exploration()
+        self.probe = Probe(enabled=False)
 
+    @instrumented
     def solve(self, maze):
-        start = maze.start
-        goal = maze.goal
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        costs = self.costs
 
-        frontier = [(0, start, None)]  
-        came_from = {start: None}
-        cost_so_far = {start: 0}
-        self.explored_nodes = []
+        frontier = [(0, start)]
+        came_from = maze.new_parents()
+        cost_so_far = array('d', [float('inf')]) * maze.size
+        cost_so_far[start] = 0
+        closed = maze.new_visited()
+        record = begin(self, maze).record
+        push, pop = self.probe.heap(frontier)
+        neighbors = self.probe.successors(maze.weighted_neighbors if costs is None else maze.neighbors)
+        self.probe.phase("search")
 
         while frontier:
-            frontier.sort(key=lambda x: x[0]) 
-            cost, current, parent = frontier.pop(0)
-            self.explored_nodes.append(current)
-            came_from[current] = parent
+            cost, current = pop()
+            if closed[current]:
+                continue
+            closed[current] = 1
+            record(current)
 
             if current == goal:
-                path = []
-                node = goal
-                while node is not None:
-                    path.append(node)
-                    node = came_from[node]
-                return path[::-1]
-
-            x, y = current
-            for neighbor in maze.get_neighbors(x, y):
-                new_cost = cost + 1
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                self.probe.phase("path")
+                return maze.path_from(came_from, goal)
+
+            if costs is None:
+                edges = neighbors(current)
+            else:
+                edges = [(n, costs[n]) for n in neighbors(current)]
+
+            for neighbor, step in edges:
+                if closed[neighbor]:
+                    continue
+                new_cost = cost + step
+                if new_cost < cost_so_far[neighbor]:
                     cost_so_far[neighbor] = new_cost
-                    frontier.append((new_cost, neighbor, current))
+                    came_from[neighbor] = current
+                    push((new_cost, neighbor))
 
         print("[UCS] No path found")
         return []
@@ -0,0 +1,130 @@
+import time
+from multiprocessing import Pool
+from multiprocessing import shared_memory
+
+import algorithms
+from maze import Maze
+
+
+# =========================
+# Shared Maze Buffers
+# =========================
+class SharedMaze:
+    """A maze's cells (and cost layer) copied once into shared memory
+
+    ``descriptor`` is the small picklable handle that workers use to
+    attach to the block; only that travels to the pool, never the grid.
+    """
+    def __init__(self, maze):
+        size = maze.size
+        cost_bytes = 4 * size if maze.costs is not None else 0
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size + cost_bytes, 1))
+        self.shm.buf[:size] = bytes(maze.cells)
+        if cost_bytes:
+            self.shm.buf[size:size + cost_bytes] = memoryview(maze.costs).cast('B')
+        self.descriptor = (self.shm.name, maze.width, maze.height, bool(cost_bytes), maze.neighborhood)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach(descriptor):
+    """Open a SharedMaze block and wrap it in a Maze without copying"""
+    name, width, height, has_costs, neighborhood = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    size = width * height
+    costs = shm.buf[size:size + 4 * size].cast('f') if has_costs else None
+    return shm, Maze.from_cells(width, height, shm.buf[:size], costs=costs, neighborhood=neighborhood)
+
+
+# =========================
+# Worker Side
+# =========================
+_worker_mazes = {}
+_worker_blocks = []
+
+
+def _init_worker(descriptors):
+    for key, descriptor in descriptors.items():
+        shm, maze = attach(descriptor)
+        _worker_blocks.append(shm)
+        _worker_mazes[key] = maze
+
+
+def run_solver(maze, start, goal, algorithm):
+    """Solve one start/goal query on maze with a fresh ``algorithm`` solver"""
+    maze = maze.with_endpoints(start, goal)
+    solver = algorithms.SOLVERS[algorithm]()
+    solver.explored_nodes = algorithms.Exploration("count")
+    t0 = time.perf_counter_ns()
+    try:
+        path = solver.solve(maze)
+    finally:
+        # D* Lite and HPA* listen to the maze, which outlives this solver
+        if hasattr(solver, "close"):
+            solver.close()
+    elapsed = time.perf_counter_ns() - t0
+    return {
+        "algorithm": algorithm,
+        "start": tuple(start),
+        "goal": tuple(goal),
+        "path": path,
+        "path_cost": maze.path_cost(path),
+        "explored_nodes": len(solver.explored_nodes),
+        "exec_time_ms": elapsed / 1_000_000,
+        "bound": algorithms.guaranteed_bound(solver, maze),
+    }
+
+
+def _run_job(job):
+    job_id, maze_key, start, goal, algorithm = job
+    result = run_solver(_worker_mazes[maze_key], start, goal, algorithm)
+    result["job"] = job_id
+    return result
+
+
+# =========================
+# Batch API
+# =========================
+def solve_batch(jobs, processes=None, chunksize=16):
+    """Solve many (maze, start, goal, algorithm) jobs across a process pool
+
+    ``algorithm`` is a class name from ``algorithms`` (e.g. "AStar").
+    Each distinct Maze is copied into shared memory once and attached by
+    every worker at start-up; jobs themselves are a few small tuples.
+    Result dicts are yielded as soon as they finish, so they arrive out
+    of order; ``result["job"]`` is the job's position in ``jobs``.
+    ``processes=1`` runs everything in this process.
+    """
+    jobs = list(jobs)
+    keys = {}
+    shared = []
+    tasks = []
+    try:
+        for job_id, (maze, start, goal, algorithm) in enumerate(jobs):
+            if algorithm not in algorithms.SOLVERS:
+                raise ValueError(f"unknown algorithm {algorithm!r}")
+            key = keys.get(id(maze))
+            if key is None:
+                key = keys[id(maze)] = len(keys)
+                if processes != 1:
+                    shared.append(SharedMaze(maze))
+                else:
+                    _worker_mazes[key] = maze
+            tasks.append((job_id, key, start, goal, algorithm))
+
+        if processes == 1:
+            for task in tasks:
+                yield _run_job(task)
+            return
+
+        descriptors = {key: block.descriptor for key, block in enumerate(shared)}
+        with Pool(processes, initializer=_init_worker, initargs=(descriptors,)) as pool:
+            for result in pool.imap_unordered(_run_job, tasks, chunksize):
+                yield result
+    finally:
+        if processes == 1:
+            _worker_mazes.clear()
+        for block in shared:
+            block.close()
@@ -0,0 +1,392 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import algorithms
+from maze import Maze
+
+DEFAULT_ALGORITHMS = ["BFS", "DFS", "UCS", "AStar", "JPS", "BidirectionalBFS", "BidirectionalAStar"]
+DEFAULT_FAMILIES = ["backtracker", "braid", "rooms"]
+DEFAULT_SIZES = [51, 101, 201]
+
+
+# =========================
+# Measurement
+# =========================
+def percentile(ordered, q):
+    """Linear-interpolated percentile of an already sorted list"""
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def time_solver(solver, maze, runs=10, warmup=2):
+    """Time solver.solve(maze) and measure its peak allocation
+
+    ``warmup`` untimed runs come first, then ``runs`` timed ones. Peak
+    memory comes from one extra run under tracemalloc, kept apart from the
+    timed runs because tracing slows allocation down.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            solver.solve(maze)
+
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter_ns()
+            path = solver.solve(maze)
+            samples.append((time.perf_counter_ns() - t0) / 1_000_000)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        solver.solve(maze)
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    explored = len(getattr(solver, 'explored_nodes', ()))
+    return {
+        "path": path,
+        "path_length": len(path),
+        "path_cost": maze.path_cost(path),
+        "explored_nodes": explored,
+        "runs": runs,
+        "median_ms": median,
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "mean_ms": statistics.fmean(ordered),
+        "stdev_ms": statistics.stdev(ordered) if runs > 1 else 0.0,
+        "nodes_per_sec": explored / (median / 1000) if median > 0 else 0.0,
+        "peak_kb": max(peak - base, 0) / 1024,
+    }
+
+
+def run_suite(algorithm_names=None, families=None, sizes=None, seeds=(1,), runs=10, warmup=2,
+              neighborhood=None):
+    """Benchmark every algorithm on every generated (family, size, seed)"""
+    results = []
+    for family in families or DEFAULT_FAMILIES:
+        for size in sizes or DEFAULT_SIZES:
+            for seed in seeds:
+                maze = Maze(size, size, generator=family, seed=seed, neighborhood=neighborhood)
+                for name in algorithm_names or DEFAULT_ALGORITHMS:
+                    solver = getattr(algorithms, name)()
+                    solver.explored_nodes = algorithms.Exploration("count")
+                    timing = time_solver(solver, maze, runs=runs, warmup=warmup)
+                    del timing["path"]
+                    timing.update(algorithm=name, family=family, size=size, seed=seed,
+                                  neighborhood=maze.neighborhood.name)
+                    results.append(timing)
+                    print(f"{family:<12} {size:>5} {name:<20} "
+                          f"median {timing['median_ms']:9.2f} ms | "
+                          f"p90 {timing['p90_ms']:9.2f} ms | "
+                          f"{timing['nodes_per_sec']:12.0f} nodes/s | "
+                          f"peak {timing['peak_kb']:9.1f} KB", file=sys.stderr)
+    return results
+
+
+# =========================
+# Path Quality
+# =========================
+def random_queries(maze, count, seed=0):
+    """``count`` (start, goal) pairs of free cells drawn with a fixed seed"""
+    rng = random.Random(seed)
+    free = [i for i in range(maze.size) if not maze.cells[i]]
+    return [(maze.pos(rng.choice(free)), maze.pos(rng.choice(free))) for _ in range(count)]
+
+
+def quality_report(solver, maze, queries, reference=None, runs=3):
+    """Path cost and speed of solver against an exact reference (A*)
+
+    Each (start, goal) query is timed for both solvers; queries the
+    reference cannot solve are skipped. ``cost_ratio`` is solver cost over
+    optimal cost (1.0 means optimal). Solvers with a ``prepare(maze)``
+    step (HPA*) are prepared once up front and that time is reported
+    apart as ``prepare_ms``.
+    """
+    reference = reference or algorithms.AStar()
+    prepare_ms = 0.0
+    if hasattr(solver, 'prepare'):
+        t0 = time.perf_counter_ns()
+        solver.prepare(maze)
+        prepare_ms = (time.perf_counter_ns() - t0) / 1_000_000
+
+    rows = []
+    for start, goal in queries:
+        view = maze.with_endpoints(start, goal)
+        exact = time_solver(reference, view, runs=runs, warmup=1)
+        if not exact["path"]:
+            continue
+        timing = time_solver(solver, view, runs=runs, warmup=1)
+        rows.append({
+            "start": start,
+            "goal": goal,
+            "cost_ratio": timing["path_cost"] / exact["path_cost"] if exact["path_cost"] else 1.0,
+            "speedup": exact["median_ms"] / timing["median_ms"] if timing["median_ms"] else 0.0,
+            "explored_ratio": timing["explored_nodes"] / max(exact["explored_nodes"], 1),
+            "solved": bool(timing["path"]),
+        })
+
+    ratios = [r["cost_ratio"] for r in rows if r["solved"]]
+    return {
+        "queries": len(rows),
+        "solved": len(ratios),
+        "prepare_ms": prepare_ms,
+        "mean_cost_ratio": statistics.fmean(ratios) if ratios else 0.0,
+        "max_cost_ratio": max(ratios, default=0.0),
+        "optimal_fraction": sum(r <= 1 + 1e-9 for r in ratios) / len(ratios) if ratios else 0.0,
+        "median_speedup": statistics.median(r["speedup"] for r in rows) if rows else 0.0,
+        "median_explored_ratio": statistics.median(r["explored_ratio"] for r in rows) if rows else 0.0,
+        "rows": rows,
+    }
+
+
+def landmark_report(maze, queries, count=8, active=4, runs=3):
+    """What ALT landmarks cost to build and save A* and bidirectional A*
+
+    Builds ``Landmarks(maze, count, active)`` once, then solves every
+    (start, goal) query with each solver's default heuristic and with the
+    landmarks. Per solver it reports the total cells expanded both ways,
+    ``saved`` (the fraction of expansions ALT avoided) and the median
+    speed-up. Unsolvable queries are skipped.
+    """
+    landmarks = algorithms.Landmarks(maze, count, active)
+    report = dict(landmarks.stats(), queries=0, solvers={})
+    solvers = {"AStar": algorithms.AStar, "BidirectionalAStar": algorithms.BidirectionalAStar}
+    totals = {name: [0, 0, []] for name in solvers}
+    for start, goal in queries:
+        view = maze.with_endpoints(start, goal)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not algorithms.AStar().solve(view):
+                continue
+        report["queries"] += 1
+        for name, cls in solvers.items():
+            total = totals[name]
+            total[0] += algorithms.capture(cls(), view, profile=False, memory=False)["stats"].expanded
+            total[1] += algorithms.capture(cls(landmarks), view, profile=False, memory=False)["stats"].expanded
+            base = time_solver(cls(), view, runs=runs, warmup=1)["median_ms"]
+            alt = time_solver(cls(landmarks), view, runs=runs, warmup=1)["median_ms"]
+            total[2].append(base / alt if alt else 0.0)
+
+    for name, (base, alt, speedups) in totals.items():
+        report["solvers"][name] = {
+            "expanded": base,
+            "expanded_alt": alt,
+            "saved": 1 - alt / base if base else 0.0,
+            "median_speedup": statistics.median(speedups) if speedups else 0.0,
+        }
+    return report
+
+
+def compression_report(maze, queries, algorithm_names=None, runs=3):
+    """Node expansions and time with and without a CorridorGraph
+
+    The graph is built once for the maze (``build_ms``). Each solvable
+    (start, goal) query is then solved by every algorithm on the maze and
+    through ``compress.CompressedSolver`` on that graph, so the compressed
+    timing covers attaching the endpoints and the search. ``reduction``
+    is free cells per graph node, ``expansion_ratio`` plain expansions
+    over compressed ones and ``break_even`` the queries it takes for the
+    saved time to pay for the build (None when nothing is saved).
+    """
+    from compress import CompressedSolver, CorridorGraph
+
+    names = algorithm_names or ["BFS", "UCS", "AStar", "BidirectionalAStar"]
+    graph = CorridorGraph(maze)
+    totals = {name: [0, 0, [], 0.0] for name in names}
+    solved = 0
+    for start, goal in queries:
+        view = maze.with_endpoints(start, goal)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not algorithms.AStar().solve(view):
+                continue
+        solved += 1
+        for name in names:
+            cls = getattr(algorithms, name)
+            total = totals[name]
+            total[0] += algorithms.capture(cls(), view, profile=False, memory=False)["stats"].expanded
+            wrapped = CompressedSolver(cls(), graph)
+            total[1] += algorithms.capture(wrapped, view, profile=False, memory=False)["stats"].expanded
+            base = time_solver(cls(), view, runs=runs, warmup=1)["median_ms"]
+            # A fresh wrapper per run, so every run attaches its endpoints
+            samples = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(runs):
+                    wrapped = CompressedSolver(cls(), graph)
+                    t0 = time.perf_counter_ns()
+                    wrapped.solve(view)
+                    samples.append((time.perf_counter_ns() - t0) / 1_000_000)
+            compressed = statistics.median(samples)
+            total[2].append(base / compressed if compressed else 0.0)
+            total[3] += base - compressed
+
+    def break_even(saved_ms):
+        return graph.build_ms / (saved_ms / solved) if solved and saved_ms > 0 else None
+
+    return {
+        "queries": solved,
+        "build_ms": graph.build_ms,
+        "reduction": graph.stats()["reduction"],
+        "solvers": {
+            name: {
+                "expanded": base,
+                "expanded_compressed": compressed,
+                "expansion_ratio": base / compressed if compressed else 0.0,
+                "median_speedup": statistics.median(speedups) if speedups else 0.0,
+                "break_even": break_even(saved),
+            }
+            for name, (base, compressed, speedups, saved) in totals.items()
+        },
+    }
+
+
+# =========================
+# Results And Baselines
+# =========================
+def save_results(results, path):
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=0.10):
+    """Regressions of results against baseline, as readable strings
+
+    A case regresses when its median time or peak memory grows by more
+    than ``threshold`` (a fraction), or when it explores more nodes.
+    """
+    def key(r):
+        # Results saved before neighbourhoods existed were 4-connected
+        return (r["algorithm"], r["family"], r["size"], r["seed"], r.get("neighborhood", "4-connected"))
+
+    previous = {key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get(key(r))
+        if old is None:
+            continue
+        label = "{} {} {}x{} seed {}".format(r["algorithm"], r["family"], r["size"], r["size"], r["seed"])
+        for field, unit in (("median_ms", "ms"), ("peak_kb", "KB")):
+            if old[field] > 0 and r[field] > old[field] * (1 + threshold):
+                regressions.append(f"{label}: {field} {old[field]:.2f} -> {r[field]:.2f} {unit}")
+        if r["explored_nodes"] > old["explored_nodes"]:
+            regressions.append(f"{label}: explored {old['explored_nodes']} -> {r['explored_nodes']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers on generated mazes")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS)
+    parser.add_argument("--families", nargs="+", default=DEFAULT_FAMILIES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative slowdown before flagging (default 0.10)")
+    parser.add_argument("--quality", metavar="ALGORITHM",
+                        help="instead of timing the suite, compare ALGORITHM's path cost and speed with A*")
+    parser.add_argument("--queries", type=int, default=20,
+                        help="random start/goal pairs per maze for --quality (default 20)")
+    parser.add_argument("--neighborhood", choices=["4", "8"], default="4",
+                        help="moves allowed per cell: 4 or 8 (no corner cutting) (default 4)")
+    parser.add_argument("--alt", type=int, metavar="COUNT",
+                        help="instead of timing the suite, report what COUNT ALT landmarks cost and save")
+    parser.add_argument("--active", type=int, default=4,
+                        help="landmarks consulted per query for --alt (default 4)")
+    parser.add_argument("--compress", action="store_true",
+                        help="instead of timing the suite, compare the solvers with and without corridor contraction")
+    args = parser.parse_args(argv)
+
+    if args.compress:
+        for family in args.families:
+            for size in args.sizes:
+                for seed in args.seeds:
+                    maze = Maze(size, size, generator=family, seed=seed, neighborhood=args.neighborhood)
+                    report = compression_report(maze, random_queries(maze, args.queries, seed),
+                                                args.algorithms, runs=args.runs)
+                    print(f"{family:<12} {size:>5} graph x{report['reduction']:.1f} smaller, "
+                          f"build {report['build_ms']:7.1f} ms | " + " | ".join(
+                              f"{name} expanded x{r['expansion_ratio']:.1f} fewer, "
+                              f"speed-up x{r['median_speedup']:.2f}, "
+                              + ("never pays off" if r["break_even"] is None
+                                 else f"pays off after {r['break_even']:.0f} queries")
+                              for name, r in report["solvers"].items()))
+        return 0
+
+    if args.alt:
+        for family in args.families:
+            for size in args.sizes:
+                for seed in args.seeds:
+                    maze = Maze(size, size, generator=family, seed=seed, neighborhood=args.neighborhood)
+                    report = landmark_report(maze, random_queries(maze, args.queries, seed),
+                                             args.alt, args.active, runs=args.runs)
+                    savings = " | ".join(
+                        f"{name} expanded {r['expanded']} -> {r['expanded_alt']} "
+                        f"({-r['saved']:+.0%}, speed-up x{r['median_speedup']:.2f})"
+                        for name, r in report["solvers"].items())
+                    print(f"{family:<12} {size:>5} ALT x{report['landmarks']}: "
+                          f"build {report['build_ms']:8.1f} ms, {report['kb']:8.1f} KB | {savings}")
+        return 0
+
+    if args.quality:
+        for family in args.families:
+            for size in args.sizes:
+                for seed in args.seeds:
+                    maze = Maze(size, size, generator=family, seed=seed, neighborhood=args.neighborhood)
+                    report = quality_report(getattr(algorithms, args.quality)(), maze,
+                                            random_queries(maze, args.queries, seed), runs=args.runs)
+                    print(f"{family:<12} {size:>5} {args.quality}: "
+                          f"prepare {report['prepare_ms']:9.1f} ms | "
+                          f"cost x{report['mean_cost_ratio']:.3f} (max x{report['max_cost_ratio']:.3f}, "
+                          f"{report['optimal_fraction']:.0%} optimal) | "
+                          f"speed-up x{report['median_speedup']:.2f} | "
+                          f"explored x{report['median_explored_ratio']:.3f} "
+                          f"| {report['solved']}/{report['queries']} solved")
+        return 0
+
+    results = run_suite(args.algorithms, args.families, args.sizes, args.seeds, args.runs, args.warmup,
+                        args.neighborhood)
+    if args.out:
+        save_results(results, args.out)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
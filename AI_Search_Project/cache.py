@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+
+# =========================
+# Path Cache
+# =========================
+class PathCache:
+    """Bounded LRU cache of solved paths for one Maze
+
+    Entries are keyed by (algorithm, start, goal) and belong to the maze
+    version they were solved on. The cache listens to the maze's edits:
+    a cell turning into a wall only drops the cached paths through that
+    cell (and, when diagonal moves cannot cut its corners, through the
+    cells around it), while a wall being removed (which can open shorter routes) or a
+    new cost layer drops everything. If the maze version moves without a
+    notification (e.g. ``cells`` written directly), the next lookup
+    clears the cache.
+    """
+    def __init__(self, maze, maxsize=1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maze = maze
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.by_cell = {}
+        self.version = maze.version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        maze.add_listener(self._on_edit)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, algorithm, start, goal):
+        """Cached path (a fresh list) or None on a miss"""
+        if self.version != self.maze.version:
+            self.clear()
+        key = (algorithm, tuple(start), tuple(goal))
+        path = self.entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, algorithm, start, goal, path):
+        key = (algorithm, tuple(start), tuple(goal))
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = list(path)
+        index = self.maze.index
+        for pos in path:
+            self.by_cell.setdefault(index(pos), set()).add(key)
+        while len(self.entries) > self.maxsize:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.by_cell.clear()
+        self.version = self.maze.version
+
+    def close(self):
+        """Stop listening to the maze"""
+        self.maze.remove_listener(self._on_edit)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key):
+        path = self.entries.pop(key)
+        index = self.maze.index
+        for pos in path:
+            keys = self.by_cell.get(index(pos))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_cell[index(pos)]
+
+    def _on_edit(self, maze, edits):
+        if edits is None or any(not new for _, _, new in edits):
+            self.clear()
+            return
+        nb = maze.neighborhood
+        corners = any(nb.corner_sides(dx, dy) for dx, dy in nb.moves)
+        for i, _, _ in edits:
+            # Under a corner rule the new wall also blocks diagonal steps
+            # past it, which belong to paths through the cells around it
+            for j in [i] + maze.adjacent(i) if corners else [i]:
+                for key in list(self.by_cell.get(j, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+        self.version = self.maze.version
+
+
+class CachedSolver:
+    """Wraps any solver from algorithms/ behind a PathCache
+
+    Same ``solve(maze)`` / ``explored_nodes`` interface as the wrapped
+    solver. On a hit nothing is searched and ``explored_nodes`` is empty.
+    ``name`` tells apart differently configured solvers of one class.
+    """
+    def __init__(self, solver, cache, name=None):
+        self.solver = solver
+        self.cache = cache
+        self.name = name or type(solver).__name__
+        self.explored_nodes = []
+
+    def solve(self, maze):
+        if maze.cells is not self.cache.maze.cells:
+            path = self.solver.solve(maze)
+            self.explored_nodes = self.solver.explored_nodes
+            return path
+        path = self.cache.get(self.name, maze.start, maze.goal)
+        if path is not None:
+            self.explored_nodes = []
+            return path
+        path = self.solver.solve(maze)
+        self.explored_nodes = self.solver.explored_nodes
+        self.cache.put(self.name, maze.start, maze.goal, path)
+        return path
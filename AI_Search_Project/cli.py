@@ -0,0 +1,253 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+
+import algorithms
+from generators import GENERATORS
+from maze import Maze
+
+SOLVERS = ["BFS", "DFS", "IDS", "IDAStar", "UCS", "AStar", "JPS", "BidirectionalBFS", "BidirectionalAStar", "ARAStar"]
+ALL_SOLVERS = list(algorithms.SOLVERS)
+
+
+# =========================
+# Maze Input
+# =========================
+def _point(text):
+    try:
+        x, y = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected X,Y, got {text!r}") from None
+    return x, y
+
+
+def add_maze_options(parser):
+    group = parser.add_argument_group("maze")
+    group.add_argument("--maze", metavar="FILE",
+                       help="load a maze file: .map (MovingAI), .txt (ASCII) or the binary format of Maze.save")
+    group.add_argument("--generator", choices=["static"] + sorted(GENERATORS),
+                       help="generate a maze (default: the static maze at 20x12, backtracker otherwise)")
+    group.add_argument("--size", nargs=2, type=int, default=[20, 12], metavar=("WIDTH", "HEIGHT"))
+    group.add_argument("--seed", type=int, help="generator seed")
+    group.add_argument("--neighborhood", choices=["4", "8"],
+                       help="moves allowed per cell: 4 or 8 (no corner cutting) (default 4, or the type of a .map file)")
+    group.add_argument("--start", type=_point, metavar="X,Y")
+    group.add_argument("--goal", type=_point, metavar="X,Y")
+
+
+def load_maze(args):
+    """Build the maze the maze options describe"""
+    if args.maze:
+        import mazeio
+        ext = os.path.splitext(args.maze)[1].lower()
+        if ext == ".map":
+            maze = mazeio.load_movingai(args.maze)
+        elif ext == ".txt":
+            maze = mazeio.load_ascii(args.maze)
+        else:
+            maze = Maze.load(args.maze)
+        if args.neighborhood is not None:
+            maze.set_neighborhood(args.neighborhood)
+    else:
+        width, height = args.size
+        maze = Maze(width, height, generator=args.generator, seed=args.seed, neighborhood=args.neighborhood)
+    if args.start:
+        maze.start = args.start
+    if args.goal:
+        maze.goal = args.goal
+    return maze
+
+
+def describe(maze, args):
+    return {
+        "maze": args.maze,
+        "generator": None if args.maze else args.generator,
+        "seed": None if args.maze else args.seed,
+        "width": maze.width,
+        "height": maze.height,
+        "neighborhood": maze.neighborhood.name,
+        "start": list(maze.start),
+        "goal": list(maze.goal),
+    }
+
+
+# =========================
+# Output
+# =========================
+def emit(rows, fmt, meta=None, out=None):
+    """Write result rows to out (stdout) as one JSON document or as CSV"""
+    out = out or sys.stdout
+    if fmt == "csv":
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                             for key, value in row.items()})
+    else:
+        json.dump({"meta": meta or {}, "results": rows}, out, indent=2)
+        out.write("\n")
+
+
+# =========================
+# Subcommands
+# =========================
+def cmd_solve(args):
+    maze = load_maze(args)
+    meta = describe(maze, args)
+    graph = None
+    if args.compress:
+        from compress import CompressedSolver, CorridorGraph
+        graph = CorridorGraph(maze)
+        meta["graph"] = graph.stats()
+    rows = []
+    for name in args.algorithms:
+        if name == "ARAStar":
+            solver = algorithms.ARAStar(args.weight, time_ms=args.time_ms, max_expansions=args.max_expansions)
+        else:
+            solver = getattr(algorithms, name)()
+        if graph is not None:
+            solver = CompressedSolver(solver, graph)
+        solver.explored_nodes = algorithms.Exploration("count")
+        # Solvers report failures with print; keep stdout for the results
+        with contextlib.redirect_stdout(sys.stderr):
+            samples = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter_ns()
+                path = solver.solve(maze)
+                samples.append((time.perf_counter_ns() - t0) / 1_000_000)
+            row = {
+                "algorithm": name,
+                "found": bool(path),
+                "path_length": len(path),
+                "path_cost": maze.path_cost(path) if path else None,
+                "explored_nodes": len(solver.explored_nodes),
+                "time_ms": sorted(samples)[len(samples) // 2],
+                "bound": algorithms.guaranteed_bound(solver, maze),
+            }
+            if args.stats:
+                stats = algorithms.capture(solver, maze, profile=False, memory=False)["stats"]
+                row.update({field: getattr(stats, field) for field in stats.FIELDS})
+                row["phases_ms"] = stats.phases_ms
+        if args.path:
+            row["path"] = [list(p) for p in path]
+        rows.append(row)
+    emit(rows, args.format, meta)
+    return 0 if all(row["found"] for row in rows) else 1
+
+
+def cmd_benchmark(args):
+    import benchmark
+    results = benchmark.run_suite(args.algorithms, args.families, args.sizes, args.seeds, args.runs,
+                                  args.warmup, args.neighborhood)
+    emit(results, args.format, {"runs": args.runs, "warmup": args.warmup})
+    if args.baseline:
+        regressions = benchmark.compare(results, benchmark.load_results(args.baseline), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+def cmd_render(args):
+    maze = load_maze(args)
+    solver = getattr(algorithms, args.algorithm)()
+    if args.out is None:
+        from visualizer import MazeVisualizer
+        visualizer = MazeVisualizer(maze, fast=args.fast)
+        if args.search:
+            visualizer.animate_search(solver, args.algorithm, per_frame=args.per_frame or 1)
+        else:
+            with contextlib.redirect_stdout(sys.stderr):
+                path = solver.solve(maze)
+            visualizer.animate(path, args.algorithm)
+        return 0
+
+    from render import FastRenderer
+    renderer = FastRenderer(maze, headless=True, dpi=args.dpi)
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.search:
+            frames = renderer.search_frames(solver, args.algorithm, per_frame=args.per_frame or max(1, maze.size // 300))
+        else:
+            path = solver.solve(maze)
+            frames = renderer.path_frames(path, args.algorithm, per_frame=args.per_frame or max(1, len(path) // 300))
+        stats = renderer.export(frames, args.out, fps=args.fps, every=args.every)
+    emit([dict(stats.summary(), out=args.out)], args.format, describe(maze, args))
+    return 0
+
+
+def cmd_menu(args):
+    import main
+    main.menu(load_maze(args))
+    return 0
+
+
+# =========================
+# Entry Point
+# =========================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Solve, benchmark and render mazes. Results go to stdout as JSON or CSV; "
+                    "matplotlib is only imported by render and menu.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="run solvers on one maze")
+    add_maze_options(solve)
+    solve.add_argument("--algorithms", nargs="+", default=SOLVERS, choices=ALL_SOLVERS, metavar="NAME")
+    solve.add_argument("--runs", type=int, default=1, help="timed runs per solver; the median is reported")
+    solve.add_argument("--stats", action="store_true",
+                       help="add search counters from one extra instrumented run")
+    solve.add_argument("--path", action="store_true", help="include each path's cells")
+    solve.add_argument("--weight", type=float, default=3.0, help="first heuristic weight of ARAStar (default 3)")
+    solve.add_argument("--time-ms", type=float, help="wall-time budget of ARAStar per solve")
+    solve.add_argument("--max-expansions", type=int, help="expansion budget of ARAStar per solve")
+    solve.add_argument("--compress", action="store_true",
+                       help="search a graph with dead ends pruned and corridors contracted")
+    solve.add_argument("--format", choices=["json", "csv"], default="json")
+    solve.set_defaults(run=cmd_solve)
+
+    bench = commands.add_parser("benchmark", help="time solvers on generated mazes")
+    bench.add_argument("--algorithms", nargs="+", default=None, choices=ALL_SOLVERS, metavar="NAME")
+    bench.add_argument("--families", nargs="+", default=None, choices=sorted(GENERATORS))
+    bench.add_argument("--sizes", nargs="+", type=int, default=None)
+    bench.add_argument("--seeds", nargs="+", type=int, default=[1])
+    bench.add_argument("--runs", type=int, default=10)
+    bench.add_argument("--warmup", type=int, default=2)
+    bench.add_argument("--neighborhood", choices=["4", "8"], default="4")
+    bench.add_argument("--baseline", help="JSON results (benchmark.py --out) to compare against")
+    bench.add_argument("--threshold", type=float, default=0.10)
+    bench.add_argument("--format", choices=["json", "csv"], default="json")
+    bench.set_defaults(run=cmd_benchmark)
+
+    render = commands.add_parser("render", help="animate a solver, on screen or into a file")
+    add_maze_options(render)
+    render.add_argument("--algorithm", default="AStar", choices=ALL_SOLVERS, metavar="NAME")
+    render.add_argument("--search", action="store_true", help="show the explored cells, then the path")
+    render.add_argument("--out", help="export to .mp4, .gif or a PNG frame directory instead of a window")
+    render.add_argument("--fps", type=int, default=30)
+    render.add_argument("--every", type=int, default=1, help="write every n-th frame only")
+    render.add_argument("--per-frame", type=int, help="cells added per frame")
+    render.add_argument("--dpi", type=int, default=100)
+    render.add_argument("--fast", action="store_true", default=None,
+                        help="on screen, use the fast renderer even for small mazes")
+    render.add_argument("--format", choices=["json", "csv"], default="json")
+    render.set_defaults(run=cmd_render)
+
+    menu = commands.add_parser("menu", help="the interactive menu of main.py")
+    add_maze_options(menu)
+    menu.set_defaults(run=cmd_menu)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+import copy
+import time
+from array import array
+
+
+# =========================
+# Dead-End Pruning
+# =========================
+def prune_dead_ends(maze):
+    """Free cells that lie on no cycle, with the branch each hangs from
+
+    Repeatedly strips free cells with at most one free neighbour. What is
+    left (the 2-core) holds every route whose ends are not in a dead end;
+    nothing is left of a perfect maze. Returns (pruned, degree, toward):
+    ``pruned`` is one byte per cell, ``degree`` the free neighbours each
+    cell keeps and ``toward`` the neighbour a pruned cell still had when
+    it went (-1 for the last cell of a component without cycles), so
+    following it leads back to the 2-core. The maze itself is not edited,
+    because with a corner rule turning a cell into a wall could block
+    diagonal moves past it.
+    """
+    cells = maze.cells
+    neighbors = maze.neighbors
+    degree = array('i', [0]) * maze.size
+    toward = array('i', [-1]) * maze.size
+    pruned = bytearray(maze.size)
+    leaves = []
+    for i in range(maze.size):
+        if cells[i]:
+            continue
+        d = degree[i] = len(neighbors(i))
+        if d <= 1:
+            leaves.append(i)
+
+    while leaves:
+        i = leaves.pop()
+        if pruned[i]:
+            continue
+        pruned[i] = 1
+        for j in neighbors(i):
+            if not pruned[j]:
+                toward[i] = j
+                degree[j] -= 1
+                if degree[j] <= 1:
+                    leaves.append(j)
+    return pruned, degree, toward
+
+
+# =========================
+# Corridor Graph
+# =========================
+class CorridorGraph:
+    """A maze reduced to junctions joined by weighted corridor edges
+
+    Built once per maze version, for any endpoints: dead ends are pruned
+    (``prune_dead_ends``), then every run of cells with exactly two
+    neighbours in what is left becomes one corridor between the junctions
+    at its ends, with the run's cost in each direction. A loop without
+    junctions gets one of its cells as a node.
+
+    ``attach`` puts a query's endpoints back. An endpoint in a dead end
+    brings back only the branch from it to the 2-core, and the corridor
+    that branch (or the endpoint) meets is split there. No other dead end
+    can lie on a route between the two, so a query costs the length of
+    its branches and corridors, not a pass over the maze.
+    """
+    def __init__(self, maze):
+        t0 = time.perf_counter_ns()
+        self.maze = maze
+        self.version = maze.version
+        self.pruned, self.degree, self.toward = prune_dead_ends(maze)
+        self.corridor_of = array('i', [-1]) * maze.size
+        self.offset = array('i', [0]) * maze.size
+        self.loop_nodes = set()
+        # corridors[c] = (cells from one node to the other, cost from the
+        # first cell to each cell, cost from each cell back to the first)
+        self.corridors = []
+        # edges[u][w] = (cost, corridor, forward) of the cheapest u -> w;
+        # corridor -1 when u and w are neighbours
+        self.edges = {}
+        self._build()
+
+        self.adjacency = {u: list(out) for u, out in self.edges.items()}
+        self.weighted = {u: [(w, e[0]) for w, e in out.items()] for u, out in self.edges.items()}
+        self.incoming = {u: [] for u in self.edges}
+        for u, out in self.edges.items():
+            for w, e in out.items():
+                self.incoming[w].append((u, e[0]))
+        self.build_ms = (time.perf_counter_ns() - t0) / 1_000_000
+
+    def is_node(self, i):
+        return self.degree[i] != 2 or i in self.loop_nodes
+
+    def step_cost(self, a, b):
+        """Cost of the move from cell a to its neighbour b"""
+        maze = self.maze
+        width = maze.width
+        return maze.neighborhood.length(b % width - a % width, b // width - a // width) * maze.cost(b)
+
+    def _build(self):
+        maze = self.maze
+        core = [i for i in range(maze.size) if not maze.cells[i] and not self.pruned[i]]
+        for u in core:
+            if self.is_node(u):
+                self.edges.setdefault(u, {})
+                self._walk_from(u)
+        # Loops without a junction: any cell of one will do as its node
+        for i in core:
+            if not self.is_node(i) and self.corridor_of[i] == -1:
+                self.loop_nodes.add(i)
+                self.edges.setdefault(i, {})
+                self._walk_from(i)
+
+    def _walk_from(self, u):
+        maze = self.maze
+        pruned, corridor_of, offset = self.pruned, self.corridor_of, self.offset
+        for first in maze.neighbors(u):
+            if pruned[first]:
+                continue
+            if self.is_node(first):
+                # Neighbouring nodes: each adds its own direction
+                self._add_edge(u, first, self.step_cost(u, first), -1, True)
+                continue
+            if corridor_of[first] != -1:
+                # Already walked from its other end
+                continue
+            index = len(self.corridors)
+            cells = array('i', [u])
+            forward = array('d', [0.0])
+            backward = array('d', [0.0])
+            prev, current = u, first
+            while True:
+                forward.append(forward[-1] + self.step_cost(prev, current))
+                backward.append(backward[-1] + self.step_cost(current, prev))
+                cells.append(current)
+                if self.is_node(current):
+                    break
+                corridor_of[current] = index
+                offset[current] = len(cells) - 1
+                for nxt in maze.neighbors(current):
+                    if nxt != prev and not pruned[nxt]:
+                        break
+                prev, current = current, nxt
+            self.corridors.append((cells, forward, backward))
+            if current != u:
+                self._add_edge(u, current, forward[-1], index, True)
+                self._add_edge(current, u, backward[-1], index, False)
+
+    def _add_edge(self, u, w, cost, corridor, forward):
+        out = self.edges.setdefault(u, {})
+        if w not in out or cost < out[w][0]:
+            out[w] = (cost, corridor, forward)
+
+    @property
+    def nodes(self):
+        return len(self.edges)
+
+    def stats(self):
+        maze = self.maze
+        free = maze.size - sum(1 for c in maze.cells if c)
+        return {
+            "free_cells": free,
+            "pruned": sum(self.pruned),
+            "nodes": self.nodes,
+            "edges": sum(len(out) for out in self.edges.values()),
+            "reduction": free / max(self.nodes, 1),
+            "build_ms": self.build_ms,
+        }
+
+    def matches(self, maze):
+        """True while this graph still describes maze's cells"""
+        return maze.cells is self.maze.cells and maze.version == self.version
+
+    def interior(self, u, w):
+        """Cells strictly between nodes u and w along their cheapest corridor"""
+        _, corridor, forward = self.edges[u][w]
+        if corridor == -1:
+            return ()
+        cells = self.corridors[corridor][0]
+        return cells[1:-1] if forward else cells[-2:0:-1]
+
+    def attach(self, start, goal):
+        """CorridorQuery for one (x, y) start and goal"""
+        return CorridorQuery(self, self.maze.with_endpoints(start, goal))
+
+
+class CorridorQuery:
+    """A CorridorGraph with one start and goal attached
+
+    ``view`` is a shallow copy of the maze whose ``neighbors``,
+    ``weighted_neighbors``, ``predecessors`` and ``path_cost`` use the
+    graph plus this query's edges. Nodes keep their cell indices, so any
+    solver from ``algorithms`` that only uses those methods (and the grid
+    heuristics) searches it unchanged. ``expand`` turns the node path it
+    returns back into every cell.
+    """
+    def __init__(self, graph, maze):
+        self.graph = graph
+        self.maze = maze
+        # extra[a][b] = (cost, cells strictly between a and b)
+        self.extra = {}
+        start = maze.index(maze.start)
+        goal = maze.index(maze.goal)
+        if not maze.cells[start] and not maze.cells[goal]:
+            self._attach(start, goal)
+
+        adjacency, weighted, incoming = graph.adjacency, graph.weighted, graph.incoming
+        out_n, out_w, into = {}, {}, {}
+        for a, out in self.extra.items():
+            out_n[a] = list(adjacency.get(a, ()))
+            out_w[a] = list(weighted.get(a, ()))
+            for b, (cost, _) in out.items():
+                if b not in into:
+                    into[b] = list(incoming.get(b, ()))
+                out_n[a].append(b)
+                out_w[a].append((b, cost))
+                into[b].append((a, cost))
+
+        view = copy.copy(maze)
+        view.neighbors = lambda i: out_n[i] if i in out_n else adjacency.get(i, [])
+        view.weighted_neighbors = lambda i: out_w[i] if i in out_w else weighted.get(i, [])
+        view.predecessors = lambda i: into[i] if i in into else incoming.get(i, [])
+        view.path_cost = self.path_cost
+        self.view = view
+
+    def _link(self, a, b, cost, cells):
+        out = self.extra.setdefault(a, {})
+        if b not in out or cost < out[b][0]:
+            out[b] = (cost, cells)
+
+    def _branch(self, e):
+        """Cells from e back to the 2-core, with the cost up to each and back"""
+        graph = self.graph
+        cells, up, down = [e], [0.0], [0.0]
+        current = e
+        while graph.pruned[current] and graph.toward[current] != -1:
+            parent = graph.toward[current]
+            up.append(up[-1] + graph.step_cost(current, parent))
+            down.append(down[-1] + graph.step_cost(parent, current))
+            cells.append(parent)
+            current = parent
+        return cells, up, down
+
+    def _attach(self, start, goal):
+        graph = self.graph
+        branches = [self._branch(start), self._branch(goal)]
+
+        # Branches that meet: the way through the dead end is the only simple route
+        (s_cells, s_up, s_down), (g_cells, g_up, g_down) = branches
+        on_goal_branch = {c: k for k, c in enumerate(g_cells)}
+        for k_s, c in enumerate(s_cells):
+            if c in on_goal_branch:
+                k_g = on_goal_branch[c]
+                route = s_cells[:k_s + 1] + g_cells[:k_g][::-1]
+                self._link(start, goal, s_up[k_s] + g_down[k_g], route[1:-1])
+                self._link(goal, start, g_up[k_g] + s_down[k_s], route[-2:0:-1])
+                break
+
+        split = []
+        for e, (cells, up, down) in zip((start, goal), branches):
+            anchor = cells[-1]
+            if graph.pruned[anchor]:
+                continue
+            if anchor != e:
+                self._link(e, anchor, up[-1], cells[1:-1])
+                self._link(anchor, e, down[-1], cells[-2:0:-1])
+            if graph.is_node(anchor) or anchor in split:
+                continue
+            # The anchor sits inside a corridor: link it to both ends
+            corridor, j = graph.corridor_of[anchor], graph.offset[anchor]
+            seq, forward, backward = graph.corridors[corridor]
+            u, w = seq[0], seq[-1]
+            self._link(anchor, u, backward[j], seq[j - 1:0:-1])
+            self._link(u, anchor, forward[j], seq[1:j])
+            self._link(anchor, w, forward[-1] - forward[j], seq[j + 1:-1])
+            self._link(w, anchor, backward[-1] - backward[j], seq[-2:j:-1])
+            for other in split:
+                k = graph.offset[other]
+                if graph.corridor_of[other] == corridor:
+                    a, b, ja, jb = (other, anchor, k, j) if k < j else (anchor, other, j, k)
+                    self._link(a, b, forward[jb] - forward[ja], seq[ja + 1:jb])
+                    self._link(b, a, backward[jb] - backward[ja], seq[jb - 1:ja:-1])
+            split.append(anchor)
+
+    def _edge(self, a, b):
+        """(cost, cells strictly between) of the step a -> b in ``view``"""
+        out = self.extra.get(a)
+        if out is not None and b in out:
+            return out[b]
+        return self.graph.edges[a][b][0], self.graph.interior(a, b)
+
+    def path_cost(self, path):
+        """Total cost of a node path found on ``view``"""
+        index = self.maze.index
+        return sum(self._edge(index(a), index(b))[0] for a, b in zip(path, path[1:]))
+
+    def expand(self, path):
+        """Cell path for a node path found on ``view``"""
+        if len(path) < 2:
+            return list(path)
+        index, pos = self.maze.index, self.maze.pos
+        cells = [path[0]]
+        for a, b in zip(path, path[1:]):
+            cells.extend(pos(i) for i in self._edge(index(a), index(b))[1])
+            cells.append(b)
+        return cells
+
+
+class CompressedSolver:
+    """Wraps any solver from algorithms/ to search a CorridorGraph
+
+    Same ``solve(maze)`` / ``explored_nodes`` / ``probe`` interface as the
+    wrapped solver, and the path it returns is a full cell path. The graph
+    is built on the first solve and again after the maze is edited; each
+    solve only attaches its endpoints. Pass ``graph`` to share one between
+    solvers. Solvers that read the grid itself (``needs_grid``: JPS, HPA*)
+    run on the maze as it is. Move-counting solvers (BFS, IDS, BiBFS)
+    count edges on the graph, so their paths lose the shortest guarantee.
+    """
+    def __init__(self, solver, graph=None):
+        self.solver = solver
+        self.graph = graph
+        self.query = None
+
+    @property
+    def explored_nodes(self):
+        return self.solver.explored_nodes
+
+    @explored_nodes.setter
+    def explored_nodes(self, explored):
+        self.solver.explored_nodes = explored
+
+    @property
+    def probe(self):
+        return self.solver.probe
+
+    @probe.setter
+    def probe(self, probe):
+        self.solver.probe = probe
+
+    @property
+    def bound(self):
+        if getattr(self.solver, "unit_steps", False) and not getattr(self.solver, "needs_grid", False):
+            return None
+        return getattr(self.solver, "bound", None)
+
+    def solve(self, maze):
+        if getattr(self.solver, "needs_grid", False):
+            return self.solver.solve(maze)
+        if self.graph is None or not self.graph.matches(maze):
+            self.graph = CorridorGraph(maze)
+        query = self.query
+        if (query is None or query.graph is not self.graph
+                or query.maze.start != tuple(maze.start) or query.maze.goal != tuple(maze.goal)):
+            query = self.query = self.graph.attach(maze.start, maze.goal)
+            if hasattr(self.solver, "close"):
+                # D* Lite keeps its search between solves, but this is another graph
+                self.solver.close()
+        return query.expand(self.solver.solve(query.view))
@@ -0,0 +1,239 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Frontiers narrower than this are expanded with a plain loop: below it
+# the fixed cost of each NumPy call outweighs the per-cell work it saves.
+SMALL_FRONTIER = 64
+
+_FREE_MASK = bytes([1] + [0] * 255)
+
+
+# =========================
+# Wavefront Engine
+# =========================
+class _PaddedGrid:
+    """The maze's free cells in a grid with a wall border
+
+    The border is as wide as the neighbourhood's longest move, so the
+    wavefront steps by flat offsets (-1, +1, -W, +W with 4-connectivity)
+    without bounds checks. ``open`` is 1 for free cells not reached yet
+    and is used up as floods pass; ``out`` holds what each flood writes.
+    Diagonal moves under a corner rule also look at ``free``, a copy of
+    the untouched ``open``. With NumPy the buffers are also viewed as
+    arrays. The array views share the buffers with the plain loop, so
+    the two can take turns.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        nb = maze.neighborhood
+        r = self.border = nb.radius
+        self.width = maze.width + 2 * r
+        padded = self.width * (maze.height + 2 * r)
+        self.open = bytearray(padded)
+        self.out = array('i', [-1]) * padded
+        W = self.width
+        self.four = nb.kind == "4"
+        self.no_cut = nb.corners == "no_cut"
+        # (offset, side offset, side offset); the sides are None when the
+        # corner rule does not apply to the move
+        self.moves = []
+        for dx, dy in nb.moves:
+            sides = nb.corner_sides(dx, dy)
+            a, b = ((sx + sy * W) for sx, sy in sides) if sides else (None, None)
+            self.moves.append((dx + dy * W, a, b))
+        self.cornered = any(a is not None for _, a, _ in self.moves)
+        if np is not None:
+            self.open_np = np.frombuffer(self.open, dtype=np.uint8)
+            self.out_np = np.frombuffer(self.out, dtype=np.int32)
+            cells = np.frombuffer(maze.cells, dtype=np.uint8).reshape(maze.height, maze.width)
+            self.open_np.reshape(-1, W)[r:r + maze.height, r:r + maze.width] = cells == 0
+            self.offsets = np.array([m[0] for m in self.moves], dtype=np.intp)
+        else:
+            w = maze.width
+            cells = bytes(maze.cells)
+            for y in range(maze.height):
+                row = (y + r) * W + r
+                self.open[row:row + w] = cells[y * w:(y + 1) * w].translate(_FREE_MASK)
+        if self.cornered:
+            self.free = bytes(self.open)
+            if np is not None:
+                self.free_np = np.frombuffer(self.free, dtype=np.uint8)
+
+    def padded_index(self, pos):
+        x, y = pos
+        return (y + self.border) * self.width + x + self.border
+
+    def spread(self, sources, label=None, small_frontier=SMALL_FRONTIER):
+        """Flood from sources through open cells, one BFS layer per step
+
+        Each reached cell gets its layer number in ``out``, or ``label``
+        when one is given. Returns the number of cells reached.
+        """
+        open_, out = self.open, self.out
+        W = self.width
+        frontier = []
+        for p in sources:
+            if open_[p]:
+                open_[p] = 0
+                out[p] = 0 if label is None else label
+                frontier.append(p)
+        reached = len(frontier)
+        d = 0
+        while len(frontier):
+            d += 1
+            value = d if label is None else label
+            if np is None or len(frontier) < small_frontier:
+                if not isinstance(frontier, list):
+                    frontier = frontier.tolist()
+                nxt = []
+                if self.four:
+                    for c in frontier:
+                        n = c - W
+                        if open_[n]:
+                            open_[n] = 0
+                            out[n] = value
+                            nxt.append(n)
+                        n = c + W
+                        if open_[n]:
+                            open_[n] = 0
+                            out[n] = value
+                            nxt.append(n)
+                        n = c - 1
+                        if open_[n]:
+                            open_[n] = 0
+                            out[n] = value
+                            nxt.append(n)
+                        n = c + 1
+                        if open_[n]:
+                            open_[n] = 0
+                            out[n] = value
+                            nxt.append(n)
+                else:
+                    free, no_cut = self.free if self.cornered else None, self.no_cut
+                    for c in frontier:
+                        for off, a, b in self.moves:
+                            n = c + off
+                            if not open_[n]:
+                                continue
+                            if a is not None and not (
+                                    (free[c + a] and free[c + b]) if no_cut else
+                                    (free[c + a] or free[c + b])):
+                                continue
+                            open_[n] = 0
+                            out[n] = value
+                            nxt.append(n)
+                frontier = nxt
+            else:
+                cells = np.asarray(frontier, dtype=np.intp)
+                if not self.cornered:
+                    nbrs = (cells[:, None] + self.offsets).ravel()
+                    nbrs = nbrs[self.open_np[nbrs] != 0]
+                else:
+                    parts = []
+                    for off, a, b in self.moves:
+                        n = cells + off
+                        keep = self.open_np[n] != 0
+                        if a is not None:
+                            side_a = self.free_np[cells + a] != 0
+                            side_b = self.free_np[cells + b] != 0
+                            keep &= (side_a & side_b) if self.no_cut else (side_a | side_b)
+                        parts.append(n[keep])
+                    nbrs = np.concatenate(parts)
+                self.open_np[nbrs] = 0
+                # A cell reached from two sides appears twice; keep the
+                # copy whose position survives the scatter.
+                positions = np.arange(len(nbrs), dtype=np.int32)
+                self.out_np[nbrs] = positions
+                frontier = nbrs[self.out_np[nbrs] == positions]
+                self.out_np[frontier] = value
+            reached += len(frontier)
+        return reached
+
+    def result(self):
+        """``out`` without the border, as a flat row-major buffer"""
+        maze = self.maze
+        r = self.border
+        if np is not None:
+            return self.out_np.reshape(-1, self.width)[r:r + maze.height, r:r + maze.width].ravel()
+        result = array('i')
+        for y in range(maze.height):
+            row = (y + r) * self.width + r
+            result.extend(self.out[row:row + maze.width])
+        return result
+
+
+def distance_field(maze, sources, small_frontier=SMALL_FRONTIER):
+    """Move counts from the nearest of sources to every cell (-1 = unreachable)
+
+    ``sources`` is one (x, y) position or a list of them. The whole
+    frontier is expanded per step with array operations when NumPy is
+    installed (with a plain loop for narrow frontiers); the result is a
+    flat int32 NumPy array, or an ``array('i')`` without NumPy. Index it
+    with ``maze.index(pos)``. Moves follow the maze's neighbourhood;
+    step costs and move lengths are ignored.
+
+    Each layer costs a dozen NumPy calls however narrow it is, so the
+    gain depends on frontier width. On 1000x1000 grids here it is about
+    7.5-9.5x faster than ``BFS.solve`` on open grids and rooms and about
+    7x on braid mazes. On perfect mazes the frontier stays a few cells
+    wide and the plain loop does the work, for only about 2x per cell.
+    """
+    if sources and not hasattr(sources[0], '__len__'):
+        sources = [sources]
+    grid = _PaddedGrid(maze)
+    grid.spread([grid.padded_index(p) for p in sources], small_frontier=small_frontier)
+    return grid.result()
+
+
+def label_components(maze, small_frontier=SMALL_FRONTIER):
+    """Label the connected components of free cells under the maze's neighbourhood
+
+    Returns (labels, count): labels is a flat int32 buffer like
+    ``distance_field``'s, with 0..count-1 for free cells and -1 for walls.
+    """
+    grid = _PaddedGrid(maze)
+    count = 0
+    p = grid.open.find(1)
+    while p != -1:
+        grid.spread([p], label=count, small_frontier=small_frontier)
+        count += 1
+        p = grid.open.find(1, p + 1)
+    return grid.result(), count
+
+
+# =========================
+# Reachability
+# =========================
+class Components:
+    """Connected-component labels for O(1) reachability checks
+
+    ``connected(a, b)`` rejects impossible start/goal pairs before any
+    solver runs. The labels are recomputed when the maze version moves.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self._build()
+
+    def _build(self):
+        self.version = self.maze.version
+        labels, self.count = label_components(self.maze)
+        if np is not None:
+            # Plain array indexing is cheaper than NumPy scalar access
+            self.labels = array('i')
+            self.labels.frombytes(labels.tobytes())
+        else:
+            self.labels = labels
+
+    def component(self, pos):
+        """Component label of pos, or -1 for a wall"""
+        if self.version != self.maze.version:
+            self._build()
+        return self.labels[self.maze.index(pos)]
+
+    def connected(self, a, b):
+        label = self.component(a)
+        return label != -1 and label == self.labels[self.maze.index(b)]
@@ -0,0 +1,219 @@
+import random
+from array import array
+
+WALL = 1
+FREE = 0
+
+
+# =========================
+# Helpers
+# =========================
+def _blank(width, height):
+    if width < 1 or height < 1:
+        raise ValueError("maze dimensions must be positive")
+    return bytearray(b'\x01') * (width * height)
+
+
+def _lattice_steps(cell, width, height, step):
+    """Lattice neighbours two cells away: (wall between, neighbour) pairs"""
+    x = cell % width
+    result = []
+    if cell >= step * width:
+        result.append((cell - width, cell - step * width))
+    if cell + step * width < width * height:
+        result.append((cell + width, cell + step * width))
+    if x >= step:
+        result.append((cell - 1, cell - step))
+    if x + step < width:
+        result.append((cell + 1, cell + step))
+    return result
+
+
+def _connect_goal(cells, width, height):
+    """Carve from the bottom-right corner to the nearest lattice cell
+
+    Lattice mazes only carve even coordinates, so with an even width or
+    height the default goal would sit inside a wall. The carved spur only
+    touches the lattice once, so perfect mazes stay perfect.
+    """
+    x, y = width - 1, height - 1
+    lx, ly = x - x % 2, y - y % 2
+    while x > lx:
+        cells[y * width + x] = FREE
+        x -= 1
+    while y > ly:
+        cells[y * width + x] = FREE
+        y -= 1
+    cells[y * width + x] = FREE
+
+
+# =========================
+# Perfect Mazes
+# =========================
+def recursive_backtracker(width, height, rng):
+    """Depth-first carving with an explicit stack (long, winding corridors)"""
+    cells = _blank(width, height)
+    size = width * height
+    random_value = rng.random
+    cells[0] = FREE
+    stack = [0]
+    while stack:
+        current = stack[-1]
+        x = current % width
+        options = []
+        if current >= 2 * width and cells[current - 2 * width]:
+            options.append(-width)
+        if current + 2 * width < size and cells[current + 2 * width]:
+            options.append(width)
+        if x >= 2 and cells[current - 2]:
+            options.append(-1)
+        if x + 2 < width and cells[current + 2]:
+            options.append(1)
+        if not options:
+            stack.pop()
+            continue
+        step = options[int(random_value() * len(options))]
+        cells[current + step] = FREE
+        current += 2 * step
+        cells[current] = FREE
+        stack.append(current)
+    _connect_goal(cells, width, height)
+    return cells
+
+
+def prim(width, height, rng):
+    """Randomised Prim: grow from the start by a random frontier cell"""
+    in_frontier = 2
+    cells = _blank(width, height)
+    cells[0] = FREE
+    frontier = []
+    for _, cell in _lattice_steps(0, width, height, 2):
+        cells[cell] = in_frontier
+        frontier.append(cell)
+
+    randrange = rng.randrange
+    choice = rng.choice
+    while frontier:
+        k = randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        current = frontier.pop()
+        links = []
+        for wall, cell in _lattice_steps(current, width, height, 2):
+            if cells[cell] == FREE:
+                links.append(wall)
+            elif cells[cell] == WALL:
+                cells[cell] = in_frontier
+                frontier.append(cell)
+        cells[choice(links)] = FREE
+        cells[current] = FREE
+    _connect_goal(cells, width, height)
+    return cells
+
+
+def kruskal(width, height, rng):
+    """Randomised Kruskal: knock down shuffled walls between disjoint sets"""
+    cells = _blank(width, height)
+    parent = array('i', range(width * height))
+
+    walls = []
+    for y in range(0, height, 2):
+        row = y * width
+        for x in range(0, width, 2):
+            cells[row + x] = FREE
+            if x + 2 < width:
+                walls.append(row + x + 1)
+            if y + 2 < height:
+                walls.append(row + width + x)
+    rng.shuffle(walls)
+
+    for wall in walls:
+        if (wall // width) % 2:
+            a, b = wall - width, wall + width
+        else:
+            a, b = wall - 1, wall + 1
+        # Union-find roots with path halving, inlined for speed
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a != b:
+            parent[a] = b
+            cells[wall] = FREE
+    _connect_goal(cells, width, height)
+    return cells
+
+
+# =========================
+# Mazes With Loops
+# =========================
+def braid(width, height, rng, loops=0.5):
+    """Backtracker maze with a ``loops`` fraction of dead ends opened up"""
+    cells = recursive_backtracker(width, height, rng)
+    random_value = rng.random
+    choice = rng.choice
+    for y in range(0, height, 2):
+        for x in range(0, width, 2):
+            cell = y * width + x
+            walls = []
+            if y >= 2:
+                walls.append(cell - width)
+            if y + 2 < height:
+                walls.append(cell + width)
+            if x >= 2:
+                walls.append(cell - 1)
+            if x + 2 < width:
+                walls.append(cell + 1)
+            closed = [wall for wall in walls if cells[wall]]
+            if len(walls) - len(closed) == 1 and closed and random_value() < loops:
+                cells[choice(closed)] = FREE
+    return cells
+
+
+def rooms(width, height, rng, density=0.2, room_size=16):
+    """Open rooms joined by doors, with walls scattered at ``density``
+
+    Rooms are ``room_size`` cells across (0 disables the partitions). The
+    scatter is random, so the start and goal are opened but not
+    guaranteed to be connected.
+    """
+    if not 0 <= density < 1:
+        raise ValueError("density must be in [0, 1)")
+    size = width * height
+    threshold = int(density * 256)
+    table = bytes(1 if b < threshold else 0 for b in range(256))
+    cells = bytearray(rng.randbytes(size).translate(table))
+
+    if room_size > 1:
+        randrange = rng.randrange
+        for y in range(room_size, height, room_size + 1):
+            cells[y * width:(y + 1) * width] = b'\x01' * width
+            for x0 in range(0, width, room_size + 1):
+                door = x0 + randrange(min(room_size, width - x0))
+                cells[y * width + door] = FREE
+        for x in range(room_size, width, room_size + 1):
+            cells[x:size:width] = b'\x01' * len(range(x, size, width))
+            for y0 in range(0, height, room_size + 1):
+                door = y0 + randrange(min(room_size, height - y0))
+                cells[door * width + x] = FREE
+
+    cells[0] = FREE
+    cells[size - 1] = FREE
+    return cells
+
+
+GENERATORS = {
+    "backtracker": recursive_backtracker,
+    "prim": prim,
+    "kruskal": kruskal,
+    "braid": braid,
+    "rooms": rooms,
+}
+
+
+def generate(name, width, height, seed=None, **options):
+    """Build the cells of a ``name`` maze; the same seed gives the same grid"""
+    try:
+        generator = GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"unknown generator {name!r}, choose from {sorted(GENERATORS)}") from None
+    return generator(width, height, random.Random(seed), **options)
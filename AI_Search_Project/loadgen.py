@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+from benchmark import percentile, random_queries
+from cli import add_maze_options, emit, load_maze
+
+SERVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py")
+
+
+# =========================
+# HTTP Client
+# =========================
+class Connection:
+    """One keep-alive HTTP/1.1 connection to the service"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, address):
+        if address.startswith("unix:"):
+            reader, writer = await asyncio.open_unix_connection(address[5:])
+        else:
+            host, _, port = address.rpartition(":")
+            reader, writer = await asyncio.open_connection(host, int(port))
+        return cls(reader, writer)
+
+    async def get(self, target):
+        """(status, decoded JSON body) of GET target"""
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+# =========================
+# Load Generation
+# =========================
+def plan_requests(queries, count, hot, repeat, seed=0):
+    """count queries; a ``repeat`` fraction is drawn from the first ``hot``
+
+    Repeats of a few popular start/goal pairs are what request coalescing
+    feeds on; the rest are spread over every query.
+    """
+    rng = random.Random(seed)
+    popular = queries[:max(hot, 1)]
+    return [rng.choice(popular) if rng.random() < repeat else rng.choice(queries) for _ in range(count)]
+
+
+async def run_load(address, plan, concurrency=16, algorithm="AStar", deadline_ms=None, maze="default"):
+    """Send every planned (start, goal) over ``concurrency`` connections
+
+    Returns throughput, client-side latency percentiles, the count of each
+    response status and the service's own /metrics at the end.
+    """
+    pending = iter(plan)
+    latencies = []
+    statuses = {}
+    coalesced = 0
+
+    async def client():
+        nonlocal coalesced
+        connection = await Connection.open(address)
+        try:
+            for start, goal in pending:
+                params = {"maze": maze, "algorithm": algorithm,
+                          "start": f"{start[0]},{start[1]}", "goal": f"{goal[0]},{goal[1]}"}
+                if deadline_ms is not None:
+                    params["deadline_ms"] = deadline_ms
+                t0 = time.perf_counter_ns()
+                status, body = await connection.get("/solve?" + urlencode(params))
+                latencies.append((time.perf_counter_ns() - t0) / 1_000_000)
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200 and body["coalesced"]:
+                    coalesced += 1
+        finally:
+            await connection.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    connection = await Connection.open(address)
+    try:
+        _, server = await connection.get("/metrics")
+    finally:
+        await connection.close()
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(plan),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_sec": len(plan) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+        "coalesced": coalesced,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "server": server,
+    }
+
+
+# =========================
+# Service Process
+# =========================
+def spawn_service(args):
+    """Start service.py on a free port with the same maze options"""
+    command = [sys.executable, SERVICE, "--port", "0", "--size", *map(str, args.size)]
+    for option in ("maze", "generator", "seed", "neighborhood", "workers"):
+        value = getattr(args, option)
+        if value is not None:
+            command += [f"--{option}", str(value)]
+    if args.threads:
+        command.append("--threads")
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if not line.startswith("serving on http://"):
+        process.kill()
+        raise RuntimeError(f"service did not start: {line.strip() or process.stderr.read()}")
+    return process, line.split()[2][len("http://"):]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput of service.py. Without --connect it starts one on the same maze.")
+    add_maze_options(parser)
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="a running service (or unix:PATH); the maze options must match its maze")
+    parser.add_argument("--workers", type=int, help="workers of the started service")
+    parser.add_argument("--threads", action="store_true", help="start the service with thread workers")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16, help="open connections (default 16)")
+    parser.add_argument("--algorithm", default="AStar")
+    parser.add_argument("--deadline-ms", type=float, help="deadline sent with every request")
+    parser.add_argument("--queries", type=int, default=200, help="distinct start/goal pairs (default 200)")
+    parser.add_argument("--hot", type=int, default=8, help="popular pairs among them (default 8)")
+    parser.add_argument("--repeat", type=float, default=0.5,
+                        help="fraction of requests for a popular pair (default 0.5)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    args = parser.parse_args(argv)
+
+    if args.seed is None and args.maze is None:
+        # The started service has to generate the same random maze
+        args.seed = random.randrange(2 ** 31)
+    maze = load_maze(args)
+    plan = plan_requests(random_queries(maze, args.queries, args.seed or 0), args.requests,
+                         args.hot, args.repeat, args.seed or 0)
+
+    process = None
+    address = args.connect
+    if address is None:
+        process, address = spawn_service(args)
+    try:
+        summary = asyncio.run(run_load(address, plan, args.concurrency, args.algorithm, args.deadline_ms))
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            process.wait()
+    emit([summary], args.format, {"address": address, "algorithm": args.algorithm, "seed": args.seed,
+                                  "width": maze.width, "height": maze.height})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
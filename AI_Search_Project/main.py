@@ -1,31 +1,38 @@
-import time
 import sys
-import math  
-import matplotlib.pyplot as plt
-from maze import Maze, MazeVisualizer
+from maze import Maze
 from algorithms.bfs import BFS
 from algorithms.dfs import DFS
 from algorithms.ids import IDS
+from algorithms.idastar import IDAStar
 from algorithms.ucs import UCS
 from algorithms.astar import AStar
-
-print("=" * 60)
-print("AI SEARCH ALGORITHMS COMPARISON")
-print("=" * 60)
+from algorithms.jps import JPS
+from algorithms.bidirectional import BidirectionalBFS, BidirectionalAStar
+from algorithms.arastar import ARAStar, guaranteed_bound
+from algorithms.exploration import Exploration
+from algorithms.instrument import capture
+from benchmark import time_solver
 
 def run_algorithms_on_maze(maze_obj):
     algorithms = {
         "BFS": BFS(),
         "DFS": DFS(),
         "IDS": IDS(),
+        "IDA*": IDAStar(),
         "UCS": UCS(),
-        "AStar": AStar()
+        "AStar": AStar(),
+        "JPS": JPS(),
+        "BiBFS": BidirectionalBFS(),
+        "BiA*": BidirectionalAStar(),
+        "ARA*": ARAStar()
     }
 
     results = {}
     print("\nRUNNING ALGORITHMS...")
     
     for name, solver in algorithms.items():
+        # Only the count is shown, so don't keep every explored cell
+        solver.explored_nodes = Exploration("count")
         path = solver.solve(maze_obj)
         
         if path is not None and len(path) > 0:
@@ -39,6 +46,7 @@ def run_algorithms_on_maze(maze_obj):
                 "path_cost": 0,
                 "memory": 0,
                 "is_optimal": False,
+                "bound": None,
                 "success_rate": 0.0
             }
 
@@ -47,50 +55,35 @@ def run_algorithms_on_maze(maze_obj):
     for name, data in results.items():
         solver = data["solver"]
 
-        total_time = 0
-        runs = 10 
-        
-        for _ in range(runs):
-            start_time = time.perf_counter_ns()
-            solver.solve(maze_obj)
-            end_time = time.perf_counter_ns()
-            total_time += (end_time - start_time)
-        
-        avg_time_ns = total_time / runs
-        avg_time_ms = avg_time_ns / 1_000_000
+        timing = time_solver(solver, maze_obj, runs=10, warmup=2)
+        avg_time_ms = timing["median_ms"]
         results[name]["exec_time_ms"] = avg_time_ms
+        results[name]["p90_ms"] = timing["p90_ms"]
 
         path = data["path"]
-        path_cost = 0
-        for i in range(len(path)-1):
-            x1, y1 = path[i]
-            x2, y2 = path[i+1]
-            path_cost += abs(x1-x2) + abs(y1-y2)
+        path_cost = maze_obj.path_cost(path)
         
         results[name]["path_cost"] = path_cost
 
         explored = data["explored_nodes"]
-        if name == "BFS":
-            memory = explored * 2 
-        elif name == "DFS":
-            memory = explored * 1.5
-        elif name == "IDS":
-            memory = explored * 1.2
-        elif name == "UCS":
-            memory = explored * 2.5 
-        elif name == "AStar":
-            memory = explored * 3
+        # One extra instrumented run for the search counters, the peak
+        # allocation (tracemalloc) and the hottest function (cProfile)
+        profile = capture(solver, maze_obj, top=1)
+        results[name]["stats"] = profile["stats"]
+        results[name]["memory"] = profile["peak_kb"]
+        results[name]["hotspot"] = profile["profile"][0]
         
-        results[name]["memory"] = memory
-        
-        is_optimal = name in ["BFS", "UCS", "AStar"] 
-        results[name]["is_optimal"] = is_optimal
+        # What the solver proved for this maze (ARA* reports it per solve)
+        bound = guaranteed_bound(solver, maze_obj)
+        results[name]["bound"] = bound
+        results[name]["is_optimal"] = bound == 1.0
 
         success_rate = 100.0 if path else 0.0
         results[name]["success_rate"] = success_rate
         
         print(f"{name}: {data['path_length']} steps | Cost: {path_cost} | "
-              f"{explored} explored | Time: {avg_time_ms:.2f} ms")
+              f"{explored} explored | Time: {avg_time_ms:.2f} ms "
+              f"(p90 {timing['p90_ms']:.2f}) | Peak: {profile['peak_kb']:.1f} KB")
 
     return results
 
@@ -123,118 +116,141 @@ def get_best_algorithm(results):
     
     return max(scores, key=scores.get)
 
+def optimality(data):
+    """YES, NO, or the proven suboptimality bound such as x1.25"""
+    if data["is_optimal"]:
+        return "YES"
+    return "NO" if data["bound"] is None else f"x{data['bound']:.2f}"
+
+def animate(maze, path, title):
+    # Imported here so the solvers run without loading matplotlib
+    from visualizer import MazeVisualizer
+    MazeVisualizer(maze).animate(path, algorithm_name=title)
+
 def exit_program():
-    plt.close("all")
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    if pyplot is not None:
+        pyplot.close("all")
     sys.exit(0)
 
-maze = Maze(width=20, height=12)
-results = run_algorithms_on_maze(maze)
+def menu(maze):
+    """Run every solver on maze, then show the interactive results menu"""
+    print("=" * 60)
+    print("AI SEARCH ALGORITHMS COMPARISON")
+    print("=" * 60)
+    results = run_algorithms_on_maze(maze)
 
-while True:
-    print("\n" + "="*60)
-    print("MAZE INFO")
-    print(f"Start: {maze.start} | Goal: {maze.goal}")
-    print("="*60)
+    while True:
+        print("\n" + "="*60)
+        print("MAZE INFO")
+        print(f"Start: {maze.start} | Goal: {maze.goal}")
+        print("="*60)
 
-    menu_map = {}
-    counter = 1
+        menu_map = {}
+        counter = 1
     
-    for name, data in results.items():
-        print(f"{counter}. View {name} Solution "
-              f"({data['path_length']} steps | Cost: {data['path_cost']} | "
-              f"Time: {data['exec_time_ms']:.2f} ms)")
-        menu_map[counter] = name
+        for name, data in results.items():
+            print(f"{counter}. View {name} Solution "
+                  f"({data['path_length']} steps | Cost: {data['path_cost']} | "
+                  f"Time: {data['exec_time_ms']:.2f} ms)")
+            menu_map[counter] = name
+            counter += 1
+    
+        print(f"{counter}. View ALL Solutions")
+        menu_map[counter] = "ALL"
         counter += 1
     
-    print(f"{counter}. View ALL Solutions")
-    menu_map[counter] = "ALL"
-    counter += 1
+        print(f"{counter}. View BEST Algorithm")
+        menu_map[counter] = "BEST"
+        counter += 1
     
-    print(f"{counter}. View BEST Algorithm")
-    menu_map[counter] = "BEST"
-    counter += 1
+        print(f"{counter}. View Algorithm Comparison")
+        menu_map[counter] = "COMPARE"
+        counter += 1
     
-    print(f"{counter}. View Algorithm Comparison")
-    menu_map[counter] = "COMPARE"
-    counter += 1
+        print(f"{counter}. Exit Program")
+        menu_map[counter] = "EXIT"
     
-    print(f"{counter}. Exit Program")
-    menu_map[counter] = "EXIT"
+        print("-" * 60)
     
-    print("-" * 60)
+        try:
+            choice = int(input("Select option: "))
+        except:
+            continue
     
-    try:
-        choice = int(input("Select option: "))
-    except:
-        continue
+        action = menu_map.get(choice)
     
-    action = menu_map.get(choice)
+        if action in results:
+            data = results[action]
+            animate(maze, data["path"], f"{action} Algorithm")
     
-    if action in results:
-        data = results[action]
-        visualizer = MazeVisualizer(maze)
-        visualizer.animate(
-            data["path"],
-            algorithm_name=f"{action} Algorithm"
-        )
+        elif action == "ALL":
+            for name, data in results.items():
+                animate(maze, data["path"], f"{name} Algorithm")
     
-    elif action == "ALL":
-        for name, data in results.items():
-            visualizer = MazeVisualizer(maze)
-            visualizer.animate(
-                data["path"],
-                algorithm_name=f"{name} Algorithm"
-            )
-    
-    elif action == "BEST":
-        best = get_best_algorithm(results)
-        data = results[best]
-        visualizer = MazeVisualizer(maze)
-        visualizer.animate(
-            data["path"],
-            algorithm_name=f"BEST Algorithm ({best})"
-        )
-    
-    elif action == "COMPARE":
-        print("\n" + "="*80)
-        print("ALGORITHM COMPARISON")
-        print("="*80)
-        print(f"{'Algorithm':<10} {'Steps':<8} {'Cost':<8} {'Explored':<10} "
-              f"{'Time(ms)':<10} {'Memory':<10} {'Optimal':<10} {'Success':<10}")
-        print("-"*80)
+        elif action == "BEST":
+            best = get_best_algorithm(results)
+            data = results[best]
+            animate(maze, data["path"], f"BEST Algorithm ({best})")
+    
+        elif action == "COMPARE":
+            print("\n" + "="*124)
+            print("ALGORITHM COMPARISON")
+            print("="*124)
+            print(f"{'Algorithm':<10} {'Steps':<8} {'Cost':<8} {'Explored':<10} "
+                  f"{'Expanded':<10} {'Generated':<10} {'Dups':<6} {'PeakQ':<7} {'Push/Pop':<12} "
+                  f"{'Time(ms)':<10} {'Mem(KB)':<10} {'Optimal':<8} {'Success':<8}")
+            print("-"*124)
         
-        for name, data in results.items():
+            for name, data in results.items():
         
-            min_path = min(r["path_length"] for r in results.values())
-            min_time = min(r["exec_time_ms"] for r in results.values())
-            min_explored = min(r["explored_nodes"] for r in results.values())
-            min_cost = min(r["path_cost"] for r in results.values())
-            min_memory = min(r["memory"] for r in results.values())
+                min_path = min(r["path_length"] for r in results.values())
+                min_time = min(r["exec_time_ms"] for r in results.values())
+                min_explored = min(r["explored_nodes"] for r in results.values())
+                min_cost = min(r["path_cost"] for r in results.values())
+                min_memory = min(r["memory"] for r in results.values())
             
-            score = 0
-            if data["path_length"] == min_path:
-                score += 20
-            if data["exec_time_ms"] == min_time:
-                score += 20
-            if data["explored_nodes"] == min_explored:
-                score += 15
-            if data["path_cost"] == min_cost:
-                score += 20
-            if data["memory"] == min_memory:
-                score += 15
-            if data["is_optimal"]:
-                score += 10
+                score = 0
+                if data["path_length"] == min_path:
+                    score += 20
+                if data["exec_time_ms"] == min_time:
+                    score += 20
+                if data["explored_nodes"] == min_explored:
+                    score += 15
+                if data["path_cost"] == min_cost:
+                    score += 20
+                if data["memory"] == min_memory:
+                    score += 15
+                if data["is_optimal"]:
+                    score += 10
             
-            print(
-                f"{name:<10} "
-                f"{data['path_length']:<8} "
-                f"{data['path_cost']:<8} "
-                f"{data['explored_nodes']:<10} "
-                f"{data['exec_time_ms']:<10.2f} "
-                f"{data['memory']:<10.0f} "
-                f"{'YES' if data['is_optimal'] else 'NO':<10} "
-                f"{data['success_rate']:<10.1f}%"
-            )
-    
-    elif action == "EXIT":
-        exit_program()
+                stats = data["stats"]
+                print(
+                    f"{name:<10} "
+                    f"{data['path_length']:<8} "
+                    f"{data['path_cost']:<8} "
+                    f"{data['explored_nodes']:<10} "
+                    f"{stats.expanded:<10} "
+                    f"{stats.generated:<10} "
+                    f"{stats.duplicates:<6} "
+                    f"{stats.peak_frontier:<7} "
+                    f"{f'{stats.pushes}/{stats.pops}':<12} "
+                    f"{data['exec_time_ms']:<10.2f} "
+                    f"{data['memory']:<10.1f} "
+                    f"{optimality(data):<8} "
+                    f"{data['success_rate']:<8.1f}%"
+                )
+
+            print("-"*124)
+            print("Hottest function per algorithm (cProfile, own time):")
+            for name, data in results.items():
+                function, calls, own_ms, _ = data["hotspot"]
+                phases = ", ".join(f"{phase} {ms:.2f}" for phase, ms in data["stats"].phases_ms.items())
+                print(f"  {name:<10} {function} x{calls}, {own_ms:.2f} ms | phases (ms): {phases}")
+    
+        elif action == "EXIT":
+            exit_program()
+
+
+if __name__ == "__main__":
+    menu(Maze(width=20, height=12))
@@ -1,20 +1,182 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.animation import FuncAnimation
-from collections import deque
+from array import array
+import copy
+from generators import generate
+from neighborhoods import ROOK_MOVES, NeighborMasks, get_neighborhood
 
 
 # =========================
 # Maze Logic
 # =========================
+class _GridRow:
+    """Row view over the flat cell buffer, so grid[y][x] keeps working"""
+    __slots__ = ('maze', 'offset')
+
+    def __init__(self, maze, y):
+        self.maze = maze
+        self.offset = y * maze.width
+
+    def __len__(self):
+        return self.maze.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.maze.width:
+            raise IndexError("grid column out of range")
+        return self.maze.cells[self.offset + x]
+
+    def __setitem__(self, x, value):
+        if not 0 <= x < self.maze.width:
+            raise IndexError("grid column out of range")
+        self.maze.set_cell(x, self.offset // self.maze.width, value)
+
+    def __iter__(self):
+        return iter(self.maze.cells[self.offset:self.offset + self.maze.width])
+
+
+class _GridView:
+    """grid[y][x] compatible view over Maze.cells"""
+    __slots__ = ('maze',)
+
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __len__(self):
+        return self.maze.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.maze.height:
+            raise IndexError("grid row out of range")
+        return _GridRow(self.maze, y)
+
+    def __iter__(self):
+        for y in range(self.maze.height):
+            yield _GridRow(self.maze, y)
+
+
+class SearchScratch:
+    """Per-cell search arrays reused across queries
+
+    Instead of clearing the arrays between searches, every search bumps
+    ``generation``; a cell's ``g``/``parent`` entries only count when its
+    ``stamp`` equals the current generation, and it is closed when
+    ``closed`` does. Starting a new search is O(1).
+    """
+    def __init__(self, size):
+        self.size = size
+        self.generation = 0
+        self.stamp = array('I', [0]) * size
+        self.closed = array('I', [0]) * size
+        self.g = array('d', [0.0]) * size
+        self.parent = array('i', [-1]) * size
+
+    def begin(self):
+        """Start a new search and return its generation number"""
+        self.generation += 1
+        if self.generation >= 0xFFFFFFFF:
+            self.stamp = array('I', [0]) * self.size
+            self.closed = array('I', [0]) * self.size
+            self.generation = 1
+        return self.generation
+
+
 class Maze:
-    """Maze generation and management"""
-    def __init__(self, width=20, height=12):
+    """Maze generation and management
+
+    Cells live in one flat bytearray (one byte per cell, 0 = free, 1 = wall)
+    addressed by the integer index ``y * width + x``. Solvers work on these
+    indices and only convert back to (x, y) tuples when returning a path.
+
+    An optional cost layer (``costs``, float32 per cell) gives the cost of
+    stepping into each cell. Without it every step costs 1.
+
+    ``generator`` picks the grid: "static" (the fixed 20x12 maze, the
+    default at that size) or one of ``generators.GENERATORS`` (default
+    "backtracker" for any other size), seeded with ``seed``; extra keyword
+    options go to the generator.
+
+    Edits made through ``set_cell`` (or ``grid[y][x] = ...``) bump
+    ``version`` and are reported to listeners registered with
+    ``add_listener``. Writing to ``cells`` directly bypasses both, and
+    leaves the neighbour masks stale.
+
+    ``neighborhood`` sets which moves a cell allows: 4 (the default), 8,
+    or any ``neighborhoods.Neighborhood``. Each cell's allowed moves are
+    kept as a bitmask, so ``neighbors`` does no bounds or corner checks.
+    """
+    def __init__(self, width=20, height=12, costs=None, generator=None, seed=None,
+                 neighborhood=None, **options):
+        if generator is None:
+            generator = "static" if (width, height) == (20, 12) else "backtracker"
+        if generator == "static":
+            if (width, height) != (20, 12):
+                raise ValueError("the static maze is 20x12; pick a generator for other sizes")
+            cells = self._create_static_maze()
+        else:
+            cells = generate(generator, width, height, seed, **options)
+        self._setup(width, height, cells, costs, neighborhood)
+
+    @classmethod
+    def from_cells(cls, width, height, cells, start=(0, 0), goal=None, costs=None, neighborhood=None):
+        """Build a maze around an existing cell buffer without copying it
+
+        ``cells`` may be a bytearray or a writable memoryview (shared or
+        memory-mapped memory). A float32 memoryview ``costs`` is adopted
+        as-is too; anything else goes through ``set_costs``.
+        """
+        if len(cells) != width * height:
+            raise ValueError(f"cell buffer has {len(cells)} cells, expected {width * height}")
+        maze = cls.__new__(cls)
+        maze._setup(width, height, cells, None, neighborhood)
+        maze.start = tuple(start)
+        maze.goal = tuple(goal) if goal is not None else (width - 1, height - 1)
+        if isinstance(costs, memoryview) and costs.format == 'f':
+            if len(costs) != maze.size:
+                raise ValueError(f"cost layer has {len(costs)} cells, expected {maze.size}")
+            maze.costs = costs
+            maze.min_cost = min(costs)
+        elif costs is not None:
+            maze.set_costs(costs)
+        return maze
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """Load a maze saved with ``save`` (memory-mapped by default)"""
+        import mazeio
+        return mazeio.load(path, use_mmap)
+
+    def save(self, path, packed=False):
+        """Write this maze in the binary format described in mazeio"""
+        import mazeio
+        mazeio.save(self, path, packed)
+
+    def _setup(self, width, height, cells, costs, neighborhood=None):
         self.width = width
         self.height = height
+        self.size = width * height
         self.start = (0, 0)
         self.goal = (width - 1, height - 1)
-        self.grid = self._create_static_maze()
+        self.cells = cells
+        self.grid = _GridView(self)
+        self.costs = None
+        self.min_cost = 1
+        self._scratch = None
+        self.version = 0
+        self._listeners = []
+        self._use_neighborhood(get_neighborhood(neighborhood))
+        if costs is not None:
+            self.set_costs(costs)
+
+    def _use_neighborhood(self, neighborhood):
+        self.neighborhood = neighborhood
+        self._masks = NeighborMasks(neighborhood, self.cells, self.width, self.height)
+        self._moves = neighborhood.move_table(self.width)
+        self._steps = neighborhood.move_table(self.width, with_lengths=True)
+        self._rook = neighborhood.moves == ROOK_MOVES
+
+    def set_neighborhood(self, neighborhood):
+        """Switch to another neighbourhood (4, 8, a Neighborhood or a move list)"""
+        self._use_neighborhood(get_neighborhood(neighborhood))
+        self.version += 1
+        self._notify(None)
 
     def _create_static_maze(self):
         """Static maze - same every time"""
@@ -32,151 +194,199 @@ class Maze:
             [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
             [0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0]
         ]
-        return grid
+        return bytearray(cell for row in grid for cell in row)
+
+    def index(self, pos):
+        x, y = pos
+        return y * self.width + x
+
+    def pos(self, i):
+        y, x = divmod(i, self.width)
+        return (x, y)
 
     def is_valid(self, x, y):
-        return 0 <= x < self.width and 0 <= y < self.height and self.grid[y][x]==0
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] == 0
 
     def get_neighbors(self, x, y):
-        dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-        return [(x+dx, y+dy) for dx,dy in dirs if self.is_valid(x+dx, y+dy)]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return []
+        return [self.pos(j) for j in self.neighbors(y * self.width + x)]
 
+    def neighbors(self, i):
+        """Free neighbour indices of cell i, in the neighbourhood's move order
 
-# =========================
-# Maze Visualization
-# =========================
-class MazeVisualizer:
-    """Visualize maze with cartoon mouse and cheese"""
-    settings = {
-        'wall_color':"#313338",
-        'wall_edge':'#1a202c',
-        'wall_alpha':0.9,
-        'cell_base':0.95,
-        'cell_alpha':0.8,
-        'mouse_color':'#8a8a8a',
-        'mouse_ear':'#a8a8a8',
-        'mouse_inner_ear':'#c8c8c8',
-        'cheese_color':'#ffd700',
-        'cheese_edge':'#daa520',
-        'trail_color':'#4ecdc4'
-    }
+        With the default 4-neighbourhood that is up, down, left, right.
+        """
+        bits = self._masks.bits
+        if bits is None:
+            bits = self._masks.build()
+        if self._rook:
+            # Unrolled: cheaper than the table lookup for the default case
+            mask = bits[i]
+            w = self.width
+            result = []
+            if mask & 1:
+                result.append(i - w)
+            if mask & 2:
+                result.append(i + w)
+            if mask & 4:
+                result.append(i - 1)
+            if mask & 8:
+                result.append(i + 1)
+            return result
+        return [i + d for d in self._moves[bits[i]]]
 
-    def __init__(self, maze):
-        self.maze = maze
-        self.fig, self.ax = plt.subplots(figsize=(19,11))
-        self.fig.patch.set_facecolor('#0a192f')
-        self.ax.set_facecolor('#0a192f')
-        self.mouse_artist = None
-        self.path_line = None
-        self.trail_dots = deque(maxlen=15)
-        self.current_frame = 0
-
-    def _draw_cell(self, x, y, is_wall):
-        face = self.settings['wall_color'] if is_wall else plt.cm.Greys(self.settings['cell_base'] - (x+y*2)%4*0.02)
-        edge = self.settings['wall_edge'] if is_wall else '#e2e8f0'
-        hatch = '////' if is_wall else None
-        alpha = self.settings['wall_alpha'] if is_wall else self.settings['cell_alpha']
-        cell = patches.FancyBboxPatch((x,y),1,1, boxstyle="round,pad=0.02,rounding_size=0.1",
-                                      facecolor=face, edgecolor=edge, linewidth=1.5, alpha=alpha, hatch=hatch)
-        self.ax.add_patch(cell)
-        if is_wall:
-            self.ax.add_patch(patches.Circle((x+0.5,y+0.5),0.1,facecolor='#4a5568',alpha=0.3))
-
-    def _draw_mouse(self, x, y, direction=(1,0)):
-        if self.mouse_artist:
-            for patch in self.mouse_artist: 
-                patch.remove()
-        cx, cy = x+0.5, y+0.5
-        dx, dy = direction if direction!=(0,0) else (1,0)
-        patches_list=[]
-        patches_list.append(self.ax.add_patch(patches.Circle((cx,cy),0.3,facecolor=self.settings['mouse_color'],edgecolor='#6a6a6a',linewidth=1,zorder=20)))
-
-        for ex in [-0.15,0.15]:
-            patches_list.append(self.ax.add_patch(patches.Circle((cx+ex,cy-0.18),0.12,facecolor=self.settings['mouse_ear'],edgecolor='#888888',linewidth=0.5,zorder=21)))
-            patches_list.append(self.ax.add_patch(patches.Circle((cx+ex,cy-0.18),0.072,facecolor=self.settings['mouse_inner_ear'],edgecolor='none',zorder=22)))
-
-        patches_list.append(self.ax.add_patch(patches.Circle((cx-0.08,cy+0.05),0.06,facecolor='white',edgecolor='#aaaaaa',linewidth=0.5,zorder=23)))
-        patches_list.append(self.ax.add_patch(patches.Circle((cx-0.05,cy+0.05),0.03,facecolor='black',zorder=24)))
-        patches_list.append(self.ax.add_patch(patches.Circle((cx+0.08,cy+0.05),0.06,facecolor='white',edgecolor='#aaaaaa',linewidth=0.5,zorder=23)))
-        patches_list.append(self.ax.add_patch(patches.Circle((cx+0.11,cy+0.05),0.03,facecolor='black',zorder=24)))
-
-        patches_list.append(self.ax.add_patch(patches.Circle((cx,cy+0.15),0.03,facecolor='#444444',edgecolor='#333333',linewidth=0.3,zorder=25)))
-
-        for side in [-1,1]:
-            for i in [-1,0,1]:
-                patches_list.append(self.ax.add_patch(patches.FancyArrow(cx+0.15*side,cy+0.1+i*0.04,0.2*side,0,width=0.005,facecolor='#888888',zorder=19)))
-
-        patches_list.append(self.ax.add_patch(patches.Arc((cx,cy+0.2),0.15,0.08,theta1=200,theta2=340,color='#666666',linewidth=1,zorder=26)))
-        self.mouse_artist=patches_list
-
-    def _draw_cheese(self):
-        x, y = self.maze.goal
-        cx, cy = x+0.5, y+0.5
-        triangle=[(cx+0.35,cy-0.25),(cx-0.35,cy),(cx+0.35,cy+0.25)]
-        self.ax.add_patch(patches.Polygon(triangle,facecolor=self.settings['cheese_color'],edgecolor=self.settings['cheese_edge'],linewidth=1.5,zorder=5,joinstyle='round'))
-
-        for i in range(5):
-            dot_x = cx + (i-2)*0.08
-            dot_y = cy + (i%2)*0.05 - 0.05
-            dot_size = 0.015
-            self.ax.add_patch(patches.Circle((dot_x,dot_y),dot_size,facecolor='#f4c542',alpha=0.7,edgecolor='none',zorder=6))
-
-    def _draw_path_line(self,path,current_index):
-        if len(path)>1:
-            x_coords=[p[0]+0.5 for p in path[:current_index+1]]
-            y_coords=[p[1]+0.5 for p in path[:current_index+1]]
-            if self.path_line: 
-                self.path_line.remove()
-            self.path_line,=self.ax.plot(x_coords,y_coords,color='#ff6b6b',linewidth=3,alpha=0.8,zorder=4,
-                                        marker='o',markersize=6,markerfacecolor='white',markeredgecolor='#ff6b6b',markeredgewidth=1.5)
-
-    def _add_trail_dot(self,x,y,frame_number):
-        dot_size = max(0.01,0.1-frame_number*0.002)
-        dot_alpha = max(0.05,0.5-frame_number*0.01)
-        trail_dot=patches.Circle((x+0.5,y+0.5),dot_size,facecolor=self.settings['trail_color'],alpha=dot_alpha,zorder=3)
-        self.ax.add_patch(trail_dot)
-        self.trail_dots.append(trail_dot)
-        if len(self.trail_dots)>self.trail_dots.maxlen:
-            old_dot=self.trail_dots.popleft()
-            old_dot.remove()
-
-    def draw_static(self):
-        self.ax.clear()
-        self.ax.set_aspect('equal')
-        self.ax.set_xlim(0,self.maze.width)
-        self.ax.set_ylim(self.maze.height,0)
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                self._draw_cell(x,y,self.maze.grid[y][x]==1)
-        sx, sy = self.maze.start
-        gx, gy = self.maze.goal
-        self.ax.add_patch(patches.Circle((sx+0.5,sy+0.5),0.3,facecolor='#90be6d',alpha=0.3,edgecolor='#90be6d',linewidth=2))
-        self.ax.add_patch(patches.Circle((gx+0.5,gy+0.5),0.3,facecolor='#f9c74f',alpha=0.3,edgecolor='#f9c74f',linewidth=2))
-        self.ax.text(sx+0.5,sy+0.5,'START',ha='center',va='center',fontsize=10,fontweight='bold',color='#90be6d')
-        self.ax.text(gx+0.5,gy+0.5,'GOAL',ha='center',va='center',fontsize=10,fontweight='bold',color='#f9c74f')
-        self._draw_cheese()
-        self.ax.set_xticks([]); self.ax.set_yticks([]); self.ax.set_frame_on(False)
-
-    def animate(self,path,algorithm_name="Search Algorithm"):
-        if not path:
-            print("No path to animate!"); return
-        self.draw_static(); self.current_frame=0
-        title=self.ax.text(self.maze.width/2,-0.5,f"{algorithm_name} - Path Length: {len(path)}",ha='center',va='center',fontsize=14,fontweight='bold',color='white',transform=self.ax.transData)
-        progress_text=self.ax.text(1,-0.5,"",fontsize=10,color='white',transform=self.ax.transData)
-        def update(frame):
-            self.current_frame=frame
-            x,y=path[frame]
-            direction=(x-path[frame-1][0],y-path[frame-1][1]) if frame>0 else (1,0)
-            self._draw_path_line(path,frame)
-            self._add_trail_dot(x,y,frame)
-            self._draw_mouse(x,y,direction)
-            progress_text.set_text(f"Step: {frame+1}/{len(path)} ({((frame+1)/len(path)*100):.0f}%)")
-            return [self.path_line]+(self.mouse_artist or [])+[progress_text]
-        anim=FuncAnimation(self.fig,update,frames=len(path),interval=5,repeat=False,blit=False)
-        plt.tight_layout()
-        try: 
-            plt.get_current_fig_manager().window.state('zoomed') 
-        except: 
-            plt.get_current_fig_manager().resize(1000,800)
-        plt.show()
-        return anim
\ No newline at end of file
+    def moves(self, i):
+        """(neighbour index, move length) pairs for cell i"""
+        bits = self._masks.bits
+        if bits is None:
+            bits = self._masks.build()
+        return [(i + d, length) for d, length in self._steps[bits[i]]]
+
+    def set_costs(self, costs):
+        """Install a per-cell cost layer (flat, or rows of width values)"""
+        if costs is None:
+            self.costs = None
+            self.min_cost = 1
+            self.version += 1
+            self._notify(None)
+            return
+        if len(costs) == self.height and hasattr(costs[0], '__len__'):
+            costs = [c for row in costs for c in row]
+        layer = array('f', costs)
+        if len(layer) != self.size:
+            raise ValueError(f"cost layer has {len(layer)} cells, expected {self.size}")
+        if min(layer) <= 0:
+            raise ValueError("cell costs must be positive")
+        self.costs = layer
+        self.min_cost = min(layer)
+        self.version += 1
+        self._notify(None)
+
+    def set_cell(self, x, y, value):
+        """Set cell (x, y) to 0 (free) or 1 (wall) and notify listeners"""
+        self.apply_edits([(x, y, value)])
+
+    def apply_edits(self, edits):
+        """Apply a batch of (x, y, value) cell edits as one change
+
+        Listeners are notified once with the cells that actually changed,
+        as (index, old, new) triples, which is what incremental planners
+        consume. Returns that list.
+        """
+        changes = []
+        for x, y, value in edits:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError(f"({x}, {y}) is outside the maze")
+            i = y * self.width + x
+            old = self.cells[i]
+            if old != value:
+                self.cells[i] = value
+                changes.append((i, old, value))
+        if changes:
+            self._masks.refresh(i for i, _, _ in changes)
+            self.version += 1
+            self._notify(changes)
+        return changes
+
+    def add_listener(self, callback):
+        """Call callback(maze, edits) after every change
+
+        ``edits`` is a list of (index, old, new) cell changes, or None when
+        the whole maze may have changed (e.g. a new cost layer).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, edits):
+        for callback in list(self._listeners):
+            callback(self, edits)
+
+    def cost(self, i):
+        """Cost of stepping into cell i"""
+        return self.costs[i] if self.costs is not None else 1
+
+    def weighted_neighbors(self, i):
+        """(neighbour index, step cost) pairs for cell i"""
+        costs = self.costs
+        if self.neighborhood.uniform:
+            if costs is None:
+                return [(j, 1) for j in self.neighbors(i)]
+            return [(j, costs[j]) for j in self.neighbors(i)]
+        if costs is None:
+            return self.moves(i)
+        return [(j, length * costs[j]) for j, length in self.moves(i)]
+
+    def predecessors(self, i):
+        """(neighbour index, cost of stepping from it into i) pairs for cell i
+
+        Every move has its reverse, so these are the cells that can step
+        into i, which is what backward searches expand.
+        """
+        step = self.costs[i] if self.costs is not None else 1
+        if self.neighborhood.uniform:
+            return [(j, step) for j in self.neighbors(i)]
+        return [(j, length * step) for j, length in self.moves(i)]
+
+    def path_cost(self, path):
+        """Total cost of a tuple path (the start cell is free)"""
+        nb = self.neighborhood
+        if nb.uniform:
+            if self.costs is None:
+                return max(len(path) - 1, 0)
+            return sum(self.costs[self.index(p)] for p in path[1:])
+        total = 0
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            total += nb.length(x2 - x1, y2 - y1) * self.cost(y2 * self.width + x2)
+        return total
+
+    def adjacent(self, i):
+        """In-bounds cells whose moves depend on cell i, walls included
+
+        With the default 4-neighbourhood these are the cells next to i,
+        in up, down, left, right order.
+        """
+        w = self.width
+        y, x = divmod(i, w)
+        return [(y + dy) * w + x + dx for dx, dy in self._masks.influence
+                if 0 <= x + dx < w and 0 <= y + dy < self.height]
+
+    def new_visited(self):
+        """Visited set as one byte per cell"""
+        return bytearray(self.size)
+
+    def new_parents(self):
+        """Parent array, -1 meaning no parent"""
+        return array('i', [-1]) * self.size
+
+    def scratch(self):
+        """Shared SearchScratch for this maze, created on first use"""
+        if self._scratch is None:
+            self._scratch = SearchScratch(self.size)
+        return self._scratch
+
+    def with_endpoints(self, start, goal):
+        """Shallow copy with another start/goal; cells and costs are shared"""
+        view = copy.copy(self)
+        view.start = tuple(start)
+        view.goal = tuple(goal)
+        return view
+
+    def path_from(self, parent, i):
+        """Walk a parent array back from index i and return (x, y) tuples"""
+        path = []
+        while i != -1:
+            path.append(self.pos(i))
+            i = parent[i]
+        return path[::-1]
+
+
+def __getattr__(name):
+    # MazeVisualizer lives in visualizer.py so that importing maze does
+    # not pull in matplotlib; ``from maze import MazeVisualizer`` still works.
+    if name == "MazeVisualizer":
+        from visualizer import MazeVisualizer
+        return MazeVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,221 @@
+import mmap
+import struct
+from array import array
+
+from maze import Maze
+from neighborhoods import SQRT2
+
+# =========================
+# Binary Format
+# =========================
+# Little-endian, 64-byte header:
+#   magic "MZPF", version u16, flags u16, width u32, height u32,
+#   start x/y u32, goal x/y u32, zero padding.
+# Body: one byte per cell (0 free, 1 wall), or with FLAG_PACKED one bit per
+# cell, least significant bit first. With FLAG_COSTS a float32 cost layer
+# follows, starting on the next 4-byte boundary.
+MAGIC = b"MZPF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIII")
+HEADER_SIZE = 64
+FLAG_COSTS = 1
+FLAG_PACKED = 2
+
+_UNPACK = [bytes((b >> bit) & 1 for bit in range(8)) for b in range(256)]
+_PACK = {cells: b for b, cells in enumerate(_UNPACK)}
+
+
+def _align4(n):
+    return (n + 3) & ~3
+
+
+def _pack_bits(cells):
+    padded = bytes(cells) + bytes(-len(cells) % 8)
+    return bytes(_PACK[padded[i:i + 8]] for i in range(0, len(padded), 8))
+
+
+def save(maze, path, packed=False):
+    """Write maze (cells, endpoints and any cost layer) in the binary format"""
+    flags = (FLAG_COSTS if maze.costs is not None else 0) | (FLAG_PACKED if packed else 0)
+    body = _pack_bits(maze.cells) if packed else bytes(maze.cells)
+    header = HEADER.pack(MAGIC, VERSION, flags, maze.width, maze.height,
+                         maze.start[0], maze.start[1], maze.goal[0], maze.goal[1])
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(body)
+        if maze.costs is not None:
+            f.write(b"\0" * (_align4(HEADER_SIZE + len(body)) - HEADER_SIZE - len(body)))
+            f.write(memoryview(maze.costs).cast("B"))
+
+
+def load(path, use_mmap=True):
+    """Read a binary maze; byte-per-cell files are memory-mapped
+
+    With ``use_mmap`` the cells and cost layer are views straight into a
+    copy-on-write mapping of the file: nothing is copied at load time and
+    every process mapping the same file shares one page-cache copy until
+    it edits a cell. Bit-packed bodies are always unpacked into memory.
+    """
+    with open(path, "rb") as f:
+        if use_mmap:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        else:
+            data = memoryview(bytearray(f.read()))
+
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{path}: too short to be a maze file")
+    magic, version, flags, width, height, sx, sy, gx, gy = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a maze file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported format version {version}")
+
+    size = width * height
+    body_size = (size + 7) // 8 if flags & FLAG_PACKED else size
+    body = data[HEADER_SIZE:HEADER_SIZE + body_size]
+    if len(body) != body_size:
+        raise ValueError(f"{path}: truncated cell data")
+    if flags & FLAG_PACKED:
+        cells = bytearray(b"".join(_UNPACK[b] for b in body)[:size])
+    else:
+        cells = body
+
+    costs = None
+    if flags & FLAG_COSTS:
+        offset = _align4(HEADER_SIZE + body_size)
+        costs = data[offset:offset + 4 * size]
+        if len(costs) != 4 * size:
+            raise ValueError(f"{path}: truncated cost layer")
+        costs = costs.cast("f")
+    return Maze.from_cells(width, height, cells, start=(sx, sy), goal=(gx, gy), costs=costs)
+
+
+# =========================
+# ASCII Mazes
+# =========================
+# '#' wall, '.' or ' ' free, 'S' start, 'G' goal, digits 2-9 free cells
+# with that step cost. The format is lossy for cost layers: costs are
+# rounded into 1-9, and the start's cost (which no path from it pays) is
+# dropped. A goal cost other than 1 cannot be written at all.
+def parse_ascii(text):
+    rows = [line.rstrip("\n") for line in text.splitlines() if line.strip()]
+    if not rows:
+        raise ValueError("empty ASCII maze")
+    width, height = max(len(r) for r in rows), len(rows)
+    cells = bytearray(width * height)
+    costs = None
+    start = goal = None
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row.ljust(width, "#")):
+            i = y * width + x
+            if ch == "#":
+                cells[i] = 1
+            elif ch == "S":
+                start = (x, y)
+            elif ch == "G":
+                goal = (x, y)
+            elif ch in "23456789":
+                if costs is None:
+                    costs = array("f", [1.0]) * (width * height)
+                costs[i] = int(ch)
+            elif ch not in ". 1":
+                raise ValueError(f"unexpected character {ch!r} at ({x}, {y})")
+    return Maze.from_cells(width, height, cells, start=start or (0, 0), goal=goal, costs=costs)
+
+
+def to_ascii(maze):
+    goal = maze.index(maze.goal)
+    if maze.costs is not None and maze.costs[goal] != 1:
+        raise ValueError(f"ASCII mazes cannot hold the goal's cost of {maze.costs[goal]:g}")
+    lines = []
+    for y in range(maze.height):
+        row = []
+        for x in range(maze.width):
+            i = y * maze.width + x
+            if (x, y) == maze.start:
+                row.append("S")
+            elif (x, y) == maze.goal:
+                row.append("G")
+            elif maze.cells[i]:
+                row.append("#")
+            elif maze.costs is not None and maze.costs[i] != 1:
+                row.append(str(min(max(int(round(maze.costs[i])), 2), 9)))
+            else:
+                row.append(".")
+        lines.append("".join(row))
+    return "\n".join(lines) + "\n"
+
+
+def load_ascii(path):
+    with open(path) as f:
+        return parse_ascii(f.read())
+
+
+def save_ascii(maze, path):
+    with open(path, "w") as f:
+        f.write(to_ascii(maze))
+
+
+# =========================
+# MovingAI .map Files
+# =========================
+# Grid benchmark format from movingai.com/benchmarks: '.', 'G' and 'S'
+# are passable, '@', 'O', 'T' and 'W' are not. Endpoints live in separate
+# .scen files, so start and goal default to the first and last free cell.
+# "type octile" maps are 8-connected without corner cutting; maps of any
+# other type load 4-connected.
+_MOVINGAI_FREE = set(".GS")
+
+
+def load_movingai(path, start=None, goal=None, neighborhood=None):
+    """Read a .map file; ``neighborhood`` overrides what its type says"""
+    with open(path) as f:
+        lines = f.read().splitlines()
+    header = {}
+    k = 0
+    while k < len(lines) and lines[k].strip() != "map":
+        parts = lines[k].split()
+        if len(parts) == 2:
+            header[parts[0]] = parts[1]
+        k += 1
+    try:
+        width, height = int(header["width"]), int(header["height"])
+    except KeyError:
+        raise ValueError(f"{path}: missing width/height header") from None
+    rows = lines[k + 1:k + 1 + height]
+    if len(rows) != height:
+        raise ValueError(f"{path}: expected {height} map rows, found {len(rows)}")
+
+    cells = bytearray(b"\x01") * (width * height)
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row[:width]):
+            if ch in _MOVINGAI_FREE:
+                cells[y * width + x] = 0
+
+    if neighborhood is None:
+        neighborhood = "8" if header.get("type") == "octile" else "4"
+    maze = Maze.from_cells(width, height, cells, neighborhood=neighborhood)
+    free = cells.find(0)
+    if free != -1:
+        maze.start = tuple(start) if start else maze.pos(free)
+        maze.goal = tuple(goal) if goal else maze.pos(cells.rfind(0))
+    return maze
+
+
+def save_movingai(maze, path):
+    """Write the walls as a .map file typed after the maze's neighbourhood
+
+    Cost layers and endpoints are not part of the format.
+    """
+    nb = maze.neighborhood
+    if nb.kind == "4" and nb.uniform:
+        kind = "four"
+    elif nb.kind == "8" and nb.corners == "no_cut" and nb.length(1, 1) == SQRT2:
+        kind = "octile"
+    else:
+        raise ValueError(f"{nb.name} movement has no MovingAI map type")
+    with open(path, "w") as f:
+        f.write(f"type {kind}\nheight {maze.height}\nwidth {maze.width}\nmap\n")
+        for y in range(maze.height):
+            row = maze.cells[y * maze.width:(y + 1) * maze.width]
+            f.write("".join("@" if c else "." for c in row) + "\n")
@@ -0,0 +1,256 @@
+import heapq
+import time
+from array import array
+
+import flood
+
+NEVER = 0x7FFFFFFF
+EMPTY = -1
+
+
+# =========================
+# Reservation Table
+# =========================
+class ReservationTable:
+    """Which agent holds each (cell, time step), in flat arrays
+
+    Moving reservations live in one open-addressing hash table. Keys pack
+    ``time * size + cell`` into an array('q'), and the holding agent sits
+    in a parallel array('i'). Probing is linear, and the table doubles
+    once it is half full, so a reservation costs at most 24 bytes. A dict
+    of tuples costs roughly 200.
+
+    An agent that has reached its goal stays there. That cell is kept in
+    two per-cell arrays (from which step, by whom) instead of one entry
+    per remaining step. ``last`` is the latest step any moving agent
+    holds each cell: an agent may only stop on a cell that nobody will
+    pass through later.
+    """
+    def __init__(self, size, capacity=1 << 12):
+        self.size = size
+        self.used = 0
+        self._allocate(capacity)
+        self.parked_from = array('i', [NEVER]) * size
+        self.parked_agent = array('i', [EMPTY]) * size
+        self.last = array('i', [-1]) * size
+
+    def _allocate(self, capacity):
+        self.keys = array('q', [EMPTY]) * capacity
+        self.agents = array('i', [EMPTY]) * capacity
+        self.mask = capacity - 1
+
+    def _slot(self, key):
+        keys, mask = self.keys, self.mask
+        i = ((key * 2654435761) >> 16) & mask
+        while keys[i] != EMPTY and keys[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def _grow(self):
+        keys, agents = self.keys, self.agents
+        self._allocate(2 * len(keys))
+        for key, agent in zip(keys, agents):
+            if key != EMPTY:
+                i = self._slot(key)
+                self.keys[i] = key
+                self.agents[i] = agent
+
+    def reserve(self, cell, t, agent):
+        if 2 * (self.used + 1) > len(self.keys):
+            self._grow()
+        key = t * self.size + cell
+        i = self._slot(key)
+        if self.keys[i] == EMPTY:
+            self.used += 1
+        self.keys[i] = key
+        self.agents[i] = agent
+        if t > self.last[cell]:
+            self.last[cell] = t
+
+    def park(self, cell, t, agent):
+        """agent occupies cell from step t onwards"""
+        self.parked_from[cell] = t
+        self.parked_agent[cell] = agent
+
+    def holder(self, cell, t):
+        """Agent holding cell at step t, or -1"""
+        if t >= self.parked_from[cell]:
+            return self.parked_agent[cell]
+        i = self._slot(t * self.size + cell)
+        return self.agents[i] if self.keys[i] != EMPTY else EMPTY
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (
+            self.keys, self.agents, self.parked_from, self.parked_agent, self.last))
+
+
+# =========================
+# Cooperative Planner
+# =========================
+class CooperativeAStar:
+    """Prioritized cooperative A* for many agents on one Maze
+
+    Agents are planned one at a time, in priority order. Each runs A* in
+    space-time: a state is (cell, step), and an agent may move to a free
+    neighbour or wait, at one step each. States held in the shared
+    ReservationTable are skipped, and so are swaps with the agent coming
+    the other way. The agent's path is then reserved for everyone after
+    it. Once an agent reaches its goal it stays there, and later agents
+    route around it.
+
+    Agents whose start and goal lie in different connected components
+    fail at once. The heuristic is the exact maze distance to the agent's
+    goal, one vectorized ``flood.distance_field`` per agent. That field's
+    buffer, the open heap, the closed set and the parent map are reused
+    between agents rather than reallocated. Cell costs are ignored: every
+    move or wait takes one step. ``horizon`` caps the step count, and
+    ``max_expansions`` caps the work spent on any one agent.
+    """
+    def __init__(self, maze, horizon=None, max_expansions=200_000):
+        self.maze = maze
+        self.horizon = horizon if horizon is not None else 4 * (maze.width + maze.height)
+        self.max_expansions = max_expansions
+        self.components = flood.Components(maze)
+        self._distance = array('i')
+        self._open = []
+        self._closed = set()
+        self._parent = {}
+
+    def plan(self, agents, priority="given"):
+        """Plan collision-free paths for a list of (start, goal) agents
+
+        ``priority`` is "given" (list order) or "longest_first" (farthest
+        start-goal pairs plan first, which usually fails less often).
+        Returns a dict with one path per agent (an (x, y) per step, [] if
+        the agent could not be planned), the failed agent numbers,
+        makespan, sum of costs, total and per-agent planning time and
+        expansions, and the reservation table's size. Failed agents hold
+        no reservations, so the others may plan through their cells.
+        """
+        maze = self.maze
+        order = list(range(len(agents)))
+        if priority == "longest_first":
+            order.sort(key=lambda k: -(abs(agents[k][0][0] - agents[k][1][0]) +
+                                       abs(agents[k][0][1] - agents[k][1][1])))
+        elif priority != "given":
+            raise ValueError(f"unknown priority {priority!r}")
+
+        t0 = time.perf_counter_ns()
+        table = ReservationTable(maze.size)
+        paths = [[] for _ in agents]
+        per_agent = [None] * len(agents)
+        failed = []
+        for agent in order:
+            start, goal = agents[agent]
+            a0 = time.perf_counter_ns()
+            cells, expanded = self._plan_agent(maze.index(start), maze.index(goal), table)
+            if cells:
+                for t, cell in enumerate(cells):
+                    table.reserve(cell, t, agent)
+                table.park(cells[-1], len(cells) - 1, agent)
+                paths[agent] = [maze.pos(i) for i in cells]
+            else:
+                failed.append(agent)
+            per_agent[agent] = {
+                "expanded": expanded,
+                "planning_ms": (time.perf_counter_ns() - a0) / 1_000_000,
+            }
+
+        lengths = [len(p) - 1 for p in paths if p]
+        return {
+            "paths": paths,
+            "failed": sorted(failed),
+            "makespan": max(lengths, default=0),
+            "sum_of_costs": sum(lengths),
+            "planning_ms": (time.perf_counter_ns() - t0) / 1_000_000,
+            "expanded": sum(a["expanded"] for a in per_agent),
+            "agents": per_agent,
+            "reservations": table.used,
+            "table_kb": table.nbytes() / 1024,
+        }
+
+    def _plan_agent(self, start, goal, table):
+        """Space-time A*; returns (cell per step from start to goal, expansions)"""
+        maze = self.maze
+        size = maze.size
+        horizon = self.horizon
+        if table.holder(start, 0) != EMPTY or not self.components.connected(maze.pos(start), maze.pos(goal)):
+            return [], 0
+        distance = self._distance
+        del distance[:]
+        distance.frombytes(flood.distance_field(maze, maze.pos(goal)).tobytes())
+        h = distance[start]
+
+        open_list, closed, parent = self._open, self._closed, self._parent
+        del open_list[:]
+        closed.clear()
+        parent.clear()
+        parent[start] = -1
+        settle = table.last[goal] + 1
+        open_list.append((max(h, settle), 0, h, start))
+        expanded = 0
+
+        while open_list and expanded < self.max_expansions:
+            _, neg_t, _, key = heapq.heappop(open_list)
+            if key in closed:
+                continue
+            closed.add(key)
+            expanded += 1
+            t = -neg_t
+            cell = key - t * size
+            if cell == goal and table.last[goal] < t:
+                cells = []
+                while key != -1:
+                    cells.append(key % size)
+                    key = parent[key]
+                return cells[::-1], expanded
+            if t >= horizon:
+                continue
+
+            nt = t + 1
+            moves = maze.neighbors(cell)
+            moves.append(cell)
+            for n in moves:
+                next_key = nt * size + n
+                if next_key in parent or table.holder(n, nt) != EMPTY:
+                    continue
+                if n != cell:
+                    # Two agents may not swap cells through each other
+                    other = table.holder(n, t)
+                    if other != EMPTY and other == table.holder(cell, nt):
+                        continue
+                h = distance[n]
+                parent[next_key] = key
+                # The agent cannot stop before the goal's last reservation
+                # ends; ties go to the later step, then the nearer cell.
+                heapq.heappush(open_list, (max(nt + h, settle), -nt, h, next_key))
+        return [], expanded
+
+
+def find_conflicts(paths):
+    """Vertex and swap conflicts between timed paths, as (step, a, b) tuples
+
+    Paths are lists of (x, y) per step, and an agent stays on its last
+    cell afterwards. Agents with an empty path are ignored.
+    """
+    live = [(k, p) for k, p in enumerate(paths) if p]
+    makespan = max((len(p) for _, p in live), default=0)
+    conflicts = []
+    for t in range(makespan):
+        seen = {}
+        for k, p in live:
+            here = p[min(t, len(p) - 1)]
+            if here in seen:
+                conflicts.append((t, seen[here], k))
+            seen[here] = k
+        if t == 0:
+            continue
+        moves = {}
+        for k, p in live:
+            a, b = p[min(t - 1, len(p) - 1)], p[min(t, len(p) - 1)]
+            if a != b:
+                other = moves.get((b, a))
+                if other is not None:
+                    conflicts.append((t, other, k))
+                moves[(a, b)] = k
+    return conflicts
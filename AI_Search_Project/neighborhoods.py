@@ -0,0 +1,299 @@
+import math
+import sys
+from array import array
+from functools import partial
+
+SQRT2 = math.sqrt(2)
+
+ROOK_MOVES = ((0, -1), (0, 1), (-1, 0), (1, 0))
+KING_MOVES = ROOK_MOVES + ((-1, -1), (1, -1), (-1, 1), (1, 1))
+
+# How a diagonal step may pass the two cells beside it:
+# "cut" ignores them, "no_squeeze" needs one of them free, "no_cut" both.
+CORNER_RULES = ("cut", "no_squeeze", "no_cut")
+
+MAX_MOVES = 16
+
+# Grids smaller than this build their masks in pure Python, which takes
+# less time than importing NumPy would
+NUMPY_MIN_CELLS = 10_000
+
+
+# =========================
+# Heuristics
+# =========================
+def manhattan(dx, dy):
+    return abs(dx) + abs(dy)
+
+
+def chebyshev(dx, dy):
+    return max(abs(dx), abs(dy))
+
+
+def octile(dx, dy):
+    dx, dy = abs(dx), abs(dy)
+    return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
+
+def euclidean(dx, dy):
+    return math.hypot(dx, dy)
+
+
+def scaled_euclidean(scale, dx, dy):
+    return scale * math.hypot(dx, dy)
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "chebyshev": chebyshev,
+    "octile": octile,
+    "euclidean": euclidean,
+}
+
+
+# =========================
+# Neighbourhood Model
+# =========================
+class Neighborhood:
+    """The moves a cell allows: offsets, step lengths, corner rule, heuristic
+
+    ``moves`` is a list of (dx, dy) offsets. It must contain the reverse
+    of every move, so searches can run backwards over the same edges. A
+    step into a cell costs the move's length times the cell's cost.
+    Lengths default to the Euclidean length of each move.
+
+    ``corners`` applies to unit diagonal moves and is one of
+    ``CORNER_RULES``. ``heuristic`` names an entry of ``HEURISTICS``. By
+    default it is the tightest admissible one: Manhattan for the four
+    rook moves, octile (or Chebyshev with unit diagonals) for the eight
+    king moves, and otherwise the Euclidean distance scaled by the
+    smallest length-per-distance ratio among the moves.
+    """
+    def __init__(self, moves, corners="no_cut", lengths=None, heuristic=None, name=None):
+        moves = tuple((int(dx), int(dy)) for dx, dy in moves)
+        if not moves or len(set(moves)) != len(moves) or (0, 0) in moves:
+            raise ValueError("moves must be distinct non-zero (dx, dy) offsets")
+        if len(moves) > MAX_MOVES:
+            raise ValueError(f"at most {MAX_MOVES} moves are supported")
+        if any((-dx, -dy) not in moves for dx, dy in moves):
+            raise ValueError("every move needs its reverse move")
+        if corners not in CORNER_RULES:
+            raise ValueError(f"unknown corner rule {corners!r}, choose from {CORNER_RULES}")
+        if lengths is None:
+            lengths = [math.hypot(dx, dy) for dx, dy in moves]
+        if len(lengths) != len(moves) or min(lengths) <= 0:
+            raise ValueError("need one positive length per move")
+
+        self.moves = moves
+        # Whole lengths stay ints so unit-cost paths keep integer costs
+        self.lengths = tuple(int(l) if l == int(l) else float(l) for l in lengths)
+        self.corners = corners
+        self.radius = max(max(abs(dx), abs(dy)) for dx, dy in moves)
+        self.uniform = all(l == 1 for l in self.lengths)
+        self._length = dict(zip(moves, self.lengths))
+        self._max_reach = max(math.hypot(dx, dy) for dx, dy in moves)
+
+        shape = set(moves)
+        if shape == set(ROOK_MOVES):
+            self.kind = "4"
+        elif shape == set(KING_MOVES):
+            self.kind = "8"
+        else:
+            self.kind = "custom"
+        self.name = name or (f"{self.kind}-connected" if self.kind != "custom" else "custom")
+
+        if heuristic is None:
+            self.heuristic, self.metric = self._default_metric()
+        else:
+            if heuristic not in HEURISTICS:
+                raise ValueError(f"unknown heuristic {heuristic!r}, choose from {sorted(HEURISTICS)}")
+            self.heuristic = heuristic
+            self.metric = HEURISTICS[heuristic]
+
+    def _default_metric(self):
+        length = self._length
+        if self.kind == "4" and all(length[m] == 1 for m in ROOK_MOVES):
+            return "manhattan", manhattan
+        if self.kind == "8" and all(length[m] == 1 for m in ROOK_MOVES):
+            diagonal = {length[m] for m in KING_MOVES[4:]}
+            if diagonal == {1}:
+                return "chebyshev", chebyshev
+            if diagonal == {SQRT2}:
+                return "octile", octile
+        scale = min(l / math.hypot(dx, dy) for (dx, dy), l in length.items())
+        if scale == 1:
+            return "euclidean", euclidean
+        return f"euclidean x{scale:g}", partial(scaled_euclidean, scale)
+
+    def __repr__(self):
+        return f"Neighborhood({self.name}, corners={self.corners!r}, heuristic={self.heuristic!r})"
+
+    def distance(self, a, b):
+        """Admissible estimate of the cheapest unit-cost route from a to b"""
+        return self.metric(a[0] - b[0], a[1] - b[1])
+
+    def length(self, dx, dy):
+        """Length of the move (dx, dy); KeyError if it is not a move"""
+        return self._length[(dx, dy)]
+
+    def min_moves(self, dx, dy):
+        """Lower bound on the number of moves that cover (dx, dy)"""
+        if self.kind == "4":
+            return abs(dx) + abs(dy)
+        if self.radius == 1:
+            return max(abs(dx), abs(dy))
+        return math.ceil(math.hypot(dx, dy) / self._max_reach - 1e-9)
+
+    def corner_sides(self, dx, dy):
+        """The two side offsets the corner rule checks for move (dx, dy), or None"""
+        if self.corners == "cut" or abs(dx) != 1 or abs(dy) != 1:
+            return None
+        return (dx, 0), (0, dy)
+
+    def influence(self):
+        """Offsets of the cells whose moves depend on the cell at (0, 0)
+
+        A cell's moves depend on its move targets and, under a corner
+        rule, on the side cells of its diagonal moves.
+        """
+        needed = set()
+        for dx, dy in self.moves:
+            for ox, oy in ((dx, dy),) + (self.corner_sides(dx, dy) or ()):
+                needed.add((-ox, -oy))
+        return [m for m in self.moves if m in needed] + sorted(needed.difference(self.moves))
+
+    def move_table(self, width, with_lengths=False):
+        """Flat moves allowed by each mask value on a grid of this width
+
+        Entry ``m`` lists, in move order, the index offsets (or
+        (offset, length) pairs) whose bit is set in ``m``.
+        """
+        flat = [dy * width + dx for dx, dy in self.moves]
+        entries = list(zip(flat, self.lengths)) if with_lengths else flat
+        if len(flat) <= 8:
+            return [tuple(e for k, e in enumerate(entries) if m >> k & 1) for m in range(1 << len(flat))]
+        return _LazyMoveTable(entries)
+
+
+class _LazyMoveTable(dict):
+    """Mask -> moves lookup built per mask value on first use (over 8 moves)"""
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = entries
+
+    def __missing__(self, m):
+        moves = tuple(e for k, e in enumerate(self.entries) if m >> k & 1)
+        self[m] = moves
+        return moves
+
+
+FOUR = Neighborhood(ROOK_MOVES)
+EIGHT = Neighborhood(KING_MOVES)
+
+
+def eight_connected(corners="no_cut", diagonal_cost=SQRT2):
+    """King moves with the given corner rule; diagonal_cost is sqrt(2) or 1"""
+    if diagonal_cost not in (SQRT2, 1):
+        raise ValueError("diagonal_cost must be sqrt(2) (octile) or 1 (Chebyshev)")
+    return Neighborhood(KING_MOVES, corners, lengths=[1] * 4 + [diagonal_cost] * 4)
+
+
+def get_neighborhood(spec):
+    """Resolve None/4/"4", 8/"8", a Neighborhood or a list of moves"""
+    if spec is None or spec in (4, "4"):
+        return FOUR
+    if spec in (8, "8"):
+        return EIGHT
+    if isinstance(spec, Neighborhood):
+        return spec
+    if isinstance(spec, (str, int)):
+        raise ValueError(f"unknown neighbourhood {spec!r}, use 4, 8, a Neighborhood or a list of moves")
+    return Neighborhood(spec)
+
+
+# =========================
+# Per-Cell Move Masks
+# =========================
+class NeighborMasks:
+    """Bit k of ``bits[i]`` is set when cell i may take move k
+
+    A move is allowed when its target is inside the grid and free and the
+    corner rule is met. The cell's own state does not matter, so the
+    moves of a wall are the ones it would have if it were free. The
+    masks are built on first use (vectorized with NumPy when it is
+    installed), and ``refresh`` redoes the cells around edited ones.
+    """
+    def __init__(self, neighborhood, cells, width, height):
+        self.neighborhood = neighborhood
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.bits = None
+        self._rules = [(dx, dy, neighborhood.corner_sides(dx, dy)) for dx, dy in neighborhood.moves]
+        self.influence = neighborhood.influence()
+
+    def build(self):
+        """Compute every cell's mask and return the mask buffer"""
+        nb = self.neighborhood
+        w, h = self.width, self.height
+        np = None
+        if w * h >= NUMPY_MIN_CELLS or "numpy" in sys.modules:
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+        if np is not None:
+            r = nb.radius
+            free = np.zeros((h + 2 * r, w + 2 * r), dtype=bool)
+            free[r:r + h, r:r + w] = np.frombuffer(self.cells, dtype=np.uint8).reshape(h, w) == 0
+            dtype = np.uint8 if len(nb.moves) <= 8 else np.uint16
+            bits = np.zeros((h, w), dtype=dtype)
+            for k, (dx, dy, sides) in enumerate(self._rules):
+                ok = free[r + dy:r + dy + h, r + dx:r + dx + w].copy()
+                if sides is not None:
+                    a = free[r:r + h, r + dx:r + dx + w]
+                    b = free[r + dy:r + dy + h, r:r + w]
+                    ok &= (a & b) if nb.corners == "no_cut" else (a | b)
+                bits |= ok.astype(dtype) << k
+            if dtype == np.uint8:
+                self.bits = bytearray(bits.tobytes())
+            else:
+                self.bits = array('H')
+                self.bits.frombytes(bits.tobytes())
+            return self.bits
+
+        bits = bytearray(w * h) if len(nb.moves) <= 8 else array('H', [0]) * (w * h)
+        for y in range(h):
+            for x in range(w):
+                bits[y * w + x] = self._cell_mask(x, y)
+        self.bits = bits
+        return bits
+
+    def _cell_mask(self, x, y):
+        cells, w, h = self.cells, self.width, self.height
+        no_cut = self.neighborhood.corners == "no_cut"
+        mask = 0
+        for k, (dx, dy, sides) in enumerate(self._rules):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < w and 0 <= ny < h) or cells[ny * w + nx]:
+                continue
+            if sides is not None:
+                a = not cells[y * w + nx]
+                b = not cells[ny * w + x]
+                if not ((a and b) if no_cut else (a or b)):
+                    continue
+            mask |= 1 << k
+        return mask
+
+    def refresh(self, indices):
+        """Recompute the masks that depend on the given (edited) cells"""
+        bits = self.bits
+        if bits is None:
+            return
+        w, h = self.width, self.height
+        for i in indices:
+            y, x = divmod(i, w)
+            for dx, dy in self.influence:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h:
+                    bits[ny * w + nx] = self._cell_mask(nx, ny)
@@ -0,0 +1,216 @@
+import heapq
+from array import array
+
+import flood
+
+INF = float('inf')
+
+
+# =========================
+# Distance Fields
+# =========================
+class DistanceField:
+    """Cheapest-path cost between one source cell and every other cell
+
+    With ``toward=False`` the field holds the cost from the source to each
+    cell (a landmark flood); with ``toward=True`` it holds the cost from
+    each cell to the source (a fixed-goal flood). Mazes where every step
+    costs 1 use the vectorized wavefront in ``flood``, others Dijkstra. Paths are read back by
+    walking downhill through the field, which costs O(path length).
+    """
+    def __init__(self, maze, source, toward=False):
+        self.maze = maze
+        self.source = tuple(source)
+        self.toward = toward
+        self.dist = self._build(maze.index(self.source))
+
+    def _build(self, source):
+        maze = self.maze
+        if maze.costs is None and maze.neighborhood.uniform:
+            steps = flood.distance_field(maze, maze.pos(source))
+            dist = array('d')
+            if flood.np is not None:
+                dist.frombytes(flood.np.where(steps < 0, INF, steps).astype('d').tobytes())
+            else:
+                dist.extend(INF if s < 0 else s for s in steps)
+            return dist
+
+        dist = array('d', [INF]) * maze.size
+        dist[source] = 0
+
+        frontier = [(0, source)]
+        while frontier:
+            d, current = heapq.heappop(frontier)
+            if d > dist[current]:
+                continue
+            # Walking toward the source, leaving a cell costs what entering
+            # it did on the forward route.
+            edges = maze.predecessors(current) if self.toward else maze.weighted_neighbors(current)
+            for neighbor, step in edges:
+                new_d = d + step
+                if new_d < dist[neighbor]:
+                    dist[neighbor] = new_d
+                    heapq.heappush(frontier, (new_d, neighbor))
+        return dist
+
+    def distance(self, pos):
+        return self.dist[self.maze.index(pos)]
+
+    def reachable(self, pos):
+        return self.dist[self.maze.index(pos)] != INF
+
+    def path(self, pos):
+        """Path between pos and the source, always ordered start to goal
+
+        For a ``toward`` field that is pos -> source, otherwise
+        source -> pos. Returns [] when pos cannot reach the source.
+        """
+        maze = self.maze
+        dist = self.dist
+        current = maze.index(pos)
+        if dist[current] == INF:
+            return []
+
+        cells = [current]
+        while dist[current] > 0:
+            best = None
+            best_value = INF
+            # Toward the source: the step out of current; away from it:
+            # the step that entered current
+            edges = maze.weighted_neighbors(current) if self.toward else maze.predecessors(current)
+            for neighbor, step in edges:
+                value = dist[neighbor] + step
+                if value < best_value:
+                    best, best_value = neighbor, value
+            current = best
+            cells.append(current)
+
+        if not self.toward:
+            cells.reverse()
+        return [maze.pos(i) for i in cells]
+
+
+# =========================
+# Query Engine
+# =========================
+class QueryEngine:
+    """Answers many start/goal queries against one static Maze
+
+    ``solve(start, goal)`` never touches ``maze.start``/``maze.goal``. It
+    answers from a precomputed distance field when one is anchored at the
+    query's goal or start, otherwise it runs A* on the maze's shared
+    SearchScratch, so a query allocates nothing per cell. Precomputed
+    fields are dropped once the maze version changes. After
+    ``add_components`` a query whose endpoints lie in different connected
+    components returns [] at once, before any search.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self.scratch = maze.scratch()
+        self.goal_fields = {}
+        self.source_fields = {}
+        self.version = maze.version
+        self.components = None
+        self.explored_nodes = 0
+
+    def add_goal_field(self, goal):
+        """Precompute distances to goal for O(path) answers to that goal"""
+        goal = tuple(goal)
+        self.goal_fields[goal] = DistanceField(self.maze, goal, toward=True)
+        return self.goal_fields[goal]
+
+    def add_landmark_field(self, landmark):
+        """Precompute distances from landmark for queries starting there"""
+        landmark = tuple(landmark)
+        self.source_fields[landmark] = DistanceField(self.maze, landmark)
+        return self.source_fields[landmark]
+
+    def add_components(self):
+        """Label connected components so unreachable queries fail in O(1)"""
+        self.components = flood.Components(self.maze)
+        return self.components
+
+    def _check(self, pos):
+        x, y = pos
+        if not (0 <= x < self.maze.width and 0 <= y < self.maze.height):
+            raise ValueError(f"{pos} is outside the {self.maze.width}x{self.maze.height} maze")
+
+    def solve(self, start, goal, solver=None):
+        """Path from start to goal as (x, y) tuples, [] if there is none
+
+        Passing one of the ``algorithms`` solvers runs it on a view of the
+        maze with these endpoints instead of the built-in A*.
+        """
+        start, goal = tuple(start), tuple(goal)
+        self._check(start)
+        self._check(goal)
+        if self.version != self.maze.version:
+            self.goal_fields.clear()
+            self.source_fields.clear()
+            self.version = self.maze.version
+
+        if self.components is not None and not self.components.connected(start, goal):
+            self.explored_nodes = 0
+            return []
+
+        if solver is not None:
+            path = solver.solve(self.maze.with_endpoints(start, goal))
+            self.explored_nodes = len(getattr(solver, 'explored_nodes', ()))
+            return path
+
+        field = self.goal_fields.get(goal)
+        if field is not None:
+            self.explored_nodes = 0
+            return field.path(start)
+        field = self.source_fields.get(start)
+        if field is not None:
+            self.explored_nodes = 0
+            return field.path(goal)
+        return self._astar(start, goal)
+
+    def _astar(self, start_pos, goal_pos):
+        maze = self.maze
+        scratch = self.scratch
+        generation = scratch.begin()
+        stamp, closed = scratch.stamp, scratch.closed
+        g_cost, parent = scratch.g, scratch.parent
+
+        start = maze.index(start_pos)
+        goal = maze.index(goal_pos)
+        width = maze.width
+        gy, gx = divmod(goal, width)
+        h_scale = maze.min_cost
+        metric = maze.neighborhood.metric
+        self.explored_nodes = 0
+        if maze.cells[start] or maze.cells[goal]:
+            return []
+
+        stamp[start] = generation
+        g_cost[start] = 0
+        parent[start] = -1
+        open_list = [(h_scale * metric(start % width - gx, start // width - gy), 0, start)]
+
+        while open_list:
+            _, current_g, current = heapq.heappop(open_list)
+            if current == goal:
+                path = []
+                while current != -1:
+                    path.append(maze.pos(current))
+                    current = parent[current]
+                return path[::-1]
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            self.explored_nodes += 1
+
+            for neighbor, step in maze.weighted_neighbors(current):
+                tentative_g = current_g + step
+                if stamp[neighbor] != generation or tentative_g < g_cost[neighbor]:
+                    stamp[neighbor] = generation
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    ny, nx = divmod(neighbor, width)
+                    f_cost = tentative_g + h_scale * metric(nx - gx, ny - gy)
+                    heapq.heappush(open_list, (f_cost, tentative_g, neighbor))
+
+        return []
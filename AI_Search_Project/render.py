@@ -0,0 +1,384 @@
+import os
+import shutil
+import subprocess
+import time
+
+import numpy as np
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+COLORS = {
+    'background': '#0a192f',
+    'wall': '#313338',
+    'free': '#f2f2f2',
+    'free_shade': '#e6e6e6',
+    'explored': '#4ecdc4',
+    'path': '#ff6b6b',
+    'mouse': '#8a8a8a',
+    'mouse_edge': '#ffffff',
+    'start': '#90be6d',
+    'goal': '#ffd700',
+    'text': 'white',
+}
+
+FORMATS = ("mp4", "gif", "png")
+
+
+def _rgba8(color, alpha=None):
+    r, g, b, a = to_rgba(color, alpha)
+    return np.array([r, g, b, a]) * 255
+
+
+def maze_image(maze, colors=COLORS):
+    """The maze as an (height, width, 3) uint8 array: one pixel per cell"""
+    cells = np.frombuffer(maze.cells, dtype=np.uint8).reshape(maze.height, maze.width)
+    y, x = np.indices(cells.shape)
+    image = np.empty(cells.shape + (3,), dtype=np.uint8)
+    image[...] = _rgba8(colors['free'])[:3]
+    # A faint checker keeps long corridors countable
+    image[(x + 2 * y) % 4 >= 2] = _rgba8(colors['free_shade'])[:3]
+    image[cells != 0] = _rgba8(colors['wall'])[:3]
+    return image
+
+
+# =========================
+# Frame Timing
+# =========================
+class FrameStats:
+    """Per-frame timings in milliseconds
+
+    ``update`` is the time spent changing the scene (painting cells,
+    moving the mouse), ``draw`` the blit that composes the frame and
+    ``write`` handing it to the exporter (0 when playing on screen).
+    """
+    def __init__(self):
+        self.update_ms = []
+        self.draw_ms = []
+        self.write_ms = []
+
+    def add(self, update_ns, draw_ns, write_ns=0):
+        self.update_ms.append(update_ns / 1_000_000)
+        self.draw_ms.append(draw_ns / 1_000_000)
+        self.write_ms.append(write_ns / 1_000_000)
+
+    def __len__(self):
+        return len(self.draw_ms)
+
+    def summary(self):
+        frames = sorted(u + d + w for u, d, w in zip(self.update_ms, self.draw_ms, self.write_ms))
+        if not frames:
+            return {"frames": 0}
+        total = sum(frames)
+        return {
+            "frames": len(frames),
+            "update_ms": sum(self.update_ms) / len(frames),
+            "draw_ms": sum(self.draw_ms) / len(frames),
+            "write_ms": sum(self.write_ms) / len(frames),
+            "p50_frame_ms": frames[len(frames) // 2],
+            "p90_frame_ms": frames[min(len(frames) - 1, int(0.9 * len(frames)))],
+            "max_frame_ms": frames[-1],
+            "fps": 1000 * len(frames) / total if total else float('inf'),
+        }
+
+
+# =========================
+# Frame Sinks
+# =========================
+class _FFmpegSink:
+    """Pipes raw RGBA frames into ffmpeg (MP4)"""
+    def __init__(self, path, fps, width, height):
+        ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found; install it or set "
+                               "matplotlib.rcParams['animation.ffmpeg_path']")
+        self.proc = subprocess.Popen([
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', '-',
+            # H.264 in yuv420p needs even dimensions
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path,
+        ], stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, rgba):
+        self.proc.stdin.write(rgba.tobytes())
+
+    def close(self):
+        self.proc.stdin.close()
+        error = self.proc.stderr.read().decode(errors='replace')
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {error.strip()}")
+
+
+class _GifSink:
+    """Collects palette frames and writes one animated GIF on close
+
+    GIF frames are held in memory (one byte per pixel) until the end;
+    use ``every`` or a lower ``dpi`` for long animations.
+    """
+    def __init__(self, path, fps):
+        from PIL import Image
+        self.image = Image
+        self.path = path
+        self.duration = max(20, round(1000 / fps))
+        self.frames = []
+
+    def write(self, rgba):
+        self.frames.append(self.image.fromarray(rgba[..., :3]).quantize(64))
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.path, save_all=True, append_images=self.frames[1:],
+                                duration=self.duration, loop=0)
+
+
+class _PngSink:
+    """Writes every frame as frame_00000.png, frame_00001.png, ... in a directory"""
+    def __init__(self, path):
+        from PIL import Image
+        self.image = Image
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.count = 0
+
+    def write(self, rgba):
+        name = os.path.join(self.path, f"frame_{self.count:05d}.png")
+        self.image.fromarray(rgba).save(name, compress_level=1)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def _open_sink(path, fps, width, height, fmt=None):
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower().lstrip('.')
+        fmt = ext if ext in ("mp4", "gif") else "png"
+    if fmt == "mp4":
+        return _FFmpegSink(path, fps, width, height)
+    if fmt == "gif":
+        return _GifSink(path, fps)
+    if fmt == "png":
+        return _PngSink(path)
+    raise ValueError(f"unknown export format {fmt!r}, choose from {FORMATS}")
+
+
+# =========================
+# Fast Renderer
+# =========================
+class FastRenderer:
+    """Draws a maze as one image and animates over it with blitting
+
+    The grid is a single ``imshow`` of a pixel-per-cell array, so drawing
+    it costs the same for a 20x12 maze as for a 2000x2000 one. Explored
+    and path cells are painted into a second, transparent image layer as
+    they arrive, and the mouse is one marker moved in place. A frame
+    restores the cached background and redraws only those animated
+    artists, so its cost does not grow with the path length.
+
+    With ``headless=True`` the figure lives on an Agg canvas and pyplot is
+    never imported, for exporting on machines without a display. ``stats``
+    holds the FrameStats of the latest ``play`` or ``export``.
+    """
+    def __init__(self, maze, headless=False, figsize=None, dpi=100, colors=COLORS):
+        self.maze = maze
+        self.headless = headless
+        self.colors = dict(colors)
+        if figsize is None:
+            aspect = maze.height / maze.width
+            figsize = (10, min(10, max(3, 10 * aspect)) + 0.6)
+        if headless:
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+            self.fig, self.ax = plt.subplots(figsize=figsize, dpi=dpi)
+        self.canvas = self.fig.canvas
+        self.background = None
+        self.stats = FrameStats()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.draw_static()
+
+    def draw_static(self):
+        """Draw the grid, start and goal, and reset the animated layers"""
+        maze, ax, colors = self.maze, self.ax, self.colors
+        ax.clear()
+        self.fig.patch.set_facecolor(colors['background'])
+        ax.set_facecolor(colors['background'])
+        extent = (0, maze.width, maze.height, 0)
+        ax.imshow(maze_image(maze, colors), extent=extent, interpolation='nearest', zorder=0)
+        self.overlay = np.zeros((maze.height, maze.width, 4), dtype=np.uint8)
+        self.overlay_artist = ax.imshow(self.overlay, extent=extent, interpolation='nearest',
+                                        zorder=1, animated=True)
+        size = self._cell_points()
+        (sx, sy), (gx, gy) = maze.start, maze.goal
+        ax.plot([sx + 0.5], [sy + 0.5], 'o', ms=max(4, size), color=colors['start'], zorder=2)
+        ax.plot([gx + 0.5], [gy + 0.5], '*', ms=max(6, 1.4 * size), color=colors['goal'], zorder=2)
+        self.mouse, = ax.plot([], [], 'o', ms=max(4, 0.9 * size), color=colors['mouse'],
+                              mec=colors['mouse_edge'], mew=1, zorder=5, animated=True)
+        self.status = ax.text(0.5, 1.01, "", transform=ax.transAxes, ha='center', va='bottom',
+                              fontsize=12, fontweight='bold', color=colors['text'], animated=True)
+        ax.set_xlim(0, maze.width)
+        ax.set_ylim(maze.height, 0)
+        ax.set_aspect('equal')
+        ax.set_xticks([]); ax.set_yticks([]); ax.set_frame_on(False)
+        self.fig.tight_layout()
+        self.background = None
+
+    def _cell_points(self):
+        """Side of one cell in points, for sizing markers"""
+        box = self.ax.get_position()
+        width_in = self.fig.get_figwidth() * box.width
+        height_in = self.fig.get_figheight() * box.height
+        return 72 * min(width_in / self.maze.width, height_in / self.maze.height)
+
+    # =========================
+    # Blitting
+    # =========================
+    def _animated(self):
+        return (self.overlay_artist, self.mouse, self.status)
+
+    def _on_draw(self, event):
+        """Cache everything but the animated artists after each full draw"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._animated():
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw()
+        self.canvas.restore_region(self.background)
+        for artist in self._animated():
+            self.fig.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def _pixels(self):
+        return np.asarray(self.canvas.buffer_rgba())
+
+    # =========================
+    # Scenes
+    # =========================
+    def paint(self, cells, kind):
+        """Colour (x, y) cells of the overlay with COLORS[kind]"""
+        color = _rgba8(self.colors[kind], 0.55 if kind == 'explored' else 1.0)
+        if cells:
+            xs, ys = zip(*cells)
+            self.overlay[list(ys), list(xs)] = color
+        self.overlay_artist.set_data(self.overlay)
+
+    def move_mouse(self, pos):
+        self.mouse.set_data([pos[0] + 0.5], [pos[1] + 0.5])
+
+    def path_frames(self, path, label="Path", per_frame=1):
+        """Frames that grow the path by per_frame cells each, mouse at its tip"""
+        if not path:
+            self.status.set_text(f"{label} - No path found")
+            yield 0
+            return
+        for k in range(0, len(path), per_frame):
+            step = path[k:k + per_frame]
+            self.paint(step, 'path')
+            self.move_mouse(step[-1])
+            done = min(k + per_frame, len(path))
+            self.status.set_text(f"{label} - Step {done}/{len(path)} ({done / len(path):.0%})")
+            yield done
+
+    def search_frames(self, solver, label="Search", per_frame=64, path_per_frame=1):
+        """Frames that show solver's explored cells as they stream in, then its path"""
+        from algorithms.exploration import stream
+        batch = []
+        explored = 0
+        for kind, value in stream(solver, self.maze):
+            if kind == "expand":
+                batch.append(value)
+                if len(batch) < per_frame:
+                    continue
+            if batch:
+                self.paint(batch, 'explored')
+                explored += len(batch)
+                batch = []
+                self.status.set_text(f"{label} - Explored {explored}")
+                yield explored
+            if kind == "path":
+                yield from self.path_frames(value, f"{label} - Explored {explored}", path_per_frame)
+
+    # =========================
+    # Output
+    # =========================
+    def play(self, frames, interval=5):
+        """Show frames on screen, one per timer tick; returns the FrameStats"""
+        if self.headless:
+            raise RuntimeError("a headless renderer cannot play on screen; use export")
+        import matplotlib.pyplot as plt
+        frames = iter(frames)
+        self.stats = FrameStats()
+        timer = self.canvas.new_timer(interval=interval)
+
+        def tick():
+            t0 = time.perf_counter_ns()
+            try:
+                next(frames)
+            except StopIteration:
+                timer.stop()
+                return
+            t1 = time.perf_counter_ns()
+            self._blit()
+            self.canvas.flush_events()
+            self.stats.add(t1 - t0, time.perf_counter_ns() - t1)
+
+        timer.add_callback(tick)
+        self._timer = timer
+        timer.start()
+        plt.show()
+        return self.stats
+
+    def export(self, frames, path, fps=30, every=1, fmt=None):
+        """Render frames off screen into an MP4, a GIF or a directory of PNGs
+
+        The format follows the extension (".mp4", ".gif", anything else is
+        a PNG directory) unless ``fmt`` names one of ``FORMATS``. MP4 needs
+        ffmpeg. Only every ``every``-th frame is written (plus the last),
+        while all of them still update the scene. Returns the FrameStats.
+        """
+        self.canvas.draw()
+        width, height = self.canvas.get_width_height()
+        sink = _open_sink(path, fps, width, height, fmt)
+        self.stats = FrameStats()
+        frames = iter(frames)
+        # Update time of frames skipped since the last one written
+        pending = None
+        try:
+            k = 0
+            while True:
+                t0 = time.perf_counter_ns()
+                try:
+                    next(frames)
+                except StopIteration:
+                    break
+                update = time.perf_counter_ns() - t0 + (pending or 0)
+                if k % every:
+                    pending = update
+                else:
+                    self._write_frame(sink, update)
+                    pending = None
+                k += 1
+            if pending is not None:
+                self._write_frame(sink, pending)
+        finally:
+            sink.close()
+        return self.stats
+
+    def _write_frame(self, sink, update_ns):
+        t1 = time.perf_counter_ns()
+        self._blit()
+        t2 = time.perf_counter_ns()
+        sink.write(self._pixels())
+        self.stats.add(update_ns, t2 - t1, time.perf_counter_ns() - t2)
+
+    def save_png(self, path):
+        """Write the current frame as one PNG"""
+        self._blit()
+        from PIL import Image
+        Image.fromarray(self._pixels()).save(path)
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import algorithms
+from batch import SharedMaze, attach, run_solver
+from benchmark import percentile
+
+# D* Lite and HPA* keep state between solves, which a fresh solver per
+# request throws away (HPA* would rebuild its whole abstract graph)
+SOLVERS = [name for name in algorithms.SOLVERS if name not in ("DStarLite", "HPAStar")]
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 504: "Gateway Timeout"}
+
+
+# =========================
+# Worker Side
+# =========================
+_worker_mazes = {}
+_worker_blocks = []
+
+
+def _init_worker(descriptors):
+    for name, descriptor in descriptors.items():
+        shm, maze = attach(descriptor)
+        _worker_blocks.append(shm)
+        _worker_mazes[name] = maze
+
+
+def _solve_in_worker(name, start, goal, algorithm):
+    return run_solver(_worker_mazes[name], start, goal, algorithm)
+
+
+# =========================
+# Metrics
+# =========================
+def _percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0}
+    return {f"p{q}": percentile(ordered, q) for q in (50, 90, 99)}
+
+
+class ServiceMetrics:
+    """Counters, queue depth and recent latencies of a PathService
+
+    - ``requests``: solve calls; ``coalesced`` of them joined a solve
+      already in flight for the same query instead of starting one
+    - ``solves``: jobs handed to the worker pool, ``completed`` /
+      ``failed`` / ``dropped`` how they ended (a job still queued is
+      dropped when every request waiting on it ran out of deadline)
+    - ``timeouts`` / ``errors``: requests that missed their deadline or
+      failed
+    - ``queue_depth``: jobs submitted and not finished (running or
+      queued), ``peak_queue_depth`` its maximum
+    - latency percentiles cover the last ``window`` answered requests
+      (``latency_ms``, submit to answer as the caller sees it) and solves
+      (``solve_ms``, the solver alone inside a worker)
+    """
+    COUNTERS = ("requests", "coalesced", "solves", "completed", "failed", "dropped", "timeouts", "errors")
+
+    def __init__(self, window=4096):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.latency_ms = deque(maxlen=window)
+        self.solve_ms = deque(maxlen=window)
+        self.started = time.perf_counter()
+
+    def snapshot(self, workers=0):
+        uptime = time.perf_counter() - self.started
+        result = {name: getattr(self, name) for name in self.COUNTERS}
+        result.update(
+            queue_depth=self.queue_depth,
+            queued=max(self.queue_depth - workers, 0),
+            peak_queue_depth=self.peak_queue_depth,
+            uptime_s=uptime,
+            requests_per_sec=self.requests / uptime if uptime > 0 else 0.0,
+            latency_ms=_percentiles(self.latency_ms),
+            solve_ms=_percentiles(self.solve_ms),
+        )
+        return result
+
+
+# =========================
+# Path Service
+# =========================
+class _Job:
+    def __init__(self, work):
+        self.work = work
+        self.future = asyncio.wrap_future(work)
+        self.waiters = 0
+
+
+class PathService:
+    """Answers solve requests from an asyncio loop on a worker pool
+
+    Mazes are registered by name with ``add_maze`` before ``start``; with
+    the default process pool each one is copied once into shared memory
+    (see ``batch.SharedMaze``), so edits made afterwards are not seen.
+    ``solve`` never blocks the loop: the search runs on a worker, and a
+    request for a (maze, start, goal, algorithm) that is already being
+    solved waits on that solve instead of queueing another. Each request
+    may carry its own deadline; a request that misses it raises
+    asyncio.TimeoutError while the solve carries on for the others, and a solve
+    nobody waits for any more is dropped if it has not started yet.
+    """
+    def __init__(self, workers=None, executor="process", window=4096):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"executor must be 'process' or 'thread', not {executor!r}")
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.mazes = {}
+        self.pool = None
+        self.inflight = {}
+        self.metrics = ServiceMetrics(window)
+        self._shared = []
+
+    def add_maze(self, name, maze):
+        if self.pool is not None:
+            raise RuntimeError("mazes must be added before start()")
+        self.mazes[name] = maze
+
+    def start(self):
+        if self.pool is not None:
+            return
+        if self.executor == "process":
+            descriptors = {}
+            for name, maze in self.mazes.items():
+                block = SharedMaze(maze)
+                self._shared.append(block)
+                descriptors[name] = block.descriptor
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(descriptors,))
+        else:
+            self.pool = ThreadPoolExecutor(self.workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        for block in self._shared:
+            block.close()
+        self._shared = []
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def _check(self, name, start, goal, algorithm):
+        maze = self.mazes.get(name)
+        if maze is None:
+            raise ValueError(f"unknown maze {name!r}")
+        if algorithm not in SOLVERS:
+            raise ValueError(f"unknown algorithm {algorithm!r}")
+        for pos in (start, goal):
+            x, y = pos
+            if not (0 <= x < maze.width and 0 <= y < maze.height):
+                raise ValueError(f"{pos} is outside the {maze.width}x{maze.height} maze")
+
+    def _submit(self, key):
+        name, start, goal, algorithm = key
+        if self.executor == "process":
+            work = self.pool.submit(_solve_in_worker, name, start, goal, algorithm)
+        else:
+            work = self.pool.submit(run_solver, self.mazes[name], start, goal, algorithm)
+        job = _Job(work)
+        self.inflight[key] = job
+        metrics = self.metrics
+        metrics.solves += 1
+        metrics.queue_depth += 1
+        metrics.peak_queue_depth = max(metrics.peak_queue_depth, metrics.queue_depth)
+
+        def finished(future):
+            if self.inflight.get(key) is job:
+                del self.inflight[key]
+            metrics.queue_depth -= 1
+            if future.cancelled():
+                metrics.dropped += 1
+            elif future.exception() is not None:
+                metrics.failed += 1
+            else:
+                metrics.completed += 1
+                metrics.solve_ms.append(future.result()["exec_time_ms"])
+        job.future.add_done_callback(finished)
+        return job
+
+    async def solve(self, maze, start, goal, algorithm="AStar", deadline_ms=None):
+        """Result dict of ``batch.run_solver`` plus ``coalesced`` and ``latency_ms``
+
+        ``maze`` is a registered name. Raises ValueError for a bad request
+        and asyncio.TimeoutError once ``deadline_ms`` has passed.
+        """
+        if self.pool is None:
+            raise RuntimeError("service is not started")
+        start, goal = tuple(start), tuple(goal)
+        self._check(maze, start, goal, algorithm)
+        t0 = time.perf_counter_ns()
+        metrics = self.metrics
+        metrics.requests += 1
+        key = (maze, start, goal, algorithm)
+        job = self.inflight.get(key)
+        coalesced = job is not None
+        if coalesced:
+            metrics.coalesced += 1
+        else:
+            job = self._submit(key)
+
+        job.waiters += 1
+        try:
+            timeout = None if deadline_ms is None else deadline_ms / 1000
+            result = await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        except asyncio.TimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            metrics.timeouts += 1
+            raise asyncio.TimeoutError(f"deadline of {deadline_ms} ms exceeded") from None
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            job.waiters -= 1
+            # Nobody waits any more: drop the job if it is still queued. A
+            # running one finishes and stays joinable until then.
+            if not job.waiters and job.work.cancel() and self.inflight.get(key) is job:
+                del self.inflight[key]
+
+        latency = (time.perf_counter_ns() - t0) / 1_000_000
+        metrics.latency_ms.append(latency)
+        return dict(result, coalesced=coalesced, latency_ms=latency)
+
+    def snapshot(self):
+        result = self.metrics.snapshot(self.workers)
+        result["in_flight"] = len(self.inflight)
+        result["workers"] = self.workers
+        result["executor"] = self.executor
+        return result
+
+    # =========================
+    # HTTP
+    # =========================
+    async def handle(self, reader, writer):
+        """One HTTP/1.1 connection (keep-alive) on asyncio streams
+
+        GET /solve?maze=NAME&start=X,Y&goal=X,Y&algorithm=AStar&deadline_ms=N
+        (or POST /solve with the same fields as a JSON object), GET
+        /metrics and GET /mazes. Every response is JSON.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._route(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n")
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode() + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/metrics":
+            return 200, self.snapshot()
+        if url.path == "/mazes":
+            return 200, {name: {"width": maze.width, "height": maze.height,
+                                "neighborhood": maze.neighborhood.name}
+                         for name, maze in self.mazes.items()}
+        if url.path != "/solve":
+            return 404, {"error": f"no route {url.path}"}
+        if method not in ("GET", "POST"):
+            return 405, {"error": f"{method} not allowed"}
+
+        try:
+            if method == "POST":
+                fields = json.loads(body or b"{}")
+            else:
+                fields = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            start, goal = (_position(fields.get(name)) for name in ("start", "goal"))
+            deadline = fields.get("deadline_ms")
+            result = await self.solve(fields.get("maze", "default"), start, goal,
+                                      fields.get("algorithm", "AStar"),
+                                      float(deadline) if deadline is not None else None)
+        except asyncio.TimeoutError as error:
+            return 504, {"error": str(error)}
+        except (ValueError, TypeError) as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        result["path"] = [list(pos) for pos in result["path"]]
+        return 200, result
+
+
+def _position(value):
+    """(x, y) from "X,Y" or a two-item list"""
+    if value is None:
+        raise ValueError("start and goal are required")
+    if isinstance(value, str):
+        value = value.split(",")
+    x, y = (int(v) for v in value)
+    return x, y
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix=None):
+    """Run service over HTTP until SIGINT/SIGTERM"""
+    service.start()
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, unix)
+        where = f"unix:{unix}"
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        host, port = server.sockets[0].getsockname()[:2]
+        where = f"http://{host}:{port}"
+    print(f"serving on {where} with {service.workers} {service.executor} workers", file=sys.stderr, flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    from cli import add_maze_options, load_maze
+
+    parser = argparse.ArgumentParser(description="Serve maze solves over HTTP from a worker pool")
+    add_maze_options(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker count (default: one per CPU)")
+    parser.add_argument("--threads", action="store_true",
+                        help="solve on threads instead of processes (no shared-memory copy, but one GIL)")
+    args = parser.parse_args(argv)
+
+    service = PathService(args.workers, "thread" if args.threads else "process")
+    service.add_maze("default", load_maze(args))
+    asyncio.run(serve(service, args.host, args.port, args.unix))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+from algorithms import UCS, AStar
+from maze import Maze
+
+
+class ZeroHeuristic(AStar):
+    # Written against the original heuristic(self, node, goal)
+    def heuristic(self, node, goal):
+        return 0
+
+
+class HalvedHeuristic(AStar):
+    def heuristic(self, node, goal, maze=None):
+        return super().heuristic(node, goal, maze) / 2
+
+
+def test_default_heuristic_without_a_maze_is_manhattan():
+    assert AStar().heuristic((0, 0), (3, -4)) == 7
+
+
+def test_default_heuristic_follows_the_maze_neighborhood():
+    maze = Maze(9, 9, neighborhood=8)
+    assert AStar().heuristic((0, 0), (3, 3), maze) == maze.neighborhood.metric(3, 3)
+
+
+def test_heuristic_overrides_old_and_new_style():
+    maze = Maze(31, 17, generator="braid", seed=3)
+    cost = maze.path_cost(UCS().solve(maze))
+    for solver in (ZeroHeuristic(), HalvedHeuristic()):
+        assert maze.path_cost(solver.solve(maze)) == cost
@@ -0,0 +1,126 @@
+import random
+
+from cache import CachedSolver, PathCache
+from algorithms import AStar
+from maze import Maze
+
+
+def _open_maze(width, height, neighborhood=4):
+    return Maze.from_cells(width, height, bytearray(width * height), start=(0, 0),
+                           goal=(width - 1, height - 1), neighborhood=neighborhood)
+
+
+def test_wall_blocking_a_diagonal_drops_the_path():
+    maze = _open_maze(3, 3, neighborhood=8)
+    cache = PathCache(maze)
+    cache.put("AStar", (0, 0), (1, 1), [(0, 0), (1, 1)])
+    # (1, 0) is on no cached path, but with no corner cutting it blocks (0, 0) -> (1, 1)
+    maze.set_cell(1, 0, 1)
+    assert cache.get("AStar", (0, 0), (1, 1)) is None
+
+
+def test_wall_off_the_path_keeps_it_without_corner_rule():
+    maze = _open_maze(3, 3)
+    cache = PathCache(maze)
+    path = [(0, 0), (0, 1), (0, 2)]
+    cache.put("AStar", (0, 0), (0, 2), path)
+    maze.set_cell(1, 1, 1)
+    assert cache.get("AStar", (0, 0), (0, 2)) == path
+
+
+def test_cached_solver_stays_valid_after_corner_edit():
+    maze = _open_maze(5, 5, neighborhood=8)
+    solver = CachedSolver(AStar(), PathCache(maze))
+    solver.solve(maze)
+    maze.set_cell(1, 0, 1)
+    maze.set_cell(0, 1, 1)
+    path = solver.solve(maze)
+    assert all(maze.index(b) in maze.neighbors(maze.index(a)) for a, b in zip(path, path[1:]))
+
+
+def _cached_path(maze):
+    cache = PathCache(maze)
+    path = [(0, 0), (1, 0), (2, 0)]
+    cache.put("AStar", (0, 0), (2, 0), path)
+    return cache, path
+
+
+def test_hit_returns_a_copy_and_counts():
+    maze = _open_maze(3, 3)
+    cache, path = _cached_path(maze)
+    assert cache.get("AStar", (0, 0), (2, 2)) is None
+    hit = cache.get("AStar", (0, 0), (2, 0))
+    assert hit == path
+    hit.append((9, 9))
+    assert cache.get("AStar", (0, 0), (2, 0)) == path
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+
+
+def test_wall_on_the_path_drops_only_that_path():
+    maze = _open_maze(3, 3)
+    cache, path = _cached_path(maze)
+    cache.put("AStar", (0, 2), (2, 2), [(0, 2), (1, 2), (2, 2)])
+    maze.set_cell(1, 0, 1)
+    assert cache.get("AStar", (0, 0), (2, 0)) is None
+    assert cache.get("AStar", (0, 2), (2, 2)) is not None
+
+
+def test_removed_wall_and_new_costs_drop_everything():
+    maze = _open_maze(3, 3)
+    maze.set_cell(1, 1, 1)
+    cache, path = _cached_path(maze)
+    maze.set_cell(1, 1, 0)
+    assert len(cache) == 0
+    cache.put("AStar", (0, 0), (2, 0), path)
+    maze.set_costs([2] * maze.size)
+    assert len(cache) == 0
+
+
+def test_unnotified_version_change_clears_on_lookup():
+    maze = _open_maze(3, 3)
+    cache, path = _cached_path(maze)
+    maze.version += 1
+    assert cache.get("AStar", (0, 0), (2, 0)) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    maze = _open_maze(3, 3)
+    cache = PathCache(maze, maxsize=2)
+    cache.put("AStar", (0, 0), (1, 0), [(0, 0), (1, 0)])
+    cache.put("AStar", (0, 0), (0, 1), [(0, 0), (0, 1)])
+    cache.get("AStar", (0, 0), (1, 0))
+    cache.put("AStar", (0, 0), (1, 1), [(0, 0), (1, 0), (1, 1)])
+    assert cache.get("AStar", (0, 0), (0, 1)) is None
+    assert cache.get("AStar", (0, 0), (1, 0)) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_close_stops_listening():
+    maze = _open_maze(3, 3)
+    cache, path = _cached_path(maze)
+    cache.close()
+    maze.set_cell(1, 0, 1)
+    assert len(cache) == 1
+    # The version check still refuses the stale entry
+    assert cache.get("AStar", (0, 0), (2, 0)) is None
+
+
+def test_cached_solver_matches_a_fresh_solve_across_edits():
+    maze = Maze(31, 17, generator="braid", seed=6)
+    cached = CachedSolver(AStar(), PathCache(maze))
+    rng = random.Random(6)
+    free = [maze.pos(i) for i in range(maze.size) if not maze.cells[i]]
+    queries = [(rng.choice(free), rng.choice(free)) for _ in range(8)]
+    for step in range(30):
+        start, goal = queries[step % len(queries)]
+        query = maze.with_endpoints(start, goal)
+        path = cached.solve(query)
+        expected = AStar().solve(query)
+        assert len(path) == len(expected)
+        if path:
+            assert maze.path_cost(path) == maze.path_cost(expected)
+        x, y = rng.choice(free)
+        if (x, y) not in (start, goal):
+            maze.set_cell(x, y, 1 - maze.cells[maze.index((x, y))])
+    assert cached.cache.hits > 0
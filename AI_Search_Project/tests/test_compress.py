@@ -0,0 +1,55 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+import algorithms
+from benchmark import random_queries
+from compress import CompressedSolver, CorridorGraph
+from maze import Maze
+
+
+def _maze(generator, neighborhood, costs):
+    maze = Maze(31, 31, generator=generator, seed=3, neighborhood=neighborhood)
+    if costs:
+        rng = random.Random(1)
+        maze.set_costs([rng.choice([1, 1, 2, 5]) for _ in range(maze.size)])
+    return maze
+
+
+def _is_path(maze, path, start, goal):
+    return (path[0] == start and path[-1] == goal
+            and all(maze.index(b) in maze.neighbors(maze.index(a)) for a, b in zip(path, path[1:])))
+
+
+@pytest.mark.parametrize("costs", [False, True], ids=["unit", "weighted"])
+@pytest.mark.parametrize("neighborhood", ["4", "8"])
+@pytest.mark.parametrize("generator", ["backtracker", "braid", "rooms"])
+def test_compressed_optimal_solvers_match_ucs(generator, neighborhood, costs):
+    maze = _maze(generator, neighborhood, costs)
+    graph = CorridorGraph(maze)
+    solvers = [CompressedSolver(cls(), graph)
+               for cls in (algorithms.UCS, algorithms.AStar, algorithms.BidirectionalAStar)]
+    for start, goal in random_queries(maze, 8, 2):
+        query = maze.with_endpoints(start, goal)
+        optimal = maze.path_cost(algorithms.UCS().solve(query))
+        for solver in solvers:
+            path = solver.solve(query)
+            assert _is_path(maze, path, start, goal), type(solver.solver).__name__
+            assert maze.path_cost(path) == pytest.approx(optimal), type(solver.solver).__name__
+
+
+def test_compressed_solver_rebuilds_after_an_edit():
+    maze = _maze("braid", "4", False)
+    solver = CompressedSolver(algorithms.AStar())
+    solver.solve(maze)
+    path = solver.solve(maze)
+    maze.set_cell(*path[len(path) // 2], 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        repaired = solver.solve(maze)
+        expected = algorithms.UCS().solve(maze)
+    assert len(repaired) == len(expected)
+    if repaired:
+        assert _is_path(maze, repaired, maze.start, maze.goal)
+        assert maze.path_cost(repaired) == pytest.approx(maze.path_cost(expected))
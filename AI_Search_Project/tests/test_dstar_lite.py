@@ -0,0 +1,68 @@
+from algorithms import DStarLite, UCS
+from maze import Maze
+
+
+def _cost(maze, path):
+    return maze.path_cost(path) if path else None
+
+
+def test_replan_after_wall_matches_fresh_search():
+    maze = Maze(31, 21, generator="braid", seed=2)
+    planner = DStarLite()
+    path = planner.solve(maze)
+    for x, y in path[len(path) // 3:len(path) // 3 + 3]:
+        maze.set_cell(x, y, 1)
+        assert _cost(maze, planner.replan()) == _cost(maze, UCS().solve(maze))
+
+
+def test_replan_after_wall_removed_finds_shortcut():
+    maze = Maze(31, 21, generator="backtracker", seed=4)
+    planner = DStarLite()
+    planner.solve(maze)
+    walls = [i for i in range(maze.size) if maze.cells[i]]
+    for i in walls[::40]:
+        x, y = maze.pos(i)
+        maze.set_cell(x, y, 0)
+    assert _cost(maze, planner.replan()) == _cost(maze, UCS().solve(maze))
+
+
+def test_replan_with_costs():
+    maze = Maze(25, 25, generator="braid", seed=6)
+    maze.set_costs([1 + i % 4 for i in range(maze.size)])
+    planner = DStarLite()
+    path = planner.solve(maze)
+    x, y = path[len(path) // 2]
+    maze.set_cell(x, y, 1)
+    assert _cost(maze, planner.replan()) == _cost(maze, UCS().solve(maze))
+
+
+def test_move_to_then_replan_keeps_the_agent_position():
+    maze = Maze(20, 12, generator="backtracker", seed=3)
+    planner = DStarLite()
+    path = planner.solve(maze)
+    planner.move_to(path[3])
+    km = planner.km
+    assert planner.replan() == path[3:]
+    assert planner.km == km
+
+
+def test_move_to_then_edit_then_replan():
+    maze = Maze(31, 21, generator="braid", seed=2)
+    planner = DStarLite()
+    path = planner.solve(maze)
+    planner.move_to(path[5])
+    x, y = path[10]
+    maze.set_cell(x, y, 1)
+    replanned = planner.replan()
+    assert replanned[0] == path[5] and replanned[-1] == maze.goal
+    assert _cost(maze, replanned) == _cost(maze, UCS().solve(maze.with_endpoints(path[5], maze.goal)))
+
+
+def test_close_detaches_from_the_maze():
+    maze = Maze(20, 12, generator="braid", seed=1)
+    planner = DStarLite()
+    planner.solve(maze)
+    planner.close()
+    maze.set_cell(*next(maze.pos(i) for i in range(maze.size) if not maze.cells[i]
+                        and maze.pos(i) not in (maze.start, maze.goal)), 1)
+    assert planner.pending == [] and planner.maze is None
@@ -0,0 +1,83 @@
+import pytest
+
+from algorithms import BFS, Exploration, stream
+from maze import Maze
+
+
+def _record_all(explored, maze):
+    explored.reset(maze)
+    for i in range(maze.size):
+        explored.record(i)
+    return [maze.pos(i) for i in range(maze.size)]
+
+
+def test_full_mode_keeps_every_cell_in_order():
+    maze = Maze(9, 7)
+    explored = Exploration("full")
+    assert list(explored) == [] and len(explored) == 0
+    events = _record_all(explored, maze)
+    assert list(explored) == events
+    assert len(explored) == maze.size
+
+
+def test_count_mode_keeps_only_the_count():
+    maze = Maze(9, 7)
+    explored = Exploration("count")
+    _record_all(explored, maze)
+    assert len(explored) == maze.size
+    assert list(explored) == []
+
+
+def test_sample_mode_keeps_an_evenly_spaced_subsequence():
+    maze = Maze(31, 17)
+    explored = Exploration("sample", limit=16)
+    events = _record_all(explored, maze)
+    kept = list(explored)
+    assert len(explored) == maze.size
+    assert len(kept) <= 16
+    assert kept == events[::explored.stride][:len(kept)]
+
+
+def test_listeners_see_every_event_whatever_the_mode():
+    maze = Maze(9, 7)
+    seen = []
+    explored = Exploration("count", listeners=[seen.append])
+    events = _record_all(explored, maze)
+    assert seen == events
+    explored.remove_listener(seen.append)
+    explored.record(0)
+    assert len(seen) == maze.size and len(explored) == maze.size + 1
+
+
+def test_reset_forgets_earlier_events():
+    maze = Maze(9, 7)
+    explored = Exploration("full")
+    _record_all(explored, maze)
+    explored.reset(maze)
+    assert len(explored) == 0 and list(explored) == []
+
+
+def test_unbound_recorder_iterates_empty_and_refuses_append():
+    explored = Exploration()
+    assert list(explored) == []
+    with pytest.raises(RuntimeError):
+        explored.append((0, 0))
+
+
+def test_modes_agree_on_the_number_of_explored_cells():
+    maze = Maze(31, 17, generator="braid", seed=4)
+    counts = {}
+    for mode in ("count", "sample", "full"):
+        solver = BFS()
+        solver.explored_nodes = Exploration(mode)
+        solver.solve(maze)
+        counts[mode] = len(solver.explored_nodes)
+    assert len(set(counts.values())) == 1
+
+
+def test_stream_yields_expansions_then_the_path():
+    maze = Maze(31, 17, generator="braid", seed=4)
+    events = list(stream(BFS(), maze, mode="full"))
+    kinds = [kind for kind, _ in events]
+    assert kinds[-1] == "path" and set(kinds[:-1]) == {"expand"}
+    assert events[-1][1] == BFS().solve(maze)
@@ -0,0 +1,29 @@
+from algorithms import BFS, HPAStar
+from maze import Maze
+
+
+def _valid(maze, path):
+    return path[0] == maze.start and path[-1] == maze.goal and all(
+        maze.index(b) in maze.neighbors(maze.index(a)) for a, b in zip(path, path[1:]))
+
+
+def test_one_cluster_wide_maze():
+    # Every cluster's lower neighbour is c + 1 when the maze is one cluster wide
+    maze = Maze(11, 101, generator="braid", seed=3)
+    assert BFS().solve(maze)
+    path = HPAStar().solve(maze)
+    assert path and _valid(maze, path)
+
+
+def test_one_cluster_wide_maze_after_edit():
+    maze = Maze(11, 101, generator="braid", seed=3)
+    planner = HPAStar()
+    planner.solve(maze)
+    # Wall off a cell on a horizontal border of the solved path
+    x, y = next(p for p in planner.solve(maze) if p[1] % 16 == 15 and p != maze.goal)
+    maze.set_cell(x, y, 1)
+    expected = BFS().solve(maze)
+    path = planner.solve(maze)
+    assert bool(path) == bool(expected)
+    if path:
+        assert _valid(maze, path) and (x, y) not in path
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import mazeio
+from algorithms import UCS
+from maze import Maze
+from neighborhoods import eight_connected
+
+
+def _weighted_maze(seed=5, goal_cost=1):
+    maze = Maze(31, 17, generator="braid", seed=seed)
+    rng = random.Random(seed)
+    costs = [rng.randint(1, 9) for _ in range(maze.size)]
+    costs[maze.index(maze.goal)] = goal_cost
+    maze.set_costs(costs)
+    return maze
+
+
+def _cost(maze):
+    return maze.path_cost(UCS().solve(maze))
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_binary_round_trip_keeps_cells_endpoints_and_costs(tmp_path, packed, use_mmap):
+    maze = _weighted_maze()
+    path = tmp_path / "maze.bin"
+    maze.save(path, packed=packed)
+    loaded = Maze.load(path, use_mmap=use_mmap)
+    assert bytes(loaded.cells) == bytes(maze.cells)
+    assert (loaded.start, loaded.goal) == (maze.start, maze.goal)
+    assert list(loaded.costs) == list(maze.costs)
+    assert _cost(loaded) == _cost(maze)
+
+
+def test_ascii_round_trip_keeps_integer_costs(tmp_path):
+    maze = _weighted_maze()
+    path = tmp_path / "maze.txt"
+    mazeio.save_ascii(maze, path)
+    loaded = mazeio.load_ascii(path)
+    assert bytes(loaded.cells) == bytes(maze.cells)
+    assert (loaded.start, loaded.goal) == (maze.start, maze.goal)
+    assert _cost(loaded) == _cost(maze)
+
+
+def test_ascii_refuses_a_goal_cost_it_cannot_hold():
+    with pytest.raises(ValueError):
+        mazeio.to_ascii(_weighted_maze(goal_cost=3))
+
+
+@pytest.mark.parametrize("neighborhood", ["4", "8"])
+def test_movingai_round_trip_keeps_the_neighborhood(tmp_path, neighborhood):
+    maze = Maze(31, 17, generator="braid", seed=2, neighborhood=neighborhood)
+    path = tmp_path / "maze.map"
+    mazeio.save_movingai(maze, path)
+    loaded = mazeio.load_movingai(path, maze.start, maze.goal)
+    assert bytes(loaded.cells) == bytes(maze.cells)
+    assert loaded.neighborhood.name == maze.neighborhood.name
+    assert _cost(loaded) == _cost(maze)
+
+
+def test_movingai_refuses_corner_cutting(tmp_path):
+    maze = Maze(11, 11, generator="braid", seed=2, neighborhood=eight_connected("cut"))
+    with pytest.raises(ValueError):
+        mazeio.save_movingai(maze, tmp_path / "maze.map")
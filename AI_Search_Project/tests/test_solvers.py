@@ -0,0 +1,65 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+import algorithms
+from benchmark import random_queries
+from maze import Maze
+from neighborhoods import ROOK_MOVES, Neighborhood, eight_connected
+
+KNIGHTISH = Neighborhood(ROOK_MOVES + ((2, 1), (-2, -1), (1, -2), (-1, 2)))
+NEIGHBORHOODS = {"4": "4", "8": "8", "8-cut": eight_connected("cut"), "custom": KNIGHTISH}
+
+
+def _maze(neighborhood, costs):
+    maze = Maze(11, 11, generator="braid", seed=2, neighborhood=NEIGHBORHOODS[neighborhood])
+    if costs:
+        rng = random.Random(1)
+        maze.set_costs([rng.choice([1, 1, 2, 5]) for _ in range(maze.size)])
+    return maze
+
+
+def _is_path(maze, path, start, goal):
+    return (path[0] == start and path[-1] == goal
+            and all(maze.index(b) in maze.neighbors(maze.index(a)) for a, b in zip(path, path[1:])))
+
+
+@pytest.mark.parametrize("costs", [False, True], ids=["unit", "weighted"])
+@pytest.mark.parametrize("neighborhood", list(NEIGHBORHOODS))
+def test_solvers_agree_with_ucs_within_their_bounds(neighborhood, costs):
+    maze = _maze(neighborhood, costs)
+    for start, goal in random_queries(maze, 4, 2):
+        query = maze.with_endpoints(start, goal)
+        optimal = maze.path_cost(algorithms.UCS().solve(query))
+        for name, cls in algorithms.SOLVERS.items():
+            # IDS deepens by moves, which only the 4 and 8 neighbourhoods bound
+            if name == "IDS" and neighborhood not in ("4", "8"):
+                continue
+            solver = cls()
+            with contextlib.redirect_stdout(io.StringIO()):
+                path = solver.solve(query)
+            if hasattr(solver, "close"):
+                solver.close()
+            assert path and _is_path(maze, path, start, goal), name
+            bound = algorithms.guaranteed_bound(solver, query)
+            if bound is not None:
+                assert maze.path_cost(path) <= bound * optimal + 1e-9, name
+
+
+@pytest.mark.parametrize("neighborhood", list(NEIGHBORHOODS))
+def test_unreachable_goal_gives_an_empty_path(neighborhood):
+    maze = _maze(neighborhood, False)
+    goal = maze.goal
+    for pos in [(goal[0] + dx, goal[1] + dy) for dx in range(-2, 3) for dy in range(-2, 3)]:
+        if pos != goal and 0 <= pos[0] < maze.width and 0 <= pos[1] < maze.height:
+            maze.set_cell(*pos, 1)
+    for name, cls in algorithms.SOLVERS.items():
+        if name in ("IDS", "IDAStar"):
+            continue
+        solver = cls()
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert solver.solve(maze) == [], name
+        if hasattr(solver, "close"):
+            solver.close()